@@ -0,0 +1,189 @@
+import argparse
+import sys
+from pathlib import Path
+
+from ai_research_template.benchmarks import (
+    BENCHMARK_DIR,
+    DEFAULT_THRESHOLD,
+    STARTUP_BUDGET_S,
+    STARTUP_DIR,
+    STARTUP_MODULES,
+    compare_results,
+    history_files,
+    load_benchmark_run,
+    measure_import_time,
+    run_benchmarks,
+    save_history,
+)
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def compare(
+    baseline_path: Path, current_path: Path, threshold: float, stat: str
+) -> int:
+    """Print a comparison table and return the number of regressions."""
+    baseline = load_benchmark_run(baseline_path)
+    current = load_benchmark_run(current_path)
+    print(
+        f"baseline: {baseline_path} (commit {baseline.get('commit')})\n"
+        f"current:  {current_path} (commit {current.get('commit')})"
+    )
+    rows = compare_results(
+        baseline["results"], current["results"], threshold=threshold, stat=stat
+    )
+    width = max((len(row["name"]) for row in rows), default=0)
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(
+            f"{row['name']:<{width}}  {_format_time(row['baseline']):>9}  "
+            f"{_format_time(row['current']):>9}  {row['ratio']:6.2f}x  {flag}"
+        )
+    regressions = sum(row["regressed"] for row in rows)
+    print(
+        f"{regressions} of {len(rows)} benchmarks slower than "
+        f"{1 + threshold:.2f}x the baseline ({stat})"
+    )
+    return regressions
+
+
+def startup(modules: list[str], budget: float, repeat: int, history: Path) -> int:
+    """Time module imports, store them and return the number over budget."""
+    results = {}
+    over_budget = 0
+    for module in modules:
+        timing = measure_import_time(module, repeat=repeat)
+        heaviest = timing.pop("heaviest")
+        results[f"startup.{module}"] = timing
+        flag = ""
+        if timing["min_s"] > budget:
+            flag = "OVER BUDGET"
+            over_budget += 1
+        print(f"{module}  {_format_time(timing['min_s'])}  {flag}")
+        for name, seconds in heaviest:
+            print(f"    {_format_time(seconds):>9}  {name}")
+    path = save_history(results, history)
+    print(f"Saved {len(results)} results to {path}")
+    print(
+        f"{over_budget} of {len(modules)} modules import slower than "
+        f"{_format_time(budget)}"
+    )
+    return over_budget
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark hot paths and compare against earlier runs.",
+        epilog=(
+            "Example: uv run poe bench --filter metrics, then "
+            "uv run poe bench-compare (exits 1 on regressions)."
+        ),
+    )
+    parser.add_argument(
+        "--history",
+        type=str,
+        default=None,
+        help=(
+            f"Directory of benchmark JSON history (default: {BENCHMARK_DIR}, "
+            f"or {STARTUP_DIR} for startup)"
+        ),
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown before failing, e.g. 0.2 for 20%%",
+    )
+    parser.add_argument(
+        "--stat",
+        choices=("min_s", "median_s"),
+        default="min_s",
+        help="Statistic to compare",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmarks and store the results.")
+    run.add_argument(
+        "--filter", type=str, default=None, help="Regex on benchmark names"
+    )
+    run.add_argument("--quick", action="store_true", help="Smallest input size only")
+    run.add_argument(
+        "--min-time", type=float, default=0.2, help="Seconds per measurement"
+    )
+    run.add_argument("--repeat", type=int, default=5, help="Measurements per case")
+    run.add_argument(
+        "--compare",
+        action="store_true",
+        help="Compare with the previous run afterwards (exits 1 on regressions)",
+    )
+
+    cmp = commands.add_parser(
+        "compare", help="Compare two stored runs (default: the last two)."
+    )
+    cmp.add_argument("baseline", nargs="?", default=None, help="Baseline JSON")
+    cmp.add_argument("current", nargs="?", default=None, help="Current JSON")
+
+    start = commands.add_parser(
+        "startup",
+        help=(
+            "Time imports with -X importtime and store them in "
+            f"{STARTUP_DIR} (exits 1 if a module is over budget)."
+        ),
+    )
+    start.add_argument(
+        "modules",
+        nargs="*",
+        default=list(STARTUP_MODULES),
+        help="Modules to import (default: those behind the lightweight scripts)",
+    )
+    start.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_S,
+        help="Allowed import time per module in seconds",
+    )
+    start.add_argument("--repeat", type=int, default=5, help="Measurements each")
+    args = parser.parse_args()
+
+    if args.command == "startup":
+        history = Path(args.history or STARTUP_DIR)
+        if startup(args.modules, args.budget, args.repeat, history):
+            sys.exit(1)
+        return
+    args.history = args.history or str(BENCHMARK_DIR)
+    if args.command == "run":
+        previous = history_files(args.history)
+        results = run_benchmarks(
+            args.filter,
+            quick=args.quick,
+            min_time=args.min_time,
+            repeat=args.repeat,
+            progress=lambda key: print(f"running {key}", flush=True),
+        )
+        current_path = save_history(results, args.history)
+        print(f"Saved {len(results)} results to {current_path}")
+        if not args.compare:
+            return
+        if not previous:
+            print("No earlier run to compare with.")
+            return
+        baseline_path = previous[-1]
+    else:
+        files = history_files(args.history)
+        needed = (args.baseline is None) + (args.current is None)
+        if len(files) < needed:
+            parser.error(f"need {needed} stored runs in {args.history} to compare")
+        current_path = Path(args.current) if args.current else files[-1]
+        baseline_path = Path(args.baseline) if args.baseline else files[-needed]
+
+    if compare(baseline_path, current_path, args.threshold, args.stat):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from ai_research_template.utils import close_logger, setup_logger
+
+
+def time_logging(
+    output_dir: Path, n_calls: int, work_s: float, async_logging: bool
+) -> float:
+    """Return the mean caller-side cost of logger.info in microseconds.
+
+    Between calls the loop sleeps for work_s to stand in for a training step
+    that releases the GIL (NumPy, I/O), as in a real training loop. Only
+    the logger.info calls themselves are timed.
+    """
+    logger = setup_logger(
+        output_dir, name="benchmark", async_logging=async_logging, console=False
+    )
+    spent = 0.0
+    for step in range(n_calls):
+        if work_s:
+            time.sleep(work_s)
+        start = time.perf_counter()
+        logger.info(f"step={step} loss={1.0 / (step + 1):.6f}")
+        spent += time.perf_counter() - start
+    close_logger("benchmark")
+    return spent / n_calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare synchronous and queue-based logging overhead."
+    )
+    parser.add_argument("--calls", type=int, default=20_000, help="Log calls.")
+    parser.add_argument(
+        "--work-us",
+        type=float,
+        default=100.0,
+        help="Simulated GIL-releasing work between calls, in microseconds.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = {}
+        for mode in ("sync", "async"):
+            output_dir = Path(tmpdir) / mode
+            output_dir.mkdir()
+            results[mode] = time_logging(
+                output_dir, args.calls, args.work_us * 1e-6, mode == "async"
+            )
+            log_path = output_dir / "logs" / "experiment.log"
+            lines = log_path.read_text().count("\n")
+            print(f"{mode:5s}: {results[mode]:.2f} us/call ({lines} lines written)")
+
+    print(f"speedup: {results['sync'] / results['async']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
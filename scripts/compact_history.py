@@ -0,0 +1,33 @@
+import argparse
+
+from ai_research_template.history import (
+    DEFAULT_ROW_GROUP_SIZE,
+    HISTORY_DIR,
+    compact_history,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge Parquet history fragments into large row groups."
+    )
+    parser.add_argument(
+        "--history-dir",
+        type=str,
+        default=str(HISTORY_DIR),
+        help="Root of the partitioned history.",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help="Maximum rows per Parquet row group.",
+    )
+    args = parser.parse_args()
+
+    merged = compact_history(args.history_dir, row_group_size=args.row_group_size)
+    print(f"Compacted {merged} files in {args.history_dir}")
+
+
+if __name__ == "__main__":
+    main()
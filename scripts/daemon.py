@@ -0,0 +1,81 @@
+import argparse
+import os
+import sys
+
+from ai_research_template.daemon import (
+    DEFAULT_MAX_REQUESTS,
+    SOCKET_PATH,
+    serve,
+    submit,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Keep the package imported in pre-forked workers so that "
+            "run_experiment.py calls skip startup costs."
+        ),
+        epilog=(
+            "Example: uv run poe daemon start & then uv run poe exp as usual; "
+            "uv run poe daemon stop when done."
+        ),
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(SOCKET_PATH),
+        help="Unix socket to listen on or connect to",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("start", help="Run the daemon in the foreground.")
+    start.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes (default: CPU count)",
+    )
+    start.add_argument(
+        "--max-requests",
+        type=int,
+        default=DEFAULT_MAX_REQUESTS,
+        help="Requests per worker before it is replaced",
+    )
+    commands.add_parser("stop", help="Stop a running daemon.")
+    commands.add_parser("status", help="Check whether a daemon is running.")
+    args = parser.parse_args()
+
+    if args.command == "start":
+        try:
+            serve(
+                args.socket,
+                workers=args.workers,
+                max_requests=args.max_requests,
+                ready=lambda: print(
+                    f"Daemon {os.getpid()} listening on {args.socket}", flush=True
+                ),
+            )
+        except RuntimeError as e:
+            sys.exit(f"Error: {e}")
+        print("Daemon stopped.")
+        return
+
+    response = submit(
+        {"command": "ping" if args.command == "status" else "stop"},
+        args.socket,
+        timeout=5.0,
+    )
+    if response is None:
+        print(f"No daemon is listening on {args.socket}.")
+        if args.command == "status":
+            sys.exit(1)
+        return
+    if args.command == "status":
+        print(f"Daemon {response['pid']} listening on {args.socket}")
+    else:
+        print("Daemon stopping.")
+
+
+if __name__ == "__main__":
+    main()
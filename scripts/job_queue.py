@@ -0,0 +1,91 @@
+import argparse
+
+from ai_research_template.config import ExperimentConfig, load_config
+from ai_research_template.job_queue import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    QUEUE_PATH,
+    enqueue,
+    queue_status,
+    requeue_expired,
+    run_worker,
+)
+from ai_research_template.sweep import load_sweep, point_configs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Crash-resumable experiment queue shared by many workers.",
+        epilog=(
+            "Example: uv run poe queue enqueue --sweep configs/sweep_sample.yaml, "
+            "then uv run poe queue worker on every node."
+        ),
+    )
+    parser.add_argument(
+        "--db", type=str, default=str(QUEUE_PATH), help="Path to queue.db"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("enqueue", help="Add configs to the queue.")
+    source = add.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", type=str, help="Single config file")
+    source.add_argument("--sweep", type=str, help="Sweep file; adds every point")
+    add.add_argument(
+        "overrides",
+        nargs="*",
+        metavar="KEY=VALUE",
+        help="Dotted overrides for --config",
+    )
+    add.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help="Tries per job before it is marked failed",
+    )
+
+    worker = commands.add_parser("worker", help="Run queued jobs.")
+    worker.add_argument(
+        "--lease",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="Lease seconds; a dead worker's job is requeued after this",
+    )
+    worker.add_argument(
+        "--max-jobs", type=int, default=None, help="Stop after this many jobs"
+    )
+    worker.add_argument(
+        "--wait",
+        type=float,
+        default=0.0,
+        help="Keep polling this many seconds after the queue is empty",
+    )
+
+    commands.add_parser("status", help="Show job counts per status.")
+    commands.add_parser("requeue", help="Requeue jobs whose lease expired.")
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        if args.sweep:
+            config_path, points = load_sweep(args.sweep)
+            configs = point_configs(config_path, points)
+        else:
+            config_path = args.config
+            configs = [
+                load_config(args.config, args.overrides, schema=ExperimentConfig)
+            ]
+        added = enqueue(configs, str(config_path), args.db, args.max_attempts)
+        print(f"Added {added} jobs ({len(configs) - added} already queued)")
+    elif args.command == "worker":
+        ran = run_worker(
+            args.db, lease_seconds=args.lease, max_jobs=args.max_jobs, wait=args.wait
+        )
+        print(f"Ran {ran} jobs")
+    elif args.command == "requeue":
+        print(f"Requeued {requeue_expired(args.db)} expired jobs")
+
+    counts = queue_status(args.db)
+    print(", ".join(f"{status}: {count}" for status, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+from pathlib import Path
+
+from ai_research_template.experiment_index import (
+    INDEX_PATH,
+    index_rows,
+    parse_condition,
+    query_runs,
+)
+from ai_research_template.utils import SUMMARY_PATH, read_experiment_summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Query the SQLite experiment index.",
+        epilog=(
+            "Example: uv run poe query --order-by metric_mse "
+            "--where 'param_noise_std < 1' --limit 10"
+        ),
+    )
+    parser.add_argument(
+        "--db", type=str, default=str(INDEX_PATH), help="Path to experiments.db"
+    )
+    parser.add_argument("--order-by", type=str, default=None, help="Column to sort by.")
+    parser.add_argument(
+        "--desc", action="store_true", help="Sort from largest to smallest."
+    )
+    parser.add_argument(
+        "--where",
+        type=str,
+        action="append",
+        default=[],
+        help="Filter such as 'param_noise_std < 1' (repeatable).",
+    )
+    parser.add_argument("--limit", type=int, default=10, help="Maximum rows.")
+    parser.add_argument(
+        "--columns",
+        type=str,
+        default=None,
+        help="Comma-separated columns to print (default: order/filter columns).",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Rebuild the index from the summary CSV before querying.",
+    )
+    parser.add_argument(
+        "--summary",
+        type=str,
+        default=str(SUMMARY_PATH),
+        help="Summary CSV used by --rebuild.",
+    )
+    args = parser.parse_args()
+
+    if args.rebuild:
+        count = index_rows(read_experiment_summary(Path(args.summary)), args.db)
+        print(f"Indexed {count} runs from {args.summary}")
+
+    conditions = [parse_condition(text) for text in args.where]
+    runs = query_runs(
+        args.db,
+        order_by=args.order_by,
+        where=conditions,
+        limit=args.limit,
+        descending=args.desc,
+    )
+
+    if args.columns:
+        columns = args.columns.split(",")
+    else:
+        columns = ["timestamp"]
+        if args.order_by:
+            columns.append(args.order_by)
+        columns += [key for key, _, _ in conditions if key not in columns]
+        columns.append("path")
+
+    print("\t".join(columns))
+    for run in runs:
+        print("\t".join(str(run.get(column, "")) for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,27 @@
 import argparse
-from pathlib import Path
+import os
+import sys
 
-from ai_research_template.core import LinearModel
-from ai_research_template.data import generate_linear_data
-from ai_research_template.metrics import compute_mse
-from ai_research_template.utils import (
-    current_timestamp,
-    load_config,
-    prepare_output_dir,
-    save_params,
-    save_results,
-    setup_logger,
-    update_experiment_summary,
-    write_daily_report_request,
-    write_report,
+from ai_research_template.daemon import (
+    SOCKET_PATH,
+    DaemonError,
+    execute_request,
+    print_response,
+    submit,
 )
+from ai_research_template.profiling import PROFILE_MODES
+
+
+def parse_seeds(text: str) -> list[int]:
+    """Parse a seed list such as "0-99", "1,5,7" or "0-9,20"."""
+    seeds: list[int] = []
+    for part in text.split(","):
+        start, sep, end = part.partition("-")
+        if sep:
+            seeds.extend(range(int(start), int(end) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
 
 
 def main():
@@ -24,83 +31,75 @@ def main():
     parser.add_argument(
         "--config", type=str, default="configs/sample.yaml", help="Path to config file"
     )
-    args = parser.parse_args()
-
-    # 1. Load config
-    config = load_config(args.config)
-    output_dir_config = config.get("output_dir")
-    if output_dir_config:
-        base_dir = Path(output_dir_config)
-        experiment_name = base_dir.name
-        output_root = base_dir.parent
-    else:
-        experiment_name = config.get("experiment_name", "experiment")
-        output_root = Path(config.get("output_root", "outputs"))
-
-    timestamp = current_timestamp()
-    output_dir = prepare_output_dir(
-        experiment_name=experiment_name,
-        output_root=output_root,
-        timestamp=timestamp,
+    parser.add_argument(
+        "overrides",
+        nargs="*",
+        metavar="KEY=VALUE",
+        help="Dotted config overrides, e.g. noise_std=0.5",
     )
-
-    # Setup logger
-    logger = setup_logger(output_dir)
-    logger.info(f"Starting experiment: {timestamp}")
-    logger.info(f"Config: {config}")
-
-    # 2. Generate data
-    x, y = generate_linear_data(
-        n_samples=config["n_samples"],
-        slope=config["slope"],
-        intercept=config["intercept"],
-        noise_std=config["noise_std"],
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rerun even if an identical run (same config and code) exists",
     )
-
-    # 3. Fit model
-    model = LinearModel()
-    model.fit(x, y)
-
-    # 4. Evaluate
-    y_pred = model.predict(x)
-    mse = compute_mse(y, y_pred)
-
-    # 5. Save results
-    results = {
-        "config": config,
-        "metrics": {"mse": mse},
-        "model_params": {
-            "estimated_slope": float(model.slope),
-            "estimated_intercept": float(model.intercept),
-        },
-    }
-    save_results(results, output_dir)
-    save_params(config, output_dir)
-    update_experiment_summary(results, output_dir)
-    write_report(
-        [
-            "# Experiment Report",
-            "",
-            f"- Timestamp: {timestamp}",
-            f"- Experiment: {experiment_name}",
-            f"- Output: {output_dir}",
-            f"- MSE: {mse:.4f}",
-        ],
-        output_dir,
+    parser.add_argument(
+        "--seeds",
+        type=parse_seeds,
+        default=None,
+        help="Run all these seeds in one process and aggregate, e.g. 0-99 or 1,5,7",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile the run (implies --force); results go to artifacts/ and "
+        "report.md",
+    )
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=0.005,
+        help="Seconds between stack samples for --profile sample",
     )
-    request_path = write_daily_report_request(
-        output_dir=output_dir,
-        experiment_name=experiment_name,
-        timestamp=timestamp,
-        config_path=args.config,
-        metrics=results.get("metrics", {}),
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=str(SOCKET_PATH),
+        help="Socket of the experiment daemon (see poe daemon)",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run in this process even if a daemon is running",
     )
+    args = parser.parse_args()
 
-    logger.info(f"Experiment complete! Results saved to {output_dir}")
-    logger.info(f"MSE: {mse:.4f}")
-    logger.info(f"Estimated: y = {model.slope:.2f}x + {model.intercept:.2f}")
-    logger.info("Daily report request written.")
-    logger.info(f"Run: uv run poe daily-report --request {request_path}")
+    request = {
+        "command": "run",
+        "cwd": os.getcwd(),
+        "config": args.config,
+        "overrides": args.overrides,
+        "force": args.force,
+        "seeds": args.seeds,
+        "profile": args.profile,
+        "profile_interval": args.profile_interval,
+    }
+    # A running daemon (poe daemon start) has the package imported already;
+    # without one, the request runs here.
+    try:
+        response = None if args.no_daemon else submit(request, args.socket)
+    except DaemonError as e:
+        sys.exit(f"Error: {e}")
+    if response is None:
+        result = execute_request(request)
+    else:
+        print_response(response)
+        if not response["ok"]:
+            sys.exit(1)
+        result = response["result"]
+    if result["cached"]:
+        print(f"Identical run already exists, skipping: {result['output_dir']}")
+        print("Use --force to rerun.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,59 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+from ai_research_template.search import best_trial, load_search, run_search
+from ai_research_template.utils import new_run_id, write_atomic
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a successive halving or Hyperband search in parallel."
+    )
+    parser.add_argument(
+        "--search",
+        type=str,
+        default="configs/search_sample.yaml",
+        help="Path to search file",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rerun points that already have results"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Where to write the rung log (default: outputs/searches/<run_id>.json)",
+    )
+    args = parser.parse_args()
+
+    _, _, search = load_search(args.search)
+    start = time.perf_counter()
+    rungs = []
+    for rung in run_search(args.search, max_workers=args.workers, force=args.force):
+        rungs.append(rung)
+        top = rung["trials"][0]
+        print(
+            f"bracket {rung['bracket']} rung {rung['rung']}: "
+            f"{len(rung['trials'])} points at {search.budget}={rung['budget']}, "
+            f"best {search.metric}={top['value']:.4f} {top['point']}"
+        )
+    elapsed = time.perf_counter() - start
+    best = best_trial(rungs, search)
+    n_runs = sum(len(rung["trials"]) for rung in rungs)
+    print(f"{n_runs} runs in {elapsed:.1f}s")
+    print(f"Best {search.metric}={best['value']:.4f}: {best['point']} ({best['path']})")
+
+    output_path = Path(args.output or f"outputs/searches/{new_run_id()}.json")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    log = {"search": search.model_dump(), "best": best, "rungs": rungs}
+    write_atomic(output_path, json.dumps(log, indent=4).encode("utf-8"))
+    print(f"Rung log: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
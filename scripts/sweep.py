@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from tqdm import tqdm
+
+from ai_research_template.sweep import load_sweep, point_configs, run_sweep
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run a grid or random parameter sweep in parallel."
+    )
+    parser.add_argument(
+        "--sweep",
+        type=str,
+        default="configs/sweep_sample.yaml",
+        help="Path to sweep file",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="Worker processes (default: CPUs)"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Rerun points that already have results"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only print the expanded points"
+    )
+    args = parser.parse_args()
+
+    base_path, points = load_sweep(args.sweep)
+    configs = point_configs(base_path, points)
+    if args.dry_run:
+        for point in points:
+            print(point)
+        print(f"{len(points)} points over {base_path}")
+        return
+
+    start = time.perf_counter()
+    reused = 0
+    for _, cached in tqdm(
+        run_sweep(configs, base_path, max_workers=args.workers, force=args.force),
+        total=len(configs),
+    ):
+        reused += cached
+    elapsed = time.perf_counter() - start
+    print(
+        f"{len(configs)} points in {elapsed:.1f}s "
+        f"({len(configs) - reused} run, {reused} reused from earlier runs)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import argparse
+from contextlib import nullcontext
 
 from ai_research_template.core import ResearchModel
+from ai_research_template.profiling import PROFILE_MODES, Profiler
+from ai_research_template.tracking import MetricsLogger
 from ai_research_template.utils import (
-    current_timestamp,
     prepare_output_dir,
     save_params,
     save_results,
@@ -21,15 +23,21 @@ def main():
     parser.add_argument(
         "--output-root", type=str, default="outputs", help="Output root directory"
     )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        default=None,
+        help="Profile training; results go to artifacts/ and report.md",
+    )
     args = parser.parse_args()
+    profiler = Profiler(args.profile) if args.profile else None
 
     # Setup paths
-    timestamp = current_timestamp()
     output_dir = prepare_output_dir(
         experiment_name=args.experiment_name,
         output_root=args.output_root,
-        timestamp=timestamp,
     )
+    timestamp = output_dir.name
 
     # Setup logging
     logger = setup_logger(output_dir)
@@ -39,7 +47,9 @@ def main():
     # Execution (Do)
     model = ResearchModel(learning_rate=args.lr)
     data = [1.0, 2.0, 3.0, 4.0, 5.0]
-    result = model.run_computation(data)
+    with MetricsLogger(output_dir) as metrics_log, profiler or nullcontext():
+        result = model.run_computation(data)
+        metrics_log.log(0, final_value=result)
 
     logger.info(f"Result computed: {result}")
 
@@ -47,17 +57,18 @@ def main():
     metrics = {"success": True, "final_value": result}
     save_results(metrics, output_dir)
     save_params(vars(args), output_dir)
-    write_report(
-        [
-            "# Experiment Report",
-            "",
-            f"- Timestamp: {timestamp}",
-            f"- Experiment: {args.experiment_name}",
-            "- Status: Success",
-            f"- Result: {result}",
-        ],
-        output_dir,
-    )
+    report_lines = [
+        "# Experiment Report",
+        "",
+        f"- Timestamp: {timestamp}",
+        f"- Experiment: {args.experiment_name}",
+        "- Status: Success",
+        f"- Result: {result}",
+    ]
+    if profiler is not None:
+        profiler.save(output_dir)
+        report_lines += ["", *profiler.report_lines()]
+    write_report(report_lines, output_dir)
     request_path = write_daily_report_request(
         output_dir=output_dir,
         experiment_name=args.experiment_name,
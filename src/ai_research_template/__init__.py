@@ -4,29 +4,145 @@ This package provides core functionality for conducting reproducible
 research experiments with AI agent collaboration.
 
 Main modules:
+    - artifacts: Content-addressed, compressed artifact store
+    - benchmarks: Hot-path benchmark suite with JSON history and comparison
+    - config: Config loading with includes, overrides and validation
     - core: Core models and algorithms (LinearModel, ResearchModel)
+    - daemon: Warm experiment daemon with pre-forked workers (Unix socket)
     - data: Data generation and loading utilities
-    - metrics: Evaluation metrics (MSE, RMSE, MAE, R2)
+    - experiment: The sample experiment as an in-process function
+    - job_queue: Crash-resumable SQLite job queue with leased workers
+    - metrics: Evaluation metrics (MSE, RMSE, MAE, R2, error quantiles),
+      grouped per-segment variants, a by-name metric registry, and
+      bootstrap CIs
+    - profiling: cProfile and stack-sampling profiles of runs
+    - run_cache: Result cache keyed by config and source tree hashes
+    - search: Successive halving and Hyperband hyperparameter search
+    - sketch: Mergeable streaming quantile sketch (KLLSketch)
+    - sweep: Parallel grid/random parameter sweeps
+    - tracking: Structured per-step metrics logging (JSONL)
     - utils: Configuration, logging, and result management
 """
 
-from ai_research_template.core import LinearModel, ResearchModel
-from ai_research_template.data import generate_linear_data
-from ai_research_template.metrics import (
-    compute_mae,
-    compute_mse,
-    compute_r2,
-    compute_rmse,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ai_research_template.artifacts import (
+        ArtifactStore,
+        load_artifact,
+        save_artifact,
+    )
+    from ai_research_template.config import ExperimentConfig, load_config
+    from ai_research_template.core import LinearModel, ResearchModel
+    from ai_research_template.data import generate_linear_data
+    from ai_research_template.metrics import (
+        MetricEvaluation,
+        StreamingErrorSummary,
+        available_metrics,
+        bootstrap_confidence_intervals,
+        compute_absolute_error_quantiles,
+        compute_error_histogram,
+        compute_grouped_absolute_error_quantiles,
+        compute_grouped_mae,
+        compute_grouped_median_absolute_error,
+        compute_grouped_mse,
+        compute_grouped_r2,
+        compute_grouped_rmse,
+        compute_mae,
+        compute_median_absolute_error,
+        compute_mse,
+        compute_r2,
+        compute_rmse,
+        evaluate_metrics,
+        paired_permutation_test,
+        register_metric,
+    )
+    from ai_research_template.sketch import KLLSketch
+    from ai_research_template.tracking import MetricsLogger, load_metric_series
+
+# Public names are imported on first access (PEP 562), so importing one
+# submodule, e.g. utils from a small script, does not load NumPy, pandas
+# or pyarrow through this package.
+_LAZY_ATTRIBUTES = {
+    "ArtifactStore": "artifacts",
+    "ExperimentConfig": "config",
+    "KLLSketch": "sketch",
+    "LinearModel": "core",
+    "MetricEvaluation": "metrics",
+    "MetricsLogger": "tracking",
+    "ResearchModel": "core",
+    "StreamingErrorSummary": "metrics",
+    "available_metrics": "metrics",
+    "bootstrap_confidence_intervals": "metrics",
+    "compute_absolute_error_quantiles": "metrics",
+    "compute_error_histogram": "metrics",
+    "compute_grouped_absolute_error_quantiles": "metrics",
+    "compute_grouped_mae": "metrics",
+    "compute_grouped_median_absolute_error": "metrics",
+    "compute_grouped_mse": "metrics",
+    "compute_grouped_r2": "metrics",
+    "compute_grouped_rmse": "metrics",
+    "compute_mae": "metrics",
+    "compute_median_absolute_error": "metrics",
+    "compute_mse": "metrics",
+    "compute_r2": "metrics",
+    "compute_rmse": "metrics",
+    "evaluate_metrics": "metrics",
+    "generate_linear_data": "data",
+    "load_artifact": "artifacts",
+    "load_config": "config",
+    "load_metric_series": "tracking",
+    "paired_permutation_test": "metrics",
+    "register_metric": "metrics",
+    "save_artifact": "artifacts",
+}
 
 __all__ = [
+    "ArtifactStore",
+    "ExperimentConfig",
+    "KLLSketch",
     "LinearModel",
+    "MetricEvaluation",
+    "MetricsLogger",
     "ResearchModel",
+    "StreamingErrorSummary",
+    "available_metrics",
+    "bootstrap_confidence_intervals",
+    "compute_absolute_error_quantiles",
+    "compute_error_histogram",
+    "compute_grouped_absolute_error_quantiles",
+    "compute_grouped_mae",
+    "compute_grouped_median_absolute_error",
+    "compute_grouped_mse",
+    "compute_grouped_r2",
+    "compute_grouped_rmse",
     "compute_mae",
+    "compute_median_absolute_error",
     "compute_mse",
     "compute_r2",
     "compute_rmse",
+    "evaluate_metrics",
     "generate_linear_data",
+    "load_artifact",
+    "load_config",
+    "load_metric_series",
+    "paired_permutation_test",
+    "register_metric",
+    "save_artifact",
 ]
 
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
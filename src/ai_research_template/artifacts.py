@@ -0,0 +1,265 @@
+"""Content-addressed, compressed artifact store.
+
+Artifacts (datasets, model files, plots) are stored once per distinct
+content, keyed by the SHA-256 of their bytes:
+
+  outputs/store/
+    objects/
+      3f/
+        a1c2...e9.zst       # compressed blob
+
+A run keeps only a small reference per artifact:
+
+  outputs/<experiment_name>/<timestamp>/artifacts/
+    model.pkl.ref.json      # {"sha256": ..., "size": ..., "name": ...}
+
+Saving the same file from many runs of a sweep therefore costs one blob
+plus one reference each, and re-saving an unchanged artifact is just a
+hash computation.
+
+The store is a library API for experiment code to call with its own
+files; the sample pipeline does not use it. Its .npy sidecars stay plain
+files so load_results can memory-map them, and profiles are unique per
+run and opened directly by tools such as snakeviz.
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from ai_research_template.utils import atomic_open, write_atomic
+
+STORE_DIR = Path("outputs/store")
+REF_SUFFIX = ".ref.json"
+
+_CHUNK_SIZE = 1 << 20
+_EXTENSIONS = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+
+
+def _hash_stream(f: io.BufferedReader) -> str:
+    return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class ArtifactStore:
+    """Deduplicating blob store addressed by SHA-256.
+
+    Blobs are written atomically, so concurrent runs saving the same
+    content are safe; the last rename wins with identical bytes.
+
+    Attributes:
+        root: Store directory.
+        compression: Codec for new blobs ("zstd", "gzip" or "none").
+
+    Example:
+        >>> store = ArtifactStore()
+        >>> digest = store.put(Path("data/raw/train.csv"))
+        >>> store.get_bytes(digest)[:10]
+    """
+
+    def __init__(self, root: Path | str = STORE_DIR, compression: str = "zstd") -> None:
+        """Initialize the store.
+
+        Args:
+            root: Store directory (default: outputs/store).
+            compression: Codec for new blobs (default: "zstd", via pyarrow).
+
+        Raises:
+            ValueError: If the codec is unknown.
+        """
+        if compression not in _EXTENSIONS:
+            raise ValueError(
+                f"Unknown compression {compression!r}; "
+                f"expected one of {sorted(_EXTENSIONS)}."
+            )
+        self.root = Path(root)
+        self.compression = compression
+
+    def _blob_path(self, digest: str, compression: str) -> Path:
+        return (
+            self.root / "objects" / digest[:2] / (digest[2:] + _EXTENSIONS[compression])
+        )
+
+    def _find_blob(self, digest: str) -> tuple[Path, str] | None:
+        """Locate a blob regardless of the codec it was written with."""
+        for compression in _EXTENSIONS:
+            path = self._blob_path(digest, compression)
+            if path.exists():
+                return path, compression
+        return None
+
+    def has(self, digest: str) -> bool:
+        """Return True if a blob with this digest is stored."""
+        return self._find_blob(digest) is not None
+
+    def put(self, path: Path | str) -> str:
+        """Store a file's content and return its digest.
+
+        If the content is already stored, nothing is written.
+
+        Args:
+            path: File to store.
+
+        Returns:
+            Hex SHA-256 digest of the file content.
+        """
+        with open(path, "rb") as f:
+            digest = _hash_stream(f)
+            if not self.has(digest):
+                f.seek(0)
+                self._write_blob(digest, f)
+        return digest
+
+    def put_bytes(self, data: bytes) -> str:
+        """Store in-memory content and return its digest (see put)."""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.has(digest):
+            self._write_blob(digest, io.BytesIO(data))
+        return digest
+
+    def _write_blob(self, digest: str, source: BinaryIO) -> None:
+        blob_path = self._blob_path(digest, self.compression)
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_open(blob_path) as f:
+            while chunk := source.read(_CHUNK_SIZE):
+                self._compress(chunk, f)
+
+    def _compress(self, data: bytes, f: BinaryIO) -> None:
+        # Each chunk is a complete frame; zstd and gzip readers decode
+        # concatenated frames as one stream.
+        if self.compression == "none":
+            f.write(data)
+        else:
+            # pyarrow is only needed for compressed blobs.
+            import pyarrow as pa  # noqa: PLC0415
+
+            f.write(pa.compress(data, codec=self.compression, asbytes=True))
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[BinaryIO]:
+        """Open a stored blob for reading its decompressed content.
+
+        Args:
+            digest: Digest returned by put.
+
+        Yields:
+            Readable binary stream.
+
+        Raises:
+            FileNotFoundError: If no blob with this digest is stored.
+        """
+        found = self._find_blob(digest)
+        if found is None:
+            raise FileNotFoundError(f"No artifact with digest {digest} in {self.root}.")
+        path, compression = found
+        if compression == "none":
+            with open(path, "rb") as f:
+                yield f
+        else:
+            import pyarrow as pa  # noqa: PLC0415
+
+            with pa.input_stream(str(path), compression=compression) as stream:
+                yield stream
+
+    def get_bytes(self, digest: str) -> bytes:
+        """Return the decompressed content of a blob."""
+        with self.open(digest) as f:
+            return f.read()
+
+    def restore(self, digest: str, dest: Path | str) -> Path:
+        """Write a blob's content to a regular file.
+
+        Args:
+            digest: Digest returned by put.
+            dest: Destination file path.
+
+        Returns:
+            The destination path.
+        """
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        with self.open(digest) as src, atomic_open(dest) as f:
+            shutil.copyfileobj(src, f, _CHUNK_SIZE)
+        return dest
+
+
+def _ref_path(output_dir: Path, name: str) -> Path:
+    return Path(output_dir) / "artifacts" / (name + REF_SUFFIX)
+
+
+def save_artifact(
+    path: Path | str,
+    output_dir: Path,
+    name: str | None = None,
+    store: ArtifactStore | None = None,
+) -> str:
+    """Store a file and record a reference to it in a run's artifacts/.
+
+    Args:
+        path: File to save.
+        output_dir: Run directory (see utils.prepare_output_dir).
+        name: Artifact name (default: the file name). May contain "/" to
+            group artifacts in subdirectories.
+        store: Store to use (default: ArtifactStore()).
+
+    Returns:
+        Digest of the stored content.
+
+    Example:
+        >>> save_artifact(plot_path, output_dir, name="plots/fit.png")
+    """
+    store = store or ArtifactStore()
+    path = Path(path)
+    digest = store.put(path)
+    ref_path = _ref_path(output_dir, name or path.name)
+    ref_path.parent.mkdir(parents=True, exist_ok=True)
+    ref = {"sha256": digest, "size": path.stat().st_size, "name": name or path.name}
+    write_atomic(ref_path, json.dumps(ref, indent=2).encode("utf-8"))
+    return digest
+
+
+def read_artifact_ref(output_dir: Path, name: str) -> dict[str, Any]:
+    """Return the reference record of a run's artifact."""
+    with open(_ref_path(output_dir, name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_artifact(
+    output_dir: Path, name: str, store: ArtifactStore | None = None
+) -> bytes:
+    """Return the content of a run's artifact.
+
+    Args:
+        output_dir: Run directory.
+        name: Artifact name passed to save_artifact.
+        store: Store to use (default: ArtifactStore()).
+
+    Returns:
+        The artifact bytes.
+    """
+    store = store or ArtifactStore()
+    return store.get_bytes(read_artifact_ref(output_dir, name)["sha256"])
+
+
+def list_artifacts(output_dir: Path) -> list[str]:
+    """Return the names of all artifacts referenced by a run."""
+    artifact_dir = Path(output_dir) / "artifacts"
+    return sorted(
+        str(path.relative_to(artifact_dir))[: -len(REF_SUFFIX)]
+        for path in artifact_dir.rglob("*" + REF_SUFFIX)
+    )
+
+
+def store_size(store: ArtifactStore | None = None) -> int:
+    """Return the total on-disk size of a store's blobs in bytes."""
+    store = store or ArtifactStore()
+    return sum(
+        os.path.getsize(path)
+        for path in (store.root / "objects").rglob("*")
+        if path.is_file()
+    )
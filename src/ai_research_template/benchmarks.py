@@ -0,0 +1,523 @@
+"""Benchmark suite for the hot paths of the package.
+
+Each benchmark is a setup function registered with ``@benchmark``. It
+receives an input size, prepares inputs (temporary files included) and
+yields the zero-argument callable to time; code after the yield cleans
+up. The runner times each callable with ``timeit``-style autoranging and
+keeps the best and median time per call over several repeats.
+
+Results are stored as one JSON file per run under
+``outputs/benchmarks/``:
+
+  {"timestamp": "...", "commit": "3f2a9c1", "python": "3.13.0",
+   "numpy": "2.2.0", "machine": "x86_64",
+   "results": {"core.LinearModel.fit[100000]":
+                   {"min_s": 0.0012, "median_s": 0.0013, "number": 200,
+                    "repeat": 5}, ...}}
+
+and compare_results flags benchmarks that got slower than a baseline by
+more than a threshold (see scripts/benchmark.py compare).
+
+Startup benchmarks (measure_import_time, scripts/benchmark.py startup)
+time ``import <module>`` in fresh interpreters with ``-X importtime``, so
+command-line tools stay quick to start. Their history is kept apart in
+``outputs/benchmarks/startup/``.
+"""
+
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ai_research_template import metrics
+from ai_research_template.core import LinearModel
+from ai_research_template.data import generate_linear_data
+from ai_research_template.utils import (
+    append_summary_rows,
+    close_logger,
+    new_run_id,
+    setup_logger,
+    update_experiment_summary,
+    write_atomic,
+)
+
+BENCHMARK_DIR = Path("outputs/benchmarks")
+DEFAULT_THRESHOLD = 0.2
+
+STARTUP_DIR = BENCHMARK_DIR / "startup"
+STARTUP_BUDGET_S = 0.05
+# Modules behind the lightweight scripts, which should import in
+# STARTUP_BUDGET_S.
+STARTUP_MODULES = (
+    "ai_research_template",
+    "ai_research_template.utils",  # daily_report.py
+    "ai_research_template.experiment_index",  # query_experiments.py
+    "ai_research_template.tracking",
+)
+
+SAMPLE_SIZES = (1_000, 100_000, 1_000_000)
+SUMMARY_ROWS = (10, 1_000, 100_000)
+
+Setup = Callable[[int], AbstractContextManager[Callable[[], Any]]]
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark."""
+
+    name: str
+    setup: Setup
+    sizes: tuple[int, ...]
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str, sizes: tuple[int, ...] = SAMPLE_SIZES
+) -> Callable[[Callable[[int], Iterator[Callable[[], Any]]]], Setup]:
+    """Register a setup generator as a benchmark.
+
+    Args:
+        name: Benchmark name, e.g. "metrics.compute_mse".
+        sizes: Input sizes to run it with.
+    """
+
+    def decorator(func: Callable[[int], Iterator[Callable[[], Any]]]) -> Setup:
+        setup = contextmanager(func)
+        BENCHMARKS[name] = Benchmark(name, setup, sizes)
+        return setup
+
+    return decorator
+
+
+def time_callable(
+    func: Callable[[], Any], *, min_time: float = 0.2, repeat: int = 5
+) -> dict[str, float | int]:
+    """Time a callable.
+
+    The number of calls per measurement grows until one measurement takes
+    at least min_time, as in timeit.Timer.autorange.
+
+    Args:
+        func: Zero-argument callable.
+        min_time: Minimum seconds per measurement.
+        repeat: Number of measurements.
+
+    Returns:
+        Mapping with "min_s" and "median_s" (seconds per call) and the
+        "number" of calls per measurement and "repeat".
+    """
+    number = 1
+    while True:
+        elapsed = _measure(func, number)
+        if elapsed >= min_time:
+            break
+        # Aim a little above min_time so the next try usually suffices.
+        number = max(number * 2, math.ceil(number * 1.2 * min_time / elapsed))
+    times = [elapsed / number]
+    times += [_measure(func, number) / number for _ in range(repeat - 1)]
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def _measure(func: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    # Guard against a zero reading from a coarse clock.
+    return max(time.perf_counter() - start, 1e-9)
+
+
+def run_benchmarks(
+    pattern: str | None = None,
+    *,
+    quick: bool = False,
+    min_time: float = 0.2,
+    repeat: int = 5,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, dict[str, float | int]]:
+    """Run registered benchmarks.
+
+    Args:
+        pattern: Regular expression; only benchmarks whose name matches
+            (re.search) are run.
+        quick: Run each benchmark at its smallest size only.
+        min_time: Minimum seconds per measurement.
+        repeat: Number of measurements.
+        progress: Called with each result key before it runs.
+
+    Returns:
+        Timings (see time_callable) keyed by ``"<name>[<size>]"``.
+    """
+    results = {}
+    for bench in BENCHMARKS.values():
+        if pattern is not None and not re.search(pattern, bench.name):
+            continue
+        for size in bench.sizes[:1] if quick else bench.sizes:
+            key = f"{bench.name}[{size}]"
+            if progress is not None:
+                progress(key)
+            with bench.setup(size) as func:
+                results[key] = time_callable(func, min_time=min_time, repeat=repeat)
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+def save_history(
+    results: dict[str, dict[str, float | int]],
+    history_dir: Path | str = BENCHMARK_DIR,
+) -> Path:
+    """Store a benchmark run in the history directory.
+
+    Args:
+        results: Output of run_benchmarks.
+        history_dir: Directory of the JSON history.
+
+    Returns:
+        Path of the new ``<run_id>.json`` file.
+    """
+    history_dir = Path(history_dir)
+    history_dir.mkdir(parents=True, exist_ok=True)
+    run_id = new_run_id()
+    record = {
+        "timestamp": run_id,
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    path = history_dir / f"{run_id}.json"
+    write_atomic(path, json.dumps(record, indent=2).encode("utf-8"))
+    return path
+
+
+def history_files(history_dir: Path | str = BENCHMARK_DIR) -> list[Path]:
+    """Return the stored benchmark runs, oldest first."""
+    return sorted(Path(history_dir).glob("*.json"))
+
+
+def load_benchmark_run(path: Path | str) -> dict[str, Any]:
+    """Load one stored benchmark run."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(
+    baseline: dict[str, dict[str, float | int]],
+    current: dict[str, dict[str, float | int]],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    stat: str = "min_s",
+) -> list[dict[str, Any]]:
+    """Compare two benchmark runs.
+
+    Args:
+        baseline: Results of the reference run.
+        current: Results of the run to check.
+        threshold: Allowed slowdown as a fraction (0.2 = 20% slower).
+        stat: Statistic to compare, "min_s" (least noisy) or "median_s".
+
+    Returns:
+        One row per benchmark present in both runs, with "name",
+        "baseline", "current", "ratio" (current / baseline) and
+        "regressed", sorted by ratio from worst to best.
+    """
+    rows = []
+    for name in baseline.keys() & current.keys():
+        before, after = baseline[name][stat], current[name][stat]
+        ratio = after / before
+        rows.append(
+            {
+                "name": name,
+                "baseline": before,
+                "current": after,
+                "ratio": ratio,
+                "regressed": ratio > 1 + threshold,
+            }
+        )
+    rows.sort(key=lambda row: row["ratio"], reverse=True)
+    return rows
+
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> list[dict[str, Any]]:
+    """Parse the ``-X importtime`` report of an interpreter.
+
+    Args:
+        stderr: Standard error of ``python -X importtime ...``.
+
+    Returns:
+        One row per imported module, in report order, with "module",
+        "self_s", "cumulative_s" (including the modules it imported) and
+        "depth" (0 for imports made directly by the program).
+    """
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append(
+            {
+                "module": module,
+                "self_s": int(self_us) * 1e-6,
+                "cumulative_s": int(cumulative_us) * 1e-6,
+                "depth": len(indent) // 2,
+            }
+        )
+    return rows
+
+
+def _import_rows(rows: list[dict[str, Any]], module: str) -> list[dict[str, Any]]:
+    """Return the rows of one top-level import, the module's own row last.
+
+    The report lists a module after everything it imported, so its
+    imports are the rows since the previous top-level row. An empty list
+    means the interpreter had already imported the module at startup.
+    """
+    start = 0
+    for i, row in enumerate(rows):
+        if row["depth"] != 0:
+            continue
+        if row["module"] == module:
+            return rows[start : i + 1]
+        start = i + 1
+    return []
+
+
+def measure_import_time(
+    module: str, *, repeat: int = 5, n_heaviest: int = 5
+) -> dict[str, Any]:
+    """Time ``import <module>`` in fresh interpreters.
+
+    Each measurement starts a new interpreter with ``-X importtime`` and
+    reads the cumulative time of the module's import, so interpreter
+    startup is excluded. An untimed first run writes the bytecode caches
+    (even when PYTHONDONTWRITEBYTECODE is set), since compiling sources
+    would otherwise dominate.
+
+    Args:
+        module: Dotted module name.
+        repeat: Number of measurements.
+        n_heaviest: Number of heaviest imports to report.
+
+    Returns:
+        Mapping with "min_s", "median_s", "number" (always 1) and
+        "repeat", as in time_callable, plus "heaviest": (module, self
+        seconds) pairs of the fastest run, heaviest first.
+    """
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key != "PYTHONDONTWRITEBYTECODE"
+    }
+    command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    subprocess.run(command, env=env, capture_output=True, check=True)
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            command, env=env, capture_output=True, text=True, check=True
+        )
+        rows = _import_rows(parse_importtime(completed.stderr), module)
+        runs.append((rows[-1]["cumulative_s"] if rows else 0.0, rows))
+    times = [total for total, _ in runs]
+    _, fastest = min(runs, key=lambda run: run[0])
+    heaviest = sorted(fastest, key=lambda row: row["self_s"], reverse=True)
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "number": 1,
+        "repeat": repeat,
+        "heaviest": [(row["module"], row["self_s"]) for row in heaviest[:n_heaviest]],
+    }
+
+
+# --- Suite -------------------------------------------------------------------
+
+
+def _regression_data(size: int) -> tuple[np.ndarray, np.ndarray]:
+    return generate_linear_data(size, slope=2.0, intercept=1.0, noise_std=0.5, seed=0)
+
+
+def _predictions(size: int) -> tuple[np.ndarray, np.ndarray]:
+    x, y = _regression_data(size)
+    return y, 2.0 * x + 1.0
+
+
+@benchmark("core.LinearModel.fit")
+def _bench_fit(size: int) -> Iterator[Callable[[], Any]]:
+    x, y = _regression_data(size)
+    yield lambda: LinearModel().fit(x, y)
+
+
+@benchmark("core.LinearModel.predict")
+def _bench_predict(size: int) -> Iterator[Callable[[], Any]]:
+    x, y = _regression_data(size)
+    model = LinearModel()
+    model.fit(x, y)
+    yield lambda: model.predict(x)
+
+
+@benchmark("data.generate_linear_data")
+def _bench_generate(size: int) -> Iterator[Callable[[], Any]]:
+    yield lambda: _regression_data(size)
+
+
+def _register_metric(name: str, call: Callable[..., Any], **kwargs: Any) -> None:
+    @benchmark(f"metrics.{name}", kwargs.pop("sizes", SAMPLE_SIZES))
+    def _bench(size: int) -> Iterator[Callable[[], Any]]:
+        y_true, y_pred = _predictions(size)
+        groups = np.arange(size) % 16
+        arguments = {
+            key: groups if value == "groups" else value for key, value in kwargs.items()
+        }
+        yield lambda: call(y_true, y_pred, **arguments)
+
+
+for _name in ("compute_mse", "compute_rmse", "compute_mae", "compute_r2"):
+    _register_metric(_name, getattr(metrics, _name))
+_register_metric("compute_median_absolute_error", metrics.compute_median_absolute_error)
+_register_metric(
+    "compute_absolute_error_quantiles",
+    metrics.compute_absolute_error_quantiles,
+    quantiles=(0.5, 0.9, 0.99),
+)
+_register_metric("compute_error_histogram", metrics.compute_error_histogram)
+for _name in (
+    "compute_grouped_mse",
+    "compute_grouped_rmse",
+    "compute_grouped_mae",
+    "compute_grouped_r2",
+    "compute_grouped_median_absolute_error",
+):
+    _register_metric(_name, getattr(metrics, _name), groups="groups")
+_register_metric(
+    "compute_grouped_absolute_error_quantiles",
+    metrics.compute_grouped_absolute_error_quantiles,
+    groups="groups",
+    quantiles=(0.5, 0.9, 0.99),
+)
+_register_metric(
+    "evaluate_metrics", metrics.evaluate_metrics, names=metrics.available_metrics()
+)
+_register_metric(
+    "bootstrap_confidence_intervals",
+    metrics.bootstrap_confidence_intervals,
+    sizes=(1_000, 10_000),
+    n_resamples=200,
+    seed=0,
+)
+
+
+@benchmark("metrics.paired_permutation_test", (1_000, 10_000))
+def _bench_permutation(size: int) -> Iterator[Callable[[], Any]]:
+    y_true, y_pred = _predictions(size)
+    y_other = y_pred + 0.01
+    yield lambda: metrics.paired_permutation_test(
+        y_true, y_pred, y_other, n_resamples=1000, seed=0
+    )
+
+
+@benchmark("metrics.StreamingErrorSummary.update")
+def _bench_streaming(size: int) -> Iterator[Callable[[], Any]]:
+    y_true, y_pred = _predictions(size)
+    summary = metrics.StreamingErrorSummary()
+    yield lambda: summary.update(y_true, y_pred)
+
+
+@benchmark("metrics.summarize_replicates", (10, 1_000))
+def _bench_replicates(size: int) -> Iterator[Callable[[], Any]]:
+    values = np.random.default_rng(0).normal(size=size)
+    yield lambda: metrics.summarize_replicates(values)
+
+
+@benchmark("utils.update_experiment_summary", SUMMARY_ROWS)
+def _bench_summary(size: int) -> Iterator[Callable[[], Any]]:
+    """Append one run to a summary (CSV and SQLite index) of size rows.
+
+    Each call first truncates the CSV back to size rows and re-records the
+    same run path (which replaces its index row), so the summary does not
+    grow while it is timed.
+    """
+    results = {
+        "config": {"n_samples": 100, "noise_std": 0.5, "seed": 0},
+        "metrics": {"mse": 0.25, "rmse": 0.5, "r2": 0.9},
+        "model_params": {"estimated_slope": 2.0, "estimated_intercept": 1.0},
+    }
+    with tempfile.TemporaryDirectory() as tmpdir:
+        summary_path = Path(tmpdir) / "experiments.csv"
+        run_dir = Path(tmpdir) / f"run{size}"
+        rows = [
+            {"timestamp": f"run{i}", "path": f"{tmpdir}/run{i}", "metric_mse": i}
+            for i in range(size)
+        ]
+        append_summary_rows(rows, summary_path)
+        # Settle the columns first, so timed calls never rewrite the header,
+        # then note where the size rows end.
+        update_experiment_summary(results, run_dir, summary_path)
+        content = summary_path.read_bytes()
+        summary_size = content.rfind(b"\n", 0, len(content) - 1) + 1
+
+        def append() -> None:
+            os.truncate(summary_path, summary_size)
+            update_experiment_summary(results, run_dir, summary_path)
+
+        yield append
+
+
+def _bench_logging(async_logging: bool) -> None:
+    @benchmark(f"utils.setup_logger.{'async' if async_logging else 'sync'}", (1_000,))
+    def _bench(size: int) -> Iterator[Callable[[], Any]]:
+        """Log size messages through a logger from setup_logger."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logger = setup_logger(
+                Path(tmpdir),
+                name="benchmark",
+                async_logging=async_logging,
+                console=False,
+            )
+            logger.propagate = False
+
+            def log_batch() -> None:
+                for step in range(size):
+                    logger.info(f"step={step} loss={1.0 / (step + 1):.6f}")
+
+            yield log_batch
+            close_logger("benchmark")
+
+
+_bench_logging(async_logging=False)
+_bench_logging(async_logging=True)
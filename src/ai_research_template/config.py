@@ -0,0 +1,256 @@
+"""Configuration loading and validation.
+
+Config files are YAML. A file may build on others with ``include``:
+
+  # configs/noisy.yaml
+  include: sample.yaml      # or a list; paths are relative to this file
+  noise_std: 2.0            # overrides the included value
+
+Included files are merged in order and the including file wins; nested
+mappings are merged key by key. Values can be overridden from the command
+line with dotted ``key=value`` strings (e.g. ``model.lr=0.1``), where the
+value is parsed as YAML.
+
+Parsed files are cached by path and revalidated by mtime and size, and by
+content hash when those change, so expanding thousands of sweep configs
+from one base file parses it once.
+"""
+
+import copy
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import yaml
+from pydantic import BaseModel, ConfigDict, Field
+
+# The libyaml-based loader is several times faster when PyYAML was built
+# with it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+INCLUDE_KEY = "include"
+
+
+class ExperimentConfig(BaseModel):
+    """Schema of the run_experiment.py configuration.
+
+    Unknown keys are kept, so experiments can add their own parameters.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    n_samples: int = Field(gt=0)
+    slope: float
+    intercept: float
+    noise_std: float = Field(ge=0)
+    seed: int | None = None
+    metrics: list[str] = ["mse"]
+    accurate_metrics: bool = False
+    parquet_history: bool = False
+    async_logging: bool = False
+    experiment_name: str = "experiment"
+    output_root: str = "outputs"
+    output_dir: str | None = None
+
+
+# ExperimentConfig keys that only control where and how a run is recorded,
+# not its results.
+BOOKKEEPING_KEYS = (
+    "async_logging",
+    "experiment_name",
+    "output_dir",
+    "output_root",
+    "parquet_history",
+    "search_bracket",
+    "search_rung",
+)
+
+
+@dataclass
+class _CacheEntry:
+    mtime_ns: int
+    size: int
+    digest: str
+    data: dict[str, Any]
+
+
+_CACHE: dict[Path, _CacheEntry] = {}
+
+
+def clear_config_cache() -> None:
+    """Drop all cached parsed config files."""
+    _CACHE.clear()
+
+
+def _parse_file(path: Path) -> dict[str, Any]:
+    """Return the parsed content of one YAML file, using the cache.
+
+    The returned dict is shared with the cache and must not be mutated.
+    """
+    stat = path.stat()
+    entry = _CACHE.get(path)
+    if entry and (entry.mtime_ns, entry.size) == (stat.st_mtime_ns, stat.st_size):
+        return entry.data
+
+    raw = path.read_bytes()
+    digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    if entry is None or entry.digest != digest:
+        data = yaml.load(raw, Loader=_YAML_LOADER) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Config {path} must contain a mapping at top level.")
+        entry = _CacheEntry(stat.st_mtime_ns, stat.st_size, digest, data)
+    else:
+        # Touched but unchanged: refresh the stamp and keep the parse.
+        entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+    _CACHE[path] = entry
+    return entry.data
+
+
+def merge_configs(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    """Deep-merge two configs into a new dict; values in override win.
+
+    Nested mappings are merged recursively; any other value (including
+    lists) replaces the base value.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_configs(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _resolve(path: Path, chain: tuple[Path, ...]) -> dict[str, Any]:
+    """Load a file with its includes merged in."""
+    if path in chain:
+        cycle = " -> ".join(str(p) for p in (*chain, path))
+        raise ValueError(f"Config include cycle: {cycle}")
+    data = _parse_file(path)
+    includes = data.get(INCLUDE_KEY, [])
+    if isinstance(includes, str):
+        includes = [includes]
+
+    merged: dict[str, Any] = {}
+    for include in includes:
+        merged = merge_configs(
+            merged, _resolve((path.parent / include).resolve(), (*chain, path))
+        )
+    own = {key: value for key, value in data.items() if key != INCLUDE_KEY}
+    return merge_configs(merged, own)
+
+
+def apply_overrides(config: dict[str, Any], overrides: list[str]) -> dict[str, Any]:
+    """Apply dotted ``key=value`` overrides to a config.
+
+    Args:
+        config: Config to update in place.
+        overrides: Strings such as ``"noise_std=0.5"`` or
+            ``"model.layers=[64, 64]"``. Values are parsed as YAML, so
+            numbers, booleans, lists and null keep their types.
+
+    Returns:
+        The updated config.
+
+    Raises:
+        ValueError: If an override is not of the form key=value, or a
+            dotted key descends into a non-mapping value.
+    """
+    for override in overrides:
+        key, sep, raw_value = override.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ValueError(f"Invalid override {override!r}; expected key=value.")
+        set_dotted(config, key, yaml.load(raw_value, Loader=_YAML_LOADER))
+    return config
+
+
+def set_dotted(config: dict[str, Any], key: str, value: Any) -> None:
+    """Set a possibly nested config value addressed by a dotted key.
+
+    Missing intermediate mappings are created.
+
+    Args:
+        config: Config to update in place.
+        key: Key such as ``"noise_std"`` or ``"model.lr"``.
+        value: Value to set.
+
+    Raises:
+        ValueError: If the key descends into a non-mapping value.
+    """
+    *parents, leaf = key.split(".")
+    node = config
+    for part in parents:
+        node = node.setdefault(part, {})
+        if not isinstance(node, dict):
+            raise ValueError(f"Cannot override {key!r}: {part!r} is not a mapping.")
+    node[leaf] = value
+
+
+def load_config(
+    config_path: str | Path,
+    overrides: list[str] | None = None,
+    schema: type[BaseModel] | None = None,
+) -> dict[str, Any]:
+    """Load configuration from a YAML file.
+
+    Args:
+        config_path: Path to the YAML configuration file.
+        overrides: Dotted ``key=value`` overrides applied after includes
+            (see apply_overrides).
+        schema: Pydantic model to validate against, e.g. ExperimentConfig.
+            The returned dict then holds the coerced values and the
+            schema's defaults.
+
+    Returns:
+        Dictionary containing the configuration parameters. It is a fresh
+        copy, so callers may modify it.
+
+    Raises:
+        FileNotFoundError: If the config file does not exist.
+        yaml.YAMLError: If the file contains invalid YAML.
+        ValueError: On include cycles or invalid overrides.
+        pydantic.ValidationError: If the config does not match the schema
+            (a ValueError subclass).
+
+    Example:
+        >>> config = load_config("configs/sample.yaml", ["noise_std=0.5"])
+        >>> config["noise_std"]
+        0.5
+    """
+    config = copy.deepcopy(_resolve(Path(config_path).resolve(), ()))
+    if overrides:
+        apply_overrides(config, overrides)
+    if schema is not None:
+        config = schema.model_validate(config).model_dump()
+    return config
+
+
+def config_hash(config: dict[str, Any], exclude: Iterable[str] = ()) -> str:
+    """Return a deterministic hash of a config.
+
+    The config is serialized as canonical JSON (sorted keys, no
+    whitespace), so key order and YAML formatting do not matter. Validate
+    with a schema first if values such as ``1`` and ``1.0`` should hash the
+    same.
+
+    Args:
+        config: Config to hash.
+        exclude: Top-level keys that do not affect results (e.g. output
+            locations) and are left out of the hash.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    excluded = set(exclude)
+    canonical = json.dumps(
+        {key: value for key, value in config.items() if key not in excluded},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -59,6 +59,35 @@ class LinearModel:
         return self.slope * x + self.intercept
 
 
+def fit_linear_replicates(
+    x: np.ndarray, y: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Fit one least-squares line per row of y, sharing the inputs x.
+
+    All replicates are solved in a single lstsq call with multiple
+    right-hand sides, which is much faster than fitting a LinearModel per
+    row.
+
+    Args:
+        x: Input feature array of shape (n_samples,).
+        y: Target values of shape (n_replicates, n_samples).
+
+    Returns:
+        A tuple of (slopes, intercepts), each of shape (n_replicates,).
+
+    Raises:
+        ValueError: If x is empty or y has a different number of samples.
+    """
+    if len(x) == 0:
+        raise ValueError("Input arrays must not be empty.")
+    if y.ndim != 2 or y.shape[1] != len(x):  # noqa: PLR2004
+        raise ValueError(f"y must have shape (n_replicates, {len(x)}), got {y.shape}.")
+
+    a = np.vstack([x, np.ones(len(x))]).T
+    slopes, intercepts = np.linalg.lstsq(a, y.T, rcond=None)[0]
+    return slopes, intercepts
+
+
 class ResearchModel:
     """A simple research model for experimental computations.
 
@@ -0,0 +1,354 @@
+"""Warm experiment daemon behind a Unix socket.
+
+Starting an experiment from the command line pays for interpreter
+startup, importing NumPy and the package, and parsing the config before
+any work happens. When agents or scripts call ``poe exp`` many times in a
+row, that fixed cost dominates. The daemon pays it once:
+
+  uv run poe daemon start &      # preload the package, fork workers
+  uv run poe exp noise_std=0.5   # thin client: forwards the request
+  uv run poe daemon stop
+
+``serve`` imports the experiment code, binds ``outputs/.daemon.sock`` and
+forks ``workers`` processes that accept connections on the shared
+socket, so every request runs in an already warm process. The master
+process replaces workers that exit (after ``max_requests`` requests or a
+crash) and removes the socket on SIGTERM or SIGINT.
+
+The protocol is one JSON object per line, one request per connection:
+
+  -> {"command": "run", "cwd": "/project", "config": "configs/sample.yaml",
+      "overrides": ["noise_std=0.5"], "force": false, "seeds": null,
+      "profile": null, "profile_interval": 0.005}
+  <- {"ok": true, "result": {"output_dir": "...", "cached": false},
+      "stdout": "...", "stderr": "..."}
+
+``command`` may also be "ping" (returns the master pid) or "stop". A run
+request executes in ``cwd``, and what the run prints is sent back for
+the client to print, so the client behaves like an in-process run.
+submit returns None when no daemon is listening, or when the package
+sources changed since the daemon started (the daemon then shuts down),
+and callers run the request in-process with execute_request instead.
+
+Only the standard library is imported at module level, so the client
+side stays fast. The daemon uses fork and is therefore POSIX only.
+"""
+
+import contextlib
+import importlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+SOCKET_PATH = Path("outputs/.daemon.sock")
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+DEFAULT_MAX_REQUESTS = 1000
+
+
+class DaemonError(RuntimeError):
+    """The daemon accepted a request but did not answer it."""
+
+
+def execute_request(request: dict[str, Any]) -> dict[str, Any]:
+    """Run one experiment request in this process.
+
+    This is the body of scripts/run_experiment.py; the daemon workers and
+    the client's in-process fallback both use it.
+
+    Args:
+        request: A "run" request (see the module docstring). ``cwd`` is
+            ignored here; the daemon changes into it beforehand.
+
+    Returns:
+        Mapping with "output_dir" and "cached" (True if an identical
+        earlier run was reused).
+    """
+    # Imported here so the client only pays for them when it runs
+    # in-process.
+    from ai_research_template.config import (  # noqa: PLC0415
+        ExperimentConfig,
+        load_config,
+    )
+    from ai_research_template.experiment import (  # noqa: PLC0415
+        run_experiment,
+        run_experiment_replicates,
+    )
+    from ai_research_template.profiling import Profiler  # noqa: PLC0415
+    from ai_research_template.utils import StageTimer  # noqa: PLC0415
+
+    profiler = None
+    if request.get("profile"):
+        profiler = Profiler(
+            request["profile"], interval=request.get("profile_interval", 0.005)
+        )
+    timer = StageTimer()
+    with timer.stage("load_config"):
+        config = load_config(
+            request["config"], request.get("overrides", []), schema=ExperimentConfig
+        )
+    if request.get("seeds") is not None:
+        output_dir = run_experiment_replicates(
+            config,
+            request["seeds"],
+            config_path=request["config"],
+            timer=timer,
+            profiler=profiler,
+        )
+        return {"output_dir": str(output_dir), "cached": False}
+    # A reused run has nothing to profile.
+    output_dir, cached = run_experiment(
+        config,
+        config_path=request["config"],
+        force=request.get("force", False) or profiler is not None,
+        timer=timer,
+        profiler=profiler,
+    )
+    return {"output_dir": str(output_dir), "cached": cached}
+
+
+def source_stamp(root: Path = PACKAGE_DIR) -> list[tuple[str, int, int]]:
+    """Return (path, mtime_ns, size) of every Python source under root.
+
+    A daemon compares this with the stamp taken at startup to notice that
+    the code it has loaded is out of date. Only stat calls are needed.
+    """
+    stamp = []
+    for path in sorted(root.rglob("*.py")):
+        stat = path.stat()
+        stamp.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return stamp
+
+
+def _send(conn: socket.socket, message: dict[str, Any]) -> None:
+    conn.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def _receive(conn: socket.socket) -> dict[str, Any] | None:
+    """Read one JSON line; None if the peer closed without sending one."""
+    with conn.makefile("rb") as f:
+        line = f.readline()
+    if not line.endswith(b"\n"):
+        return None
+    return json.loads(line)
+
+
+def submit(
+    request: dict[str, Any],
+    socket_path: Path | str = SOCKET_PATH,
+    *,
+    timeout: float | None = None,
+) -> dict[str, Any] | None:
+    """Send a request to a running daemon and wait for the response.
+
+    Args:
+        request: Request (see the module docstring).
+        socket_path: Socket the daemon listens on.
+        timeout: Seconds to wait for the response (default: no limit).
+
+    Returns:
+        The response, or None if no daemon is listening or it runs
+        outdated code; run the request in-process then.
+
+    Raises:
+        DaemonError: If the connection broke before a response arrived,
+            e.g. because the worker was killed mid-run.
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            conn.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        conn.settimeout(timeout)
+        try:
+            _send(conn, request)
+            response = _receive(conn)
+        except OSError as e:
+            raise DaemonError(f"Lost the connection to the daemon: {e}") from e
+    finally:
+        conn.close()
+    if response is None:
+        raise DaemonError("The daemon closed the connection without a response.")
+    if response.get("stale"):
+        return None
+    return response
+
+
+def _handle(conn: socket.socket, stamp: list[tuple[str, int, int]]) -> None:
+    """Serve one connection in a worker."""
+    request = _receive(conn)
+    if request is None:
+        return
+    command = request.get("command", "run")
+    if command == "ping":
+        _send(conn, {"ok": True, "pid": os.getppid()})
+        return
+    if command == "stop":
+        _send(conn, {"ok": True})
+        os.kill(os.getppid(), signal.SIGTERM)
+        return
+    if source_stamp() != stamp:
+        # The client runs the request in-process; a restarted daemon
+        # loads the new code.
+        _send(conn, {"ok": False, "stale": True})
+        os.kill(os.getppid(), signal.SIGTERM)
+        return
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    response: dict[str, Any] = {"ok": True}
+    try:
+        os.chdir(request["cwd"])
+        # Console log handlers are created inside the run, so they pick up
+        # the redirected streams.
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            response["result"] = execute_request(request)
+    except Exception:
+        response = {"ok": False, "error": traceback.format_exc()}
+    response["stdout"] = stdout.getvalue()
+    response["stderr"] = stderr.getvalue()
+    _send(conn, response)
+
+
+_MASTER_SIGNALS = {signal.SIGCHLD, signal.SIGINT, signal.SIGTERM}
+
+
+def _worker_loop(
+    listener: socket.socket, stamp: list[tuple[str, int, int]], max_requests: int
+) -> None:
+    busy = False
+
+    def finish(signum: int, frame: Any) -> None:
+        # Exit right away while waiting for a connection, otherwise after
+        # the current request.
+        nonlocal max_requests
+        max_requests = 0
+        if not busy:
+            raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, finish)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The master handles Ctrl-C
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, _MASTER_SIGNALS)
+    served = 0
+    while served < max_requests:
+        conn, _ = listener.accept()
+        busy = True
+        with conn:
+            try:
+                _handle(conn, stamp)
+            except OSError:
+                pass  # The client went away
+        busy = False
+        served += 1
+
+
+def _fork_worker(
+    listener: socket.socket, stamp: list[tuple[str, int, int]], max_requests: int
+) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _worker_loop(listener, stamp, max_requests)
+        except SystemExit:
+            pass
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            # Skip the parent's atexit handlers and buffered output.
+            os._exit(code)
+    return pid
+
+
+def _bind(socket_path: Path) -> socket.socket:
+    """Bind the listening socket, replacing a stale socket file."""
+    if submit({"command": "ping"}, socket_path, timeout=5.0) is not None:
+        raise RuntimeError(f"A daemon is already listening on {socket_path}.")
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    socket_path.unlink(missing_ok=True)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create the socket owner-only (0o600) rather than chmod it after
+    # bind, which would leave a window where other users can connect.
+    previous_umask = os.umask(0o177)
+    try:
+        listener.bind(str(socket_path))
+    finally:
+        os.umask(previous_umask)
+    listener.listen(64)
+    return listener
+
+
+def serve(
+    socket_path: Path | str = SOCKET_PATH,
+    *,
+    workers: int | None = None,
+    max_requests: int = DEFAULT_MAX_REQUESTS,
+    ready: Callable[[], None] | None = None,
+) -> None:
+    """Run the daemon in the foreground until SIGTERM or SIGINT.
+
+    Args:
+        socket_path: Socket to listen on.
+        workers: Number of worker processes (default: CPU count).
+        max_requests: Requests per worker before it is replaced, which
+            bounds memory growth over long sessions.
+        ready: Called once the workers are accepting connections.
+
+    Raises:
+        RuntimeError: If another daemon already listens on socket_path.
+    """
+    # Preload everything a request needs, including the source hash of the
+    # run cache, so forked workers start warm.
+    importlib.import_module("ai_research_template.experiment")
+    from ai_research_template.run_cache import source_tree_hash  # noqa: PLC0415
+
+    source_tree_hash()
+    stamp = source_stamp()
+
+    socket_path = Path(socket_path)
+    workers = workers or os.cpu_count() or 1
+    listener = _bind(socket_path)
+    # The master only waits for signals; blocking them and using sigwait
+    # avoids racing a handler against os.wait.
+    previous_mask = signal.pthread_sigmask(signal.SIG_BLOCK, _MASTER_SIGNALS)
+    children: set[int] = set()
+    try:
+        for _ in range(workers):
+            children.add(_fork_worker(listener, stamp, max_requests))
+        if ready is not None:
+            ready()
+        while signal.sigwait(_MASTER_SIGNALS) == signal.SIGCHLD:
+            # Replace every worker that exited since the last signal.
+            while children:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+                if pid == 0:
+                    break
+                children.discard(pid)
+                children.add(_fork_worker(listener, stamp, max_requests))
+    finally:
+        # Workers finish the request they are running before they exit.
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        for pid in children:
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
+        listener.close()
+        socket_path.unlink(missing_ok=True)
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous_mask)
+
+
+def print_response(response: dict[str, Any]) -> None:
+    """Replay a run's captured output, and its error if it failed."""
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    if not response["ok"]:
+        sys.stderr.write(response.get("error", "The daemon reported an error.\n"))
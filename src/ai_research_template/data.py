@@ -48,3 +48,43 @@ def generate_linear_data(
     noise = np.random.normal(0, noise_std, n_samples)
     y = slope * x + intercept + noise
     return x, y
+
+
+def generate_linear_data_replicates(
+    n_samples: int,
+    slope: float,
+    intercept: float,
+    noise_std: float,
+    seeds: list[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate linear data for several seeds at once.
+
+    Row ``i`` of ``y`` is identical to the ``y`` returned by
+    ``generate_linear_data(..., seed=seeds[i])``, so replicate runs match
+    single runs with the same seed.
+
+    Args:
+        n_samples: Number of data points per replicate.
+        slope: True slope of the linear relationship.
+        intercept: True intercept of the linear relationship.
+        noise_std: Standard deviation of the Gaussian noise.
+        seeds: One random seed per replicate.
+
+    Returns:
+        A tuple of (x, y) where:
+            - x: Shared input features of shape (n_samples,).
+            - y: Target values of shape (len(seeds), n_samples).
+
+    Raises:
+        ValueError: If n_samples is less than 1.
+    """
+    if n_samples < 1:
+        raise ValueError(f"n_samples must be at least 1, got {n_samples}.")
+
+    x = np.linspace(0, 10, n_samples)
+    noise = np.empty((len(seeds), n_samples))
+    for row, seed in enumerate(seeds):
+        # RandomState(seed) draws the same stream as np.random.seed(seed).
+        noise[row] = np.random.RandomState(seed).normal(0, noise_std, n_samples)
+    y = slope * x + intercept + noise
+    return x, y
@@ -0,0 +1,367 @@
+"""Sample linear regression experiment.
+
+The body of scripts/run_experiment.py lives here so it can also be run
+in-process, e.g. by the sweep runner's long-lived worker processes.
+"""
+
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+from ai_research_template.config import BOOKKEEPING_KEYS
+from ai_research_template.core import LinearModel, fit_linear_replicates
+from ai_research_template.data import (
+    generate_linear_data,
+    generate_linear_data_replicates,
+)
+from ai_research_template.metrics import evaluate_metrics, summarize_replicates
+from ai_research_template.profiling import Profiler
+from ai_research_template.run_cache import lookup_run, record_run, run_key
+from ai_research_template.utils import (
+    StageTimer,
+    append_summary_rows,
+    close_logger,
+    flatten_results,
+    prepare_output_dir,
+    save_params,
+    save_results,
+    setup_logger,
+    update_experiment_summary,
+    write_daily_report_request,
+    write_report,
+)
+
+
+def resolve_output_location(config: dict[str, Any]) -> tuple[str, Path]:
+    """Return (experiment_name, output_root) for a config.
+
+    ``output_dir`` takes precedence over ``experiment_name`` and
+    ``output_root``.
+    """
+    output_dir_config = config.get("output_dir")
+    if output_dir_config:
+        base_dir = Path(output_dir_config)
+        return base_dir.name, base_dir.parent
+    return (
+        config.get("experiment_name", "experiment"),
+        Path(config.get("output_root", "outputs")),
+    )
+
+
+def run_experiment(  # noqa: PLR0913
+    config: dict[str, Any],
+    *,
+    config_path: str | None = None,
+    timestamp: str | None = None,
+    force: bool = False,
+    console: bool = True,
+    timer: StageTimer | None = None,
+    profiler: Profiler | None = None,
+) -> tuple[Path, bool]:
+    """Run the linear regression experiment for one validated config.
+
+    Seeded runs whose config and source tree match a finished run are not
+    recomputed (see run_cache).
+
+    The stages generate_data, fit, evaluate, save and summary are timed
+    (see utils.StageTimer) and stored under ``timings`` in metrics.json and
+    as ``time_<stage>_*`` summary columns. metrics.json is written last,
+    so it marks the run as complete; the summary row therefore has every
+    stage except summary itself.
+
+    Args:
+        config: Config validated with config.ExperimentConfig.
+        config_path: Config file the run came from, for the report request.
+        timestamp: Run directory name (default: a unique new_run_id()).
+        force: Rerun even if an identical run exists.
+        console: Also log to the console.
+        timer: Timer that may already hold earlier stages such as
+            load_config (default: a new one).
+        profiler: Profile the stages; the profile is saved into the run's
+            artifacts/ and its hottest functions are added to report.md.
+
+    Returns:
+        Tuple of (run directory, True if an existing run was reused).
+    """
+    timer = timer or StageTimer()
+    experiment_name, output_root = resolve_output_location(config)
+
+    # Reuse a finished run with the same config and source code. Unseeded
+    # runs are not reproducible, so they always run.
+    hashes = run_key(config, exclude=BOOKKEEPING_KEYS)
+    cache_dir = output_root / ".run_cache"
+    if config.get("seed") is not None and not force:
+        cached_dir = lookup_run(hashes["run_key"], cache_dir)
+        if cached_dir is not None:
+            return cached_dir, True
+
+    output_dir = prepare_output_dir(
+        experiment_name=experiment_name,
+        output_root=output_root,
+        timestamp=timestamp,
+    )
+    timestamp = output_dir.name
+
+    # Setup logger
+    logger = setup_logger(
+        output_dir, async_logging=config.get("async_logging", False), console=console
+    )
+    logger.info(f"Starting experiment: {timestamp}")
+    logger.info(f"Config: {config}")
+
+    with profiler or nullcontext():
+        # 1. Generate data
+        with timer.stage("generate_data"):
+            x, y = generate_linear_data(
+                n_samples=config["n_samples"],
+                slope=config["slope"],
+                intercept=config["intercept"],
+                noise_std=config["noise_std"],
+                seed=config.get("seed"),
+            )
+
+        # 2. Fit model
+        with timer.stage("fit"):
+            model = LinearModel()
+            model.fit(x, y)
+
+        # 3. Evaluate
+        with timer.stage("evaluate"):
+            y_pred = model.predict(x)
+            metrics = evaluate_metrics(
+                y,
+                y_pred,
+                config.get("metrics", ["mse"]),
+                accurate=config.get("accurate_metrics", False),
+            )
+
+        # 4. Save results
+        results = {
+            "config": config,
+            "metrics": metrics,
+            "model_params": {
+                "estimated_slope": float(model.slope),
+                "estimated_intercept": float(model.intercept),
+            },
+        }
+        with timer.stage("save"):
+            save_params({**config, "_run": hashes}, output_dir)
+            report_lines = [
+                "# Experiment Report",
+                "",
+                f"- Timestamp: {timestamp}",
+                f"- Experiment: {experiment_name}",
+                f"- Output: {output_dir}",
+                *[f"- {name.upper()}: {value:.4f}" for name, value in metrics.items()],
+            ]
+            write_report(report_lines, output_dir)
+            request_path = write_daily_report_request(
+                output_dir=output_dir,
+                experiment_name=experiment_name,
+                timestamp=timestamp,
+                config_path=config_path,
+                metrics=results.get("metrics", {}),
+            )
+        with timer.stage("summary"):
+            update_experiment_summary(
+                {**results, "timings": timer.as_dict()},
+                output_dir,
+                history=config.get("parquet_history", False),
+            )
+    if profiler is not None:
+        profiler.save(output_dir)
+        write_report([*report_lines, "", *profiler.report_lines()], output_dir)
+    results["timings"] = timer.as_dict()
+    save_results(results, output_dir)
+    if config.get("seed") is not None:
+        record_run(hashes["run_key"], output_dir, cache_dir)
+
+    logger.info(f"Experiment complete! Results saved to {output_dir}")
+    for name, value in metrics.items():
+        logger.info(f"{name.upper()}: {value:.4f}")
+    logger.info(f"Estimated: y = {model.slope:.2f}x + {model.intercept:.2f}")
+    logger.info(
+        "Timings: "
+        + ", ".join(
+            f"{stage} {record['wall_s'] * 1000:.1f}ms"
+            for stage, record in results["timings"].items()
+        )
+    )
+    logger.info("Daily report request written.")
+    logger.info(f"Run: uv run poe daily-report --request {request_path}")
+    close_logger()
+    return output_dir, False
+
+
+def run_experiment_replicates(  # noqa: PLR0913
+    config: dict[str, Any],
+    seeds: list[int],
+    *,
+    config_path: str | None = None,
+    confidence_level: float = 0.95,
+    console: bool = True,
+    timer: StageTimer | None = None,
+    profiler: Profiler | None = None,
+) -> Path:
+    """Run the experiment for many seeds in one process.
+
+    Data for all seeds is generated into one array and every replicate is
+    fitted in a single least-squares solve. Per-seed values match separate
+    runs with the same seed.
+
+    One run directory holds the whole group. Its metrics.json has the
+    per-seed results and, for every metric, the mean, sample std and
+    Student t confidence interval over seeds. The summary gets one row per
+    seed (path ``<run dir>#seed=<seed>``, param_seed set) and one aggregate
+    row (path ``<run dir>``, param_n_seeds set) whose ``metric_<name>`` is
+    the mean, plus ``metric_<name>_std``, ``_ci_low`` and ``_ci_high``.
+    Stage timings of the whole group (see run_experiment) go to
+    metrics.json and the aggregate row.
+
+    Args:
+        config: Config validated with config.ExperimentConfig; its seed is
+            ignored.
+        seeds: Seeds to run.
+        config_path: Config file the run came from, for the report request.
+        confidence_level: Coverage of the intervals over seeds.
+        console: Also log to the console.
+        timer: Timer that may already hold earlier stages (default: a new
+            one).
+        profiler: Profile the stages (see run_experiment).
+
+    Returns:
+        The run directory.
+
+    Raises:
+        ValueError: If seeds is empty.
+    """
+    if not seeds:
+        raise ValueError("seeds must not be empty.")
+    timer = timer or StageTimer()
+    experiment_name, output_root = resolve_output_location(config)
+    output_dir = prepare_output_dir(
+        experiment_name=experiment_name, output_root=output_root
+    )
+    timestamp = output_dir.name
+    logger = setup_logger(
+        output_dir, async_logging=config.get("async_logging", False), console=console
+    )
+    logger.info(f"Starting replicate experiment: {timestamp} ({len(seeds)} seeds)")
+    logger.info(f"Config: {config}")
+
+    with profiler or nullcontext():
+        # 1-2. Generate data and fit all seeds at once
+        with timer.stage("generate_data"):
+            x, y = generate_linear_data_replicates(
+                n_samples=config["n_samples"],
+                slope=config["slope"],
+                intercept=config["intercept"],
+                noise_std=config["noise_std"],
+                seeds=seeds,
+            )
+        with timer.stage("fit"):
+            slopes, intercepts = fit_linear_replicates(x, y)
+
+        # 3. Evaluate every seed and aggregate
+        with timer.stage("evaluate"):
+            y_pred = slopes[:, None] * x + intercepts[:, None]
+            metric_names = config.get("metrics", ["mse"])
+            accurate = config.get("accurate_metrics", False)
+            per_seed = []
+            for row, seed in enumerate(seeds):
+                per_seed.append(
+                    {
+                        "seed": seed,
+                        "metrics": evaluate_metrics(
+                            y[row], y_pred[row], metric_names, accurate=accurate
+                        ),
+                        "model_params": {
+                            "estimated_slope": float(slopes[row]),
+                            "estimated_intercept": float(intercepts[row]),
+                        },
+                    }
+                )
+            aggregate = {
+                name: summarize_replicates(
+                    [result["metrics"][name] for result in per_seed], confidence_level
+                )
+                for name in per_seed[0]["metrics"]
+            }
+        group_config = {key: value for key, value in config.items() if key != "seed"}
+        results = {
+            "config": {**group_config, "n_seeds": len(seeds)},
+            "metrics": {
+                f"{name}{suffix}": stats[key]
+                for name, stats in aggregate.items()
+                for key, suffix in (
+                    ("mean", ""),
+                    ("std", "_std"),
+                    ("ci_low", "_ci_low"),
+                    ("ci_high", "_ci_high"),
+                )
+            },
+            "model_params": {
+                "estimated_slope": float(slopes.mean()),
+                "estimated_intercept": float(intercepts.mean()),
+            },
+            "seeds": seeds,
+            "confidence_level": confidence_level,
+            "per_seed": per_seed,
+        }
+
+        # 4. Save results
+        with timer.stage("save"):
+            save_params({**group_config, "seeds": seeds}, output_dir)
+            report_lines = [
+                "# Experiment Report",
+                "",
+                f"- Timestamp: {timestamp}",
+                f"- Experiment: {experiment_name}",
+                f"- Output: {output_dir}",
+                f"- Seeds: {len(seeds)} ({seeds[0]} .. {seeds[-1]})",
+                "",
+                f"| Metric | Mean | Std | {confidence_level:.0%} CI |",
+                "|---|---|---|---|",
+                *[
+                    f"| {name.upper()} | {stats['mean']:.4f} | {stats['std']:.4f} "
+                    f"| [{stats['ci_low']:.4f}, {stats['ci_high']:.4f}] |"
+                    for name, stats in aggregate.items()
+                ],
+            ]
+            write_report(report_lines, output_dir)
+            request_path = write_daily_report_request(
+                output_dir=output_dir,
+                experiment_name=experiment_name,
+                timestamp=timestamp,
+                config_path=config_path,
+                metrics=results["metrics"],
+            )
+        with timer.stage("summary"):
+            rows = []
+            for result in per_seed:
+                row = flatten_results(
+                    {"config": {**group_config, "seed": result["seed"]}, **result},
+                    output_dir,
+                )
+                row["path"] = f"{output_dir}#seed={result['seed']}"
+                rows.append(row)
+            # Timings cover the whole group, so only the aggregate row has them.
+            rows.append(
+                flatten_results({**results, "timings": timer.as_dict()}, output_dir)
+            )
+            append_summary_rows(rows, history=config.get("parquet_history", False))
+    if profiler is not None:
+        profiler.save(output_dir)
+        write_report([*report_lines, "", *profiler.report_lines()], output_dir)
+    results["timings"] = timer.as_dict()
+    save_results(results, output_dir)
+
+    logger.info(f"Replicate experiment complete! Results saved to {output_dir}")
+    for name, stats in aggregate.items():
+        logger.info(
+            f"{name.upper()}: {stats['mean']:.4f} +- {stats['std']:.4f} "
+            f"(CI [{stats['ci_low']:.4f}, {stats['ci_high']:.4f}])"
+        )
+    logger.info(f"Run: uv run poe daily-report --request {request_path}")
+    close_logger()
+    return output_dir
@@ -0,0 +1,342 @@
+"""SQLite-backed index of experiment runs.
+
+This module maintains an embedded SQLite database (WAL mode) next to the
+experiment summary CSV, so questions such as "best 10 runs by metric_mse
+where param_noise_std < 1" are answered with indexed queries instead of
+re-parsing the whole CSV.
+
+Schema:
+    runs(id, path, timestamp): one row per experiment run.
+    run_values(run_id, key, num, text): one row per flattened summary
+        column (``param_*``, ``metric_*``, ``model_*``). Numeric values are
+        stored in ``num`` and strings in ``text``; both are indexed by key.
+"""
+
+import re
+import sqlite3
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+INDEX_PATH = Path("outputs/experiments.db")
+
+_FETCH_BATCH = 500
+# Filters matching at least this many runs are treated as broad (see
+# _build_query).
+_BROAD_FILTER_ROWS = 10000
+
+_OPERATORS = {
+    "=": "=",
+    "==": "=",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+}
+_CONDITION_PATTERN = re.compile(r"^\s*(\w+)\s*(<=|>=|!=|==|=|<|>)\s*(.+?)\s*$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    timestamp TEXT
+);
+CREATE TABLE IF NOT EXISTS run_values (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    num REAL,
+    text TEXT,
+    PRIMARY KEY (run_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_values_key_num ON run_values(key, num, run_id);
+CREATE INDEX IF NOT EXISTS run_values_key_text ON run_values(key, text, run_id);
+"""
+
+Condition = tuple[str, str, float | str]
+
+
+def connect_index(db_path: Path | str = INDEX_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the experiment index database.
+
+    The database uses WAL journaling so readers never block the writer and
+    many short write transactions stay cheap.
+
+    Args:
+        db_path: Location of the SQLite file.
+
+    Returns:
+        An open connection with the schema in place.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _split_value(value: Any) -> tuple[float | None, str | None]:
+    """Map a summary value onto the (num, text) columns."""
+    if isinstance(value, (bool, int, float)):
+        return float(value), None
+    return None, str(value)
+
+
+def _insert_run(conn: sqlite3.Connection, row: dict[str, Any]) -> None:
+    path = str(row["path"])
+    conn.execute("DELETE FROM runs WHERE path = ?", (path,))
+    cursor = conn.execute(
+        "INSERT INTO runs (path, timestamp) VALUES (?, ?)",
+        (path, row.get("timestamp")),
+    )
+    run_id = cursor.lastrowid
+    conn.executemany(
+        "INSERT INTO run_values (run_id, key, num, text) VALUES (?, ?, ?, ?)",
+        [
+            (run_id, key, *_split_value(value))
+            for key, value in row.items()
+            if key not in {"path", "timestamp"} and value != ""
+        ],
+    )
+
+
+def index_run(row: dict[str, Any], db_path: Path | str = INDEX_PATH) -> None:
+    """Record one flattened summary row in the index.
+
+    Re-indexing a run with the same path replaces its previous values.
+
+    Args:
+        row: Flat summary row as produced by utils.flatten_results; must
+            contain a "path" key.
+        db_path: Location of the SQLite file.
+    """
+    conn = connect_index(db_path)
+    try:
+        with conn:
+            _insert_run(conn, row)
+    finally:
+        conn.close()
+
+
+def _coerce(value: str) -> float | str:
+    """Interpret a CSV field as a number when possible."""
+    # Booleans are stored as numbers, matching _split_value for live results.
+    if value in {"True", "False"}:
+        return float(value == "True")
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def index_rows(
+    rows: Iterable[dict[str, Any]],
+    db_path: Path | str = INDEX_PATH,
+    coerce: bool = True,
+) -> int:
+    """Bulk-load summary rows (e.g. from read_experiment_summary).
+
+    All rows are written in a single transaction.
+
+    Args:
+        rows: Summary rows.
+        db_path: Location of the SQLite file.
+        coerce: Store numeric-looking string fields as numbers, as needed
+            for rows read back from the CSV. Pass False for rows that
+            already hold typed values (as from utils.flatten_results).
+
+    Returns:
+        Number of rows indexed.
+    """
+    conn = connect_index(db_path)
+    count = 0
+    try:
+        with conn:
+            for row in rows:
+                if coerce:
+                    _insert_run(
+                        conn,
+                        {
+                            key: value
+                            if key in {"path", "timestamp"}
+                            else _coerce(value)
+                            for key, value in row.items()
+                        },
+                    )
+                else:
+                    _insert_run(conn, row)
+                count += 1
+    finally:
+        conn.close()
+    return count
+
+
+def parse_condition(text: str) -> Condition:
+    """Parse a filter such as ``"param_noise_std < 1"``.
+
+    Args:
+        text: Condition of the form ``<column> <op> <value>`` where op is one
+            of =, ==, !=, <, <=, >, >=.
+
+    Returns:
+        A (column, operator, value) tuple; numeric values become floats.
+
+    Raises:
+        ValueError: If the text is not a valid condition.
+    """
+    match = _CONDITION_PATTERN.match(text)
+    if match is None:
+        raise ValueError(
+            f"Invalid condition {text!r}; expected '<column> <op> <value>'."
+        )
+    key, operator, raw_value = match.groups()
+    return key, _OPERATORS[operator], _coerce(raw_value.strip("'\""))
+
+
+def query_runs(
+    db_path: Path | str = INDEX_PATH,
+    *,
+    order_by: str | None = None,
+    where: Iterable[Condition] = (),
+    limit: int | None = None,
+    descending: bool = False,
+) -> list[dict[str, Any]]:
+    """Query indexed runs with filters and ordering.
+
+    Each filter and the ordering key become one indexed lookup into
+    run_values, so queries do not scan all runs' values.
+
+    Args:
+        db_path: Location of the SQLite file.
+        order_by: Numeric column to sort by (e.g. "metric_mse"); runs without
+            a numeric value for it (missing, NaN or text) are excluded. If
+            None, runs are returned in insertion order.
+        where: Conditions as returned by parse_condition.
+        limit: Maximum number of runs to return.
+        descending: Sort from largest to smallest.
+
+    Returns:
+        Matching runs as flat dicts (path, timestamp, and all indexed
+        columns), in result order.
+
+    Raises:
+        ValueError: If a condition uses an unsupported operator.
+
+    Example:
+        >>> best = query_runs(
+        ...     order_by="metric_mse",
+        ...     where=[parse_condition("param_noise_std < 1")],
+        ...     limit=10,
+        ... )
+    """
+    conditions = list(where)
+    for _, operator, _ in conditions:
+        if operator not in _OPERATORS.values():
+            raise ValueError(f"Unsupported operator {operator!r}.")
+
+    conn = connect_index(db_path)
+    try:
+        drive_by_order = order_by is not None and all(
+            _is_broad(conn, condition) for condition in conditions
+        )
+        sql, params = _build_query(
+            conditions, order_by, limit, descending, drive_by_order
+        )
+        run_ids = [run_id for (run_id,) in conn.execute(sql, params)]
+
+        results: dict[int, dict[str, Any]] = {run_id: {} for run_id in run_ids}
+        # Fetch rows in batches to stay below SQLite's bound-parameter limit.
+        for start in range(0, len(run_ids), _FETCH_BATCH):
+            batch = run_ids[start : start + _FETCH_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            for run_id, path, timestamp in conn.execute(
+                f"SELECT id, path, timestamp FROM runs WHERE id IN ({placeholders})",
+                batch,
+            ):
+                results[run_id].update(path=path, timestamp=timestamp)
+            for run_id, key, num, text in conn.execute(
+                "SELECT run_id, key, num, text FROM run_values "
+                f"WHERE run_id IN ({placeholders})",
+                batch,
+            ):
+                results[run_id][key] = num if text is None else text
+    finally:
+        conn.close()
+    return list(results.values())
+
+
+def _condition_sql(alias: str, condition: Condition) -> tuple[str, list[Any]]:
+    key, operator, value = condition
+    column = "num" if isinstance(value, (int, float)) else "text"
+    return (
+        f"{alias}.key = ? AND {alias}.{column} {operator} ?",
+        [key, value],
+    )
+
+
+def _is_broad(conn: sqlite3.Connection, condition: Condition) -> bool:
+    """Return True if a filter matches at least _BROAD_FILTER_ROWS runs.
+
+    The count stops at the threshold, so this costs at most one short index
+    range scan.
+    """
+    clause, params = _condition_sql("f", condition)
+    (matches,) = conn.execute(
+        f"SELECT count(*) FROM (SELECT 1 FROM run_values f WHERE {clause} LIMIT ?)",
+        [*params, _BROAD_FILTER_ROWS],
+    ).fetchone()
+    return matches >= _BROAD_FILTER_ROWS
+
+
+def _build_query(
+    conditions: list[Condition],
+    order_by: str | None,
+    limit: int | None,
+    descending: bool,
+    drive_by_order: bool,
+) -> tuple[str, list[Any]]:
+    """Build the SQL returning matching run ids in result order.
+
+    Two plans are used. For top-k queries whose filters are broad, the
+    ordering index is walked from the best value and filters are checked
+    per run, so the scan stops after ``limit`` hits. When some filter is
+    selective, its index range is the driver and only those few runs are
+    sorted. SQLite's planner always picks the latter, which sorts a large
+    temporary table for broad filters.
+    """
+    direction = "DESC" if descending else "ASC"
+    params: list[Any] = []
+    if drive_by_order:
+        # CROSS JOIN pins the join order so the ordering index drives the scan.
+        sql = "SELECT o.run_id FROM run_values o INDEXED BY run_values_key_num"
+        for position, condition in enumerate(conditions):
+            alias = f"f{position}"
+            clause, clause_params = _condition_sql(alias, condition)
+            sql += f" CROSS JOIN run_values {alias} ON {alias}.run_id = o.run_id"
+            sql += f" AND {clause}"
+            params.extend(clause_params)
+        sql += " WHERE o.key = ? AND o.num IS NOT NULL"
+        sql += f" ORDER BY o.num {direction}, o.run_id {direction}"
+        params.append(order_by)
+    else:
+        sql = "SELECT runs.id FROM runs"
+        for position, condition in enumerate(conditions):
+            alias = f"f{position}"
+            clause, clause_params = _condition_sql(alias, condition)
+            sql += f" JOIN run_values {alias} ON {alias}.run_id = runs.id AND {clause}"
+            params.extend(clause_params)
+        if order_by is None:
+            sql += f" ORDER BY runs.id {direction}"
+        else:
+            sql += " JOIN run_values o ON o.run_id = runs.id AND o.key = ?"
+            sql += " AND o.num IS NOT NULL"
+            sql += f" ORDER BY o.num {direction}, runs.id {direction}"
+            params.append(order_by)
+
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return sql, params
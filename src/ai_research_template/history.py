@@ -0,0 +1,147 @@
+"""Columnar (Parquet) experiment history.
+
+Each finished run writes one tiny Parquet fragment into a date partition:
+
+  outputs/history/
+    date=2026-01-25/
+      frag-<uuid>.parquet   # one row per run, written atomically
+      part-<uuid>.parquet   # compacted fragments with large row groups
+
+``compact_history`` merges the fragments of each partition into a single
+file with large row groups, and ``load_history`` reads only the requested
+columns (e.g. ``metric_*``) across all partitions.
+"""
+
+import fnmatch
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from pyarrow import fs
+
+from ai_research_template.utils import file_lock
+
+HISTORY_DIR = Path("outputs/history")
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+
+
+def _partition_dir(history_dir: Path, date: str) -> Path:
+    return history_dir / f"date={date}"
+
+
+def _data_files(directory: Path, pattern: str = "*.parquet") -> list[Path]:
+    """List visible Parquet files; temp files start with a dot."""
+    return sorted(p for p in directory.glob(pattern) if not p.name.startswith("."))
+
+
+def _write_atomic(table: pa.Table, path: Path, **kwargs: Any) -> None:
+    """Write a Parquet file under a hidden name, then rename it into place."""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    pq.write_table(table, tmp_path, **kwargs)
+    os.replace(tmp_path, path)
+
+
+def write_history_fragment(
+    row: dict[str, Any],
+    history_dir: Path | str = HISTORY_DIR,
+    date: str | None = None,
+) -> Path:
+    """Write one run's flattened summary row as a Parquet fragment.
+
+    Args:
+        row: Flat summary row (see utils.flatten_results).
+        history_dir: Root of the partitioned history.
+        date: Partition date in YYYY-MM-DD format (default: today).
+
+    Returns:
+        Path to the written fragment.
+    """
+    date_str = date or datetime.now().strftime("%Y-%m-%d")
+    partition = _partition_dir(Path(history_dir), date_str)
+    partition.mkdir(parents=True, exist_ok=True)
+    fragment_path = partition / f"frag-{uuid.uuid4().hex}.parquet"
+    _write_atomic(pa.Table.from_pylist([row]), fragment_path)
+    return fragment_path
+
+
+def compact_history(
+    history_dir: Path | str = HISTORY_DIR,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """Merge the files of every partition into one file with large row groups.
+
+    Fragments written concurrently with compaction are left for the next
+    run, since only files listed at the start are merged and removed.
+    Schemas are unified permissively, so columns added by later runs are
+    null for earlier rows and int/float columns are promoted to float.
+
+    Args:
+        history_dir: Root of the partitioned history.
+        row_group_size: Maximum number of rows per Parquet row group.
+
+    Returns:
+        Number of input files that were merged.
+    """
+    merged = 0
+    for partition in sorted(Path(history_dir).glob("date=*")):
+        with file_lock(partition / "compact"):
+            files = _data_files(partition)
+            if len(files) <= 1:
+                continue
+            table = pa.concat_tables(
+                [pq.read_table(path) for path in files], promote_options="permissive"
+            )
+            _write_atomic(
+                table,
+                partition / f"part-{uuid.uuid4().hex}.parquet",
+                row_group_size=row_group_size,
+                compression="zstd",
+            )
+            for path in files:
+                path.unlink()
+            merged += len(files)
+    return merged
+
+
+def load_history(
+    history_dir: Path | str = HISTORY_DIR,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Load experiment history, reading only the requested columns.
+
+    Args:
+        history_dir: Root of the partitioned history.
+        columns: Column names or glob patterns such as ``"metric_*"``
+            (default: all columns).
+
+    Returns:
+        DataFrame with one row per run.
+
+    Example:
+        >>> metrics = load_history(columns=["timestamp", "metric_*"])
+    """
+    files = _data_files(Path(history_dir), "date=*/*.parquet")
+    if not files:
+        return pd.DataFrame()
+    # One dataset over every file; Arrow inspects the footers in parallel
+    # and unifies them like compact_history does.
+    factory = ds.FileSystemDatasetFactory(
+        fs.LocalFileSystem(),
+        [str(path) for path in files],
+        ds.ParquetFileFormat(),  # ty: ignore[possibly-missing-attribute]
+    )
+    dataset = factory.finish(factory.inspect(promote_options="permissive"))
+    selected = None
+    if columns is not None:
+        selected = [
+            name
+            for name in dataset.schema.names
+            if any(fnmatch.fnmatchcase(name, pattern) for pattern in columns)
+        ]
+    return dataset.to_table(columns=selected).to_pandas()
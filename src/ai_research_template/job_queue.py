@@ -0,0 +1,425 @@
+"""Crash-resumable job queue of experiment configs.
+
+Jobs live in a SQLite file (default ``outputs/queue.db``). Any number of
+workers, on one machine or on several machines sharing the filesystem,
+pull jobs from it; there is no broker process.
+
+A worker claims the oldest pending job together with a lease, renews the
+lease with heartbeats while the run is in progress and marks the job done
+at the end. If a worker dies (preemption, OOM, Ctrl-C), its lease runs
+out and the next claim by any worker puts the job back to pending, so a
+restarted sweep only redoes unfinished runs. Seeded runs that finished
+before the crash but were not yet marked done are reused from the run
+cache (see run_cache).
+
+Schema:
+    jobs(id, key, config, config_path, status, attempts, max_attempts,
+        worker, lease_expires, output_dir, error, created, updated):
+        one row per config. ``status`` is pending, running, done or
+        failed; ``key`` is the config hash, so enqueuing the same config
+        twice adds it once.
+
+The database uses the default rollback journal rather than WAL, since WAL
+needs shared memory that network filesystems do not provide. Leases are
+compared against each worker's wall clock, so keep them well above the
+clock skew between machines.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from ai_research_template.config import BOOKKEEPING_KEYS, config_hash
+from ai_research_template.experiment import run_experiment
+
+QUEUE_PATH = Path("outputs/queue.db")
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    config TEXT NOT NULL,
+    config_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    output_dir TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, id);
+"""
+
+
+@dataclass
+class Job:
+    """A claimed job."""
+
+    id: int
+    config: dict[str, Any]
+    config_path: str | None
+    attempts: int
+
+
+def connect_queue(db_path: Path | str = QUEUE_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the queue database.
+
+    Args:
+        db_path: Location of the SQLite file.
+
+    Returns:
+        An open connection with the schema in place. Transactions are
+        managed explicitly (autocommit mode).
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=60.0, isolation_level=None)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+@contextmanager
+def _immediate(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run a ``BEGIN IMMEDIATE`` transaction on an autocommit connection.
+
+    Taking the write lock up front makes claim's read-then-update atomic
+    across processes.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def enqueue(
+    configs: Iterable[dict[str, Any]],
+    config_path: str | None = None,
+    db_path: Path | str = QUEUE_PATH,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> int:
+    """Add experiment configs to the queue.
+
+    Configs already in the queue (same config hash, ignoring bookkeeping
+    keys) are skipped, whatever their status.
+
+    Args:
+        configs: Validated configs, e.g. from sweep.point_configs.
+        config_path: Config file the jobs came from, for the report request.
+        db_path: Location of the SQLite file.
+        max_attempts: Claims per job before it is marked failed.
+
+    Returns:
+        Number of jobs added.
+    """
+    now = time.time()
+    rows = [
+        (
+            config_hash(config, BOOKKEEPING_KEYS),
+            json.dumps(config),
+            config_path,
+            max_attempts,
+            now,
+            now,
+        )
+        for config in configs
+    ]
+    conn = connect_queue(db_path)
+    try:
+        with _immediate(conn):
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs "
+                "(key, config, config_path, max_attempts, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            added = conn.total_changes - before
+    finally:
+        conn.close()
+    return added
+
+
+def _expire_leases(conn: sqlite3.Connection, now: float) -> int:
+    """Return jobs whose lease ran out to pending, or fail them."""
+    cursor = conn.execute(
+        "UPDATE jobs SET "
+        "status = CASE WHEN attempts < max_attempts THEN 'pending' ELSE 'failed' END, "
+        "error = CASE WHEN attempts < max_attempts THEN error "
+        "ELSE 'lease expired on last attempt' END, "
+        "worker = NULL, lease_expires = NULL, updated = ? "
+        "WHERE status = 'running' AND lease_expires < ?",
+        (now, now),
+    )
+    return cursor.rowcount
+
+
+def requeue_expired(db_path: Path | str = QUEUE_PATH) -> int:
+    """Put jobs with expired leases back to pending.
+
+    Claiming does this too, so calling it is only needed to inspect the
+    queue.
+
+    Args:
+        db_path: Location of the SQLite file.
+
+    Returns:
+        Number of expired jobs (requeued or, after max_attempts, failed).
+    """
+    conn = connect_queue(db_path)
+    try:
+        with _immediate(conn):
+            return _expire_leases(conn, time.time())
+    finally:
+        conn.close()
+
+
+def claim(
+    worker: str,
+    db_path: Path | str = QUEUE_PATH,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> Job | None:
+    """Claim the oldest pending job.
+
+    Args:
+        worker: Worker ID, e.g. from default_worker_id.
+        db_path: Location of the SQLite file.
+        lease_seconds: How long the claim stays valid without a heartbeat.
+
+    Returns:
+        The claimed job, or None if no job is pending.
+    """
+    conn = connect_queue(db_path)
+    try:
+        with _immediate(conn):
+            now = time.time()
+            _expire_leases(conn, now)
+            row = conn.execute(
+                "SELECT id, config, config_path, attempts FROM jobs "
+                "WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, config, config_path, attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, "
+                "worker = ?, lease_expires = ?, updated = ? WHERE id = ?",
+                (worker, now + lease_seconds, now, job_id),
+            )
+    finally:
+        conn.close()
+    return Job(job_id, json.loads(config), config_path, attempts + 1)
+
+
+def _update_owned(
+    db_path: Path | str, job_id: int, worker: str, assignments: str, params: tuple
+) -> bool:
+    """Update a running job if worker still holds its lease."""
+    conn = connect_queue(db_path)
+    try:
+        with _immediate(conn):
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (*params, time.time(), job_id, worker),
+            )
+            return cursor.rowcount == 1
+    finally:
+        conn.close()
+
+
+def heartbeat(
+    job_id: int,
+    worker: str,
+    db_path: Path | str = QUEUE_PATH,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> bool:
+    """Extend the lease of a claimed job.
+
+    Args:
+        job_id: Claimed job.
+        worker: Worker ID that claimed it.
+        db_path: Location of the SQLite file.
+        lease_seconds: New lease length, counted from now.
+
+    Returns:
+        False if the lease was already lost (it expired and the job was
+        requeued), in which case the worker should treat the job as no
+        longer its own.
+    """
+    return _update_owned(
+        db_path,
+        job_id,
+        worker,
+        "lease_expires = ?",
+        (time.time() + lease_seconds,),
+    )
+
+
+def complete(
+    job_id: int, worker: str, output_dir: Path, db_path: Path | str = QUEUE_PATH
+) -> bool:
+    """Mark a claimed job as done.
+
+    Args:
+        job_id: Claimed job.
+        worker: Worker ID that claimed it.
+        output_dir: Run directory of the finished job.
+        db_path: Location of the SQLite file.
+
+    Returns:
+        False if the lease was lost before completion.
+    """
+    return _update_owned(
+        db_path,
+        job_id,
+        worker,
+        "status = 'done', output_dir = ?, lease_expires = NULL, error = NULL",
+        (str(output_dir),),
+    )
+
+
+def fail(
+    job_id: int, worker: str, error: str, db_path: Path | str = QUEUE_PATH
+) -> bool:
+    """Release a claimed job after an error.
+
+    The job goes back to pending until it has been tried max_attempts
+    times, and is then marked failed.
+
+    Args:
+        job_id: Claimed job.
+        worker: Worker ID that claimed it.
+        error: Error message to record.
+        db_path: Location of the SQLite file.
+
+    Returns:
+        False if the lease was lost before the failure was recorded.
+    """
+    return _update_owned(
+        db_path,
+        job_id,
+        worker,
+        "status = CASE WHEN attempts < max_attempts THEN 'pending' "
+        "ELSE 'failed' END, worker = NULL, lease_expires = NULL, error = ?",
+        (error,),
+    )
+
+
+def queue_status(db_path: Path | str = QUEUE_PATH) -> dict[str, int]:
+    """Return the number of jobs per status.
+
+    Args:
+        db_path: Location of the SQLite file.
+
+    Returns:
+        Mapping with "pending", "running", "done" and "failed" counts.
+    """
+    conn = connect_queue(db_path)
+    try:
+        counts = dict.fromkeys(("pending", "running", "done", "failed"), 0)
+        counts.update(conn.execute("SELECT status, count(*) FROM jobs GROUP BY status"))
+    finally:
+        conn.close()
+    return counts
+
+
+def default_worker_id() -> str:
+    """Return ``<hostname>:<pid>``, unique across machines and processes."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _heartbeat_loop(
+    job: Job,
+    worker: str,
+    db_path: Path | str,
+    lease_seconds: float,
+    stop: threading.Event,
+) -> None:
+    while not stop.wait(lease_seconds / 3):
+        if not heartbeat(job.id, worker, db_path, lease_seconds):
+            logger.warning(f"Lost the lease of job {job.id}; it was requeued.")
+            return
+
+
+def run_worker(  # noqa: PLR0913
+    db_path: Path | str = QUEUE_PATH,
+    *,
+    worker: str | None = None,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    max_jobs: int | None = None,
+    wait: float = 0.0,
+    poll_interval: float = 5.0,
+) -> int:
+    """Run queued experiments until the queue is empty.
+
+    Each job runs with experiment.run_experiment while a background
+    thread renews its lease every ``lease_seconds / 3`` seconds. Errors
+    are recorded on the job (see fail) and do not stop the worker.
+
+    Args:
+        db_path: Location of the SQLite file.
+        worker: Worker ID (default: default_worker_id()).
+        lease_seconds: Lease length; a crashed worker's job is requeued
+            this long after its last heartbeat.
+        max_jobs: Stop after this many jobs.
+        wait: Keep polling this many seconds for new jobs once the queue
+            is empty, e.g. while running jobs of other workers may still
+            be requeued.
+        poll_interval: Seconds between polls while waiting.
+
+    Returns:
+        Number of jobs this worker ran.
+    """
+    worker = worker or default_worker_id()
+    ran = 0
+    idle_since = time.monotonic()
+    while max_jobs is None or ran < max_jobs:
+        job = claim(worker, db_path, lease_seconds)
+        if job is None:
+            if time.monotonic() - idle_since >= wait:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        stop = threading.Event()
+        beater = threading.Thread(
+            target=_heartbeat_loop,
+            args=(job, worker, db_path, lease_seconds, stop),
+            daemon=True,
+        )
+        beater.start()
+        try:
+            output_dir, _ = run_experiment(
+                job.config, config_path=job.config_path, console=False
+            )
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed (attempt {job.attempts})")
+            fail(job.id, worker, f"{type(e).__name__}: {e}", db_path)
+        else:
+            complete(job.id, worker, output_dir, db_path)
+        finally:
+            stop.set()
+            beater.join()
+        ran += 1
+        idle_since = time.monotonic()
+    return ran
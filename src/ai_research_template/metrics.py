@@ -1,23 +1,106 @@
 """Evaluation metrics for model assessment.
 
-This module provides various metrics for evaluating model performance.
+This module provides various metrics for evaluating model performance,
+together with resampling-based uncertainty estimates (bootstrap confidence
+intervals and paired permutation tests) and distributional error metrics
+(absolute error quantiles and histograms) with exact and streaming paths.
+Metrics are also available by name through a registry (see
+``evaluate_metrics``), which shares intermediates between metrics, and as
+grouped variants (``compute_grouped_*``) that compute per-segment values
+in a single pass.
 """
 
+import math
+from collections.abc import Callable, Iterable
+from statistics import NormalDist
+from typing import Any
+
 import numpy as np
+from numpy.typing import ArrayLike
+
+from ai_research_template.sketch import KLLSketch
+
+# Upper bound on the number of elements in one resampling weight matrix
+# (rows x samples). 2**22 float64 values keep a chunk around 32 MiB.
+DEFAULT_MAX_CHUNK_ELEMENTS = 2**22
+
+# Block length for accurate (float64-accumulated) reductions. Only one block
+# is upcast at a time, so temporaries stay at a few hundred KiB.
+ACCURATE_BLOCK_SIZE = 2**16
+
+
+def _check_same_shape(y_true: np.ndarray, y_pred: np.ndarray) -> None:
+    """Raise ValueError if y_true and y_pred have different shapes."""
+    if y_true.shape != y_pred.shape:
+        raise ValueError(
+            f"y_true and y_pred must have the same shape, "
+            f"got {y_true.shape} and {y_pred.shape}."
+        )
+
+
+def _check_not_empty(y_true: np.ndarray) -> None:
+    """Raise ValueError for empty inputs, which have no mean."""
+    if y_true.size == 0:
+        raise ValueError("Input arrays must not be empty.")
+
+
+def _blocked_sum(
+    func: Callable[..., np.ndarray],
+    *arrays: np.ndarray,
+    block_size: int = ACCURATE_BLOCK_SIZE,
+) -> float:
+    """Sum ``func(*blocks)`` over aligned blocks with float64 accumulation.
+
+    Each block of the (flattened) inputs is upcast to float64 on its own,
+    reduced with NumPy's pairwise summation, and the per-block partial sums
+    are combined exactly with ``math.fsum``. The inputs themselves are never
+    upcast as a whole, so float32 arrays keep their memory footprint.
+    """
+    flat = [np.ravel(array) for array in arrays]
+    size = flat[0].size
+    partials = []
+    for start in range(0, size, block_size):
+        blocks = [
+            array[start : start + block_size].astype(np.float64) for array in flat
+        ]
+        partials.append(float(np.sum(func(*blocks))))
+    return math.fsum(partials)
+
+
+def _squared_residual(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    residual = y_true - y_pred
+    return residual * residual
+
+
+def _absolute_residual(y_true: np.ndarray, y_pred: np.ndarray) -> np.ndarray:
+    return np.abs(y_true - y_pred)
 
 
-def compute_mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+def _accurate_ss_tot(y_true: np.ndarray) -> float:
+    """Total sum of squares around the mean, accumulated in float64 blocks."""
+    _check_not_empty(y_true)
+    mean = _blocked_sum(np.asarray, y_true) / y_true.size
+    return _blocked_sum(lambda block: (block - mean) ** 2, y_true)
+
+
+def compute_mse(
+    y_true: np.ndarray, y_pred: np.ndarray, *, accurate: bool = False
+) -> float:
     """Compute Mean Squared Error between true and predicted values.
 
     Args:
         y_true: Ground truth target values.
         y_pred: Predicted values from the model.
+        accurate: If True, accumulate in float64 blocks with exact
+            combination of partial sums. Use for float32 or very large
+            inputs; the inputs are not upcast as a whole.
 
     Returns:
         The mean squared error as a float.
 
     Raises:
-        ValueError: If y_true and y_pred have different shapes.
+        ValueError: If y_true and y_pred have different shapes, or if they
+            are empty with accurate=True.
 
     Example:
         >>> y_true = np.array([1.0, 2.0, 3.0])
@@ -25,20 +108,22 @@ def compute_mse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
         >>> compute_mse(y_true, y_pred)
         0.0
     """
-    if y_true.shape != y_pred.shape:
-        raise ValueError(
-            f"y_true and y_pred must have the same shape, "
-            f"got {y_true.shape} and {y_pred.shape}."
-        )
+    _check_same_shape(y_true, y_pred)
+    if accurate:
+        _check_not_empty(y_true)
+        return _blocked_sum(_squared_residual, y_true, y_pred) / y_true.size
     return float(np.mean((y_true - y_pred) ** 2))
 
 
-def compute_rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+def compute_rmse(
+    y_true: np.ndarray, y_pred: np.ndarray, *, accurate: bool = False
+) -> float:
     """Compute Root Mean Squared Error between true and predicted values.
 
     Args:
         y_true: Ground truth target values.
         y_pred: Predicted values from the model.
+        accurate: If True, use the float64 block accumulation of compute_mse.
 
     Returns:
         The root mean squared error as a float.
@@ -49,15 +134,18 @@ def compute_rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
         >>> compute_rmse(y_true, y_pred)
         1.0
     """
-    return float(np.sqrt(compute_mse(y_true, y_pred)))
+    return float(np.sqrt(compute_mse(y_true, y_pred, accurate=accurate)))
 
 
-def compute_mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+def compute_mae(
+    y_true: np.ndarray, y_pred: np.ndarray, *, accurate: bool = False
+) -> float:
     """Compute Mean Absolute Error between true and predicted values.
 
     Args:
         y_true: Ground truth target values.
         y_pred: Predicted values from the model.
+        accurate: If True, use the float64 block accumulation of compute_mse.
 
     Returns:
         The mean absolute error as a float.
@@ -71,34 +159,1000 @@ def compute_mae(y_true: np.ndarray, y_pred: np.ndarray) -> float:
         >>> compute_mae(y_true, y_pred)
         1.0
     """
-    if y_true.shape != y_pred.shape:
-        raise ValueError(
-            f"y_true and y_pred must have the same shape, "
-            f"got {y_true.shape} and {y_pred.shape}."
-        )
+    _check_same_shape(y_true, y_pred)
+    if accurate:
+        _check_not_empty(y_true)
+        return _blocked_sum(_absolute_residual, y_true, y_pred) / y_true.size
     return float(np.mean(np.abs(y_true - y_pred)))
 
 
-def compute_r2(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+def compute_r2(
+    y_true: np.ndarray, y_pred: np.ndarray, *, accurate: bool = False
+) -> float:
     """Compute R-squared (coefficient of determination) score.
 
     Args:
         y_true: Ground truth target values.
         y_pred: Predicted values from the model.
+        accurate: If True, accumulate both sums of squares (and the mean of
+            y_true) in float64 blocks, as in compute_mse.
 
     Returns:
         The R-squared score as a float. Best possible score is 1.0.
 
+    Raises:
+        ValueError: If y_true and y_pred have different shapes, or if they
+            are empty with accurate=True.
+    """
+    _check_same_shape(y_true, y_pred)
+    if accurate:
+        ss_res = _blocked_sum(_squared_residual, y_true, y_pred)
+        ss_tot = _accurate_ss_tot(y_true)
+    else:
+        ss_res = np.sum((y_true - y_pred) ** 2)
+        ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
+    if ss_tot == 0:
+        return 1.0 if ss_res == 0 else 0.0
+    return float(1 - (ss_res / ss_tot))
+
+
+def _partition_quantiles(
+    values: np.ndarray, quantiles: tuple[float, ...]
+) -> np.ndarray:
+    """Return linearly interpolated quantiles, partitioning values in place."""
+    levels = np.asarray(quantiles, dtype=np.float64)
+    if np.any((levels < 0) | (levels > 1)):
+        raise ValueError("Quantile levels must be in [0, 1].")
+    if values.size == 0:
+        raise ValueError("Input arrays must not be empty.")
+
+    positions = levels * (values.size - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    values.partition(np.unique(np.concatenate([lower, upper])))
+    fraction = positions - lower
+    return values[lower] + fraction * (values[upper] - values[lower])
+
+
+def compute_absolute_error_quantiles(
+    y_true: np.ndarray, y_pred: np.ndarray, quantiles: tuple[float, ...]
+) -> np.ndarray:
+    """Compute exact quantiles of the absolute error without a full sort.
+
+    Uses ``np.partition`` on the few order statistics that are needed, which
+    is O(n) per quantile instead of the O(n log n) of sorting. Results match
+    ``np.quantile`` with its default linear interpolation.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        quantiles: Quantile levels in [0, 1].
+
+    Returns:
+        Array of absolute error quantiles, one per level.
+
+    Raises:
+        ValueError: If shapes differ, inputs are empty, or a level is
+            outside [0, 1].
+
+    Example:
+        >>> y_true = np.array([1.0, 2.0, 3.0, 4.0])
+        >>> y_pred = np.array([1.0, 1.0, 1.0, 1.0])
+        >>> compute_absolute_error_quantiles(y_true, y_pred, (0.5,))
+        array([1.5])
+    """
+    _check_same_shape(y_true, y_pred)
+    abs_error = np.ravel(y_true - y_pred)
+    np.abs(abs_error, out=abs_error)
+    return _partition_quantiles(abs_error, quantiles)
+
+
+def compute_median_absolute_error(y_true: np.ndarray, y_pred: np.ndarray) -> float:
+    """Compute the median absolute error between true and predicted values.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+
+    Returns:
+        The median absolute error as a float.
+
+    Raises:
+        ValueError: If y_true and y_pred have different shapes or are empty.
+
+    Example:
+        >>> y_true = np.array([1.0, 2.0, 3.0])
+        >>> y_pred = np.array([1.0, 3.0, 6.0])
+        >>> compute_median_absolute_error(y_true, y_pred)
+        1.0
+    """
+    return float(compute_absolute_error_quantiles(y_true, y_pred, (0.5,))[0])
+
+
+def compute_error_histogram(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    bins: int | np.ndarray = 50,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute a histogram of the residuals ``y_true - y_pred``.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        bins: Number of equal-width bins, or an array of bin edges.
+
+    Returns:
+        A tuple of (counts, bin_edges) as returned by ``np.histogram``.
+
     Raises:
         ValueError: If y_true and y_pred have different shapes.
     """
-    if y_true.shape != y_pred.shape:
+    _check_same_shape(y_true, y_pred)
+    return np.histogram(y_true - y_pred, bins=bins)
+
+
+def _check_groups(
+    y_true: np.ndarray, groups: np.ndarray, n_groups: int | None
+) -> tuple[np.ndarray, int]:
+    """Validate group labels and return them flattened with the group count."""
+    if groups.shape != y_true.shape:
         raise ValueError(
-            f"y_true and y_pred must have the same shape, "
-            f"got {y_true.shape} and {y_pred.shape}."
+            f"groups must have the same shape as y_true, "
+            f"got {groups.shape} and {y_true.shape}."
+        )
+    if not np.issubdtype(groups.dtype, np.integer):
+        raise ValueError(f"groups must be an integer array, got {groups.dtype}.")
+    labels = np.ravel(groups)
+    if labels.size and labels.min() < 0:
+        raise ValueError("groups must not contain negative labels.")
+    max_label = int(labels.max()) + 1 if labels.size else 0
+    if n_groups is None:
+        n_groups = max_label
+    elif n_groups < max_label:
+        raise ValueError(
+            f"n_groups={n_groups} is smaller than the largest label + 1 ({max_label})."
         )
-    ss_res = np.sum((y_true - y_pred) ** 2)
-    ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
+    return labels, n_groups
+
+
+def _grouped_mean(values: np.ndarray, labels: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group mean of values; NaN for empty groups."""
+    counts = np.bincount(labels, minlength=n_groups)
+    sums = np.bincount(labels, weights=values, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sums / counts
+
+
+def compute_grouped_mse(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute the MSE of every group in a single pass.
+
+    Per-group sums are accumulated with ``np.bincount`` weighted reductions,
+    so no masked copies of the inputs are made. To slice by an input bucket,
+    pass e.g. ``np.digitize(x, edges)`` as groups.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups,) indexed by group label. Groups without
+        samples are NaN.
+
+    Raises:
+        ValueError: If shapes differ or groups are not valid labels.
+
+    Example:
+        >>> y_true = np.array([1.0, 2.0, 3.0, 4.0])
+        >>> y_pred = np.array([1.0, 3.0, 3.0, 6.0])
+        >>> compute_grouped_mse(y_true, y_pred, np.array([0, 0, 1, 1]))
+        array([0.5, 2. ])
+    """
+    _check_same_shape(y_true, y_pred)
+    labels, n_groups = _check_groups(y_true, groups, n_groups)
+    residual = np.ravel(y_true - y_pred)
+    return _grouped_mean(residual * residual, labels, n_groups)
+
+
+def compute_grouped_rmse(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute the RMSE of every group in a single pass.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups,) indexed by group label (NaN if empty).
+    """
+    return np.sqrt(compute_grouped_mse(y_true, y_pred, groups, n_groups))
+
+
+def compute_grouped_mae(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute the MAE of every group in a single pass.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups,) indexed by group label (NaN if empty).
+
+    Raises:
+        ValueError: If shapes differ or groups are not valid labels.
+    """
+    _check_same_shape(y_true, y_pred)
+    labels, n_groups = _check_groups(y_true, groups, n_groups)
+    return _grouped_mean(np.abs(np.ravel(y_true - y_pred)), labels, n_groups)
+
+
+def compute_grouped_r2(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute the R-squared score of every group.
+
+    The total sum of squares is taken around each group's own mean, which
+    is gathered back per sample rather than using the cancellation-prone
+    ``sum(y**2) - sum(y)**2 / n`` form.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups,) indexed by group label (NaN if empty).
+        Constant groups follow compute_r2: 1.0 if perfectly predicted,
+        otherwise 0.0.
+
+    Raises:
+        ValueError: If shapes differ or groups are not valid labels.
+    """
+    _check_same_shape(y_true, y_pred)
+    labels, n_groups = _check_groups(y_true, groups, n_groups)
+    truth = np.ravel(y_true)
+    residual = truth - np.ravel(y_pred)
+    counts = np.bincount(labels, minlength=n_groups)
+    ss_res = np.bincount(labels, weights=residual * residual, minlength=n_groups)
+    centered = truth - _grouped_mean(truth, labels, n_groups)[labels]
+    ss_tot = np.bincount(labels, weights=centered * centered, minlength=n_groups)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = 1 - ss_res / ss_tot
+    constant = ss_tot == 0
+    r2[constant] = np.where(ss_res[constant] == 0, 1.0, 0.0)
+    r2[counts == 0] = np.nan
+    return r2
+
+
+def compute_grouped_absolute_error_quantiles(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    quantiles: tuple[float, ...],
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute absolute error quantiles of every group with one sort.
+
+    Samples are ordered once by (group, absolute error) with ``np.lexsort``;
+    each group's order statistics are then gathered from its contiguous
+    segment. Results match ``np.quantile`` (linear interpolation) per group.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        quantiles: Quantile levels in [0, 1].
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups, len(quantiles)); rows of empty groups are NaN.
+
+    Raises:
+        ValueError: If shapes differ, groups are not valid labels, or a level
+            is outside [0, 1].
+    """
+    _check_same_shape(y_true, y_pred)
+    labels, n_groups = _check_groups(y_true, groups, n_groups)
+    levels = np.asarray(quantiles, dtype=np.float64)
+    if np.any((levels < 0) | (levels > 1)):
+        raise ValueError("Quantile levels must be in [0, 1].")
+
+    abs_error = np.abs(np.ravel(y_true - y_pred))
+    ordered = abs_error[np.lexsort((abs_error, labels))]
+    counts = np.bincount(labels, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    positions = levels[None, :] * np.maximum(counts - 1, 0)[:, None]
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    fraction = positions - lower
+    result = np.full((n_groups, levels.size), np.nan)
+    present = counts > 0
+    low_vals = ordered[starts[present, None] + lower[present]]
+    high_vals = ordered[starts[present, None] + upper[present]]
+    result[present] = low_vals + fraction[present] * (high_vals - low_vals)
+    return result
+
+
+def compute_grouped_median_absolute_error(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    groups: np.ndarray,
+    n_groups: int | None = None,
+) -> np.ndarray:
+    """Compute the median absolute error of every group.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        groups: Non-negative integer group label per sample.
+        n_groups: Number of groups (default: largest label + 1).
+
+    Returns:
+        Array of shape (n_groups,) indexed by group label (NaN if empty).
+    """
+    return compute_grouped_absolute_error_quantiles(
+        y_true, y_pred, groups, (0.5,), n_groups
+    )[:, 0]
+
+
+class StreamingErrorSummary:
+    """Approximate distributional error metrics over a stream of batches.
+
+    Absolute errors are summarised in a KLLSketch, so memory stays bounded
+    no matter how many samples are seen; see KLLSketch for the rank error
+    guarantee of the quantile estimates. Residuals are counted into a
+    histogram with fixed bin edges, which is exact. Summaries built with
+    the same k and edges can be merged, e.g. across data shards.
+
+    Attributes:
+        bin_edges: Fixed residual histogram bin edges.
+        counts: Residual histogram counts per bin.
+        n: Number of samples seen so far.
+
+    Example:
+        >>> summary = StreamingErrorSummary(seed=0)
+        >>> summary.update(np.zeros(1000), np.full(1000, 0.5))
+        >>> summary.median_absolute_error()
+        0.5
+    """
+
+    def __init__(
+        self,
+        k: int = 200,
+        bin_edges: np.ndarray | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize an empty summary.
+
+        Args:
+            k: Accuracy parameter of the underlying KLLSketch.
+            bin_edges: Residual histogram bin edges (default: 50 equal-width
+                bins over [-5, 5]). Residuals outside the edges are counted
+                in ``underflow`` and ``overflow``.
+            seed: Random seed for the sketch compactions.
+        """
+        self.bin_edges = (
+            np.linspace(-5.0, 5.0, 51)
+            if bin_edges is None
+            else np.asarray(bin_edges, dtype=np.float64)
+        )
+        self.counts = np.zeros(self.bin_edges.size - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.n = 0
+        self._sketch = KLLSketch(k=k, seed=seed)
+
+    def update(self, y_true: np.ndarray, y_pred: np.ndarray) -> None:
+        """Add one batch of predictions to the summary.
+
+        Args:
+            y_true: Ground truth target values for the batch.
+            y_pred: Predicted values for the batch.
+
+        Raises:
+            ValueError: If y_true and y_pred have different shapes.
+        """
+        _check_same_shape(y_true, y_pred)
+        residual = np.ravel(y_true - y_pred)
+        self.n += residual.size
+        self._sketch.update(np.abs(residual))
+        self.counts += np.histogram(residual, bins=self.bin_edges)[0]
+        self.underflow += int(np.count_nonzero(residual < self.bin_edges[0]))
+        self.overflow += int(np.count_nonzero(residual > self.bin_edges[-1]))
+
+    def merge(self, other: "StreamingErrorSummary") -> None:
+        """Merge another summary into this one in place.
+
+        Args:
+            other: Summary built with the same k and bin edges.
+
+        Raises:
+            ValueError: If the bin edges or sketch parameters differ.
+        """
+        if not np.array_equal(self.bin_edges, other.bin_edges):
+            raise ValueError("Cannot merge summaries with different bin edges.")
+        self._sketch.merge(other._sketch)
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.n += other.n
+
+    def absolute_error_quantiles(self, quantiles: tuple[float, ...]) -> np.ndarray:
+        """Estimate absolute error quantiles from the sketch."""
+        return self._sketch.quantiles(list(quantiles))
+
+    def median_absolute_error(self) -> float:
+        """Estimate the median absolute error from the sketch."""
+        return self._sketch.quantile(0.5)
+
+    def histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the residual histogram as (counts, bin_edges)."""
+        return self.counts.copy(), self.bin_edges.copy()
+
+
+MetricFunction = Callable[["MetricEvaluation"], Any]
+
+# Registered quantities: name -> (function, is_intermediate).
+_METRIC_REGISTRY: dict[str, tuple[MetricFunction, bool]] = {}
+
+
+def register_metric(
+    name: str, *, intermediate: bool = False
+) -> Callable[[MetricFunction], MetricFunction]:
+    """Register a metric (or shared intermediate) under a name.
+
+    The decorated function receives a MetricEvaluation and obtains its
+    inputs by indexing it, e.g. ``evaluation["sse"]``. Dependencies are
+    therefore resolved lazily and each one is computed at most once per
+    evaluation, however many metrics use it.
+
+    Args:
+        name: Name used in configs and reports (e.g. "rmse").
+        intermediate: If True, the quantity is a shared building block
+            (possibly an array) rather than a reportable scalar metric.
+
+    Returns:
+        Decorator that registers the function and returns it unchanged.
+
+    Raises:
+        ValueError: If the name is already registered.
+
+    Example:
+        >>> @register_metric("max_error")
+        ... def _max_error(evaluation):
+        ...     return float(np.max(evaluation["abs_error"]))
+    """
+
+    def decorator(func: MetricFunction) -> MetricFunction:
+        if name in _METRIC_REGISTRY:
+            raise ValueError(f"Metric {name!r} is already registered.")
+        _METRIC_REGISTRY[name] = (func, intermediate)
+        return func
+
+    return decorator
+
+
+def available_metrics() -> list[str]:
+    """Return the names of all registered (non-intermediate) metrics."""
+    return sorted(
+        name for name, (_, intermediate) in _METRIC_REGISTRY.items() if not intermediate
+    )
+
+
+class MetricEvaluation:
+    """Lazy, cached evaluation of registered metrics for one prediction set.
+
+    Indexing by name computes the quantity on first access and caches it,
+    so metrics sharing intermediates (residuals, sums of squares, ...) only
+    pay for them once.
+
+    Example:
+        >>> evaluation = MetricEvaluation(np.array([1.0, 2.0]), np.array([1.0, 3.0]))
+        >>> evaluation.compute(["mse", "rmse"])
+        {'mse': 0.5, 'rmse': 0.7071067811865476}
+    """
+
+    def __init__(
+        self, y_true: np.ndarray, y_pred: np.ndarray, *, accurate: bool = False
+    ) -> None:
+        """Initialize the evaluation.
+
+        Args:
+            y_true: Ground truth target values.
+            y_pred: Predicted values from the model.
+            accurate: If True, sum-based intermediates are accumulated in
+                float64 blocks (see compute_mse).
+
+        Raises:
+            ValueError: If y_true and y_pred have different shapes or are
+                empty.
+        """
+        _check_same_shape(y_true, y_pred)
+        _check_not_empty(y_true)
+        self.y_true = y_true
+        self.y_pred = y_pred
+        self.accurate = accurate
+        self._cache: dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        """Return a registered quantity, computing it on first access."""
+        if name not in self._cache:
+            if name not in _METRIC_REGISTRY:
+                raise KeyError(
+                    f"Unknown metric {name!r}; available: {available_metrics()}."
+                )
+            func, _ = _METRIC_REGISTRY[name]
+            self._cache[name] = func(self)
+        return self._cache[name]
+
+    def compute(self, names: Iterable[str]) -> dict[str, float]:
+        """Compute the requested metrics.
+
+        Args:
+            names: Metric names, e.g. ``["mse", "rmse", "r2"]``.
+
+        Returns:
+            Mapping from metric name to its value, in request order.
+
+        Raises:
+            ValueError: If a name is unknown or refers to an intermediate.
+        """
+        results: dict[str, float] = {}
+        for name in names:
+            entry = _METRIC_REGISTRY.get(name)
+            if entry is None or entry[1]:
+                raise ValueError(
+                    f"Unknown metric {name!r}; available: {available_metrics()}."
+                )
+            results[name] = float(self[name])
+        return results
+
+
+def evaluate_metrics(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    names: Iterable[str],
+    *,
+    accurate: bool = False,
+) -> dict[str, float]:
+    """Compute metrics by name, sharing intermediates between them.
+
+    Args:
+        y_true: Ground truth target values.
+        y_pred: Predicted values from the model.
+        names: Metric names, e.g. ``["mse", "rmse", "r2"]``.
+        accurate: If True, accumulate sums in float64 blocks.
+
+    Returns:
+        Mapping from metric name to its value, in request order.
+
+    Raises:
+        ValueError: If shapes differ, inputs are empty, or a name is not a
+            registered metric.
+    """
+    return MetricEvaluation(y_true, y_pred, accurate=accurate).compute(names)
+
+
+@register_metric("n", intermediate=True)
+def _n(evaluation: MetricEvaluation) -> int:
+    return evaluation.y_true.size
+
+
+@register_metric("residual", intermediate=True)
+def _residual(evaluation: MetricEvaluation) -> np.ndarray:
+    return evaluation.y_true - evaluation.y_pred
+
+
+@register_metric("abs_error", intermediate=True)
+def _abs_error(evaluation: MetricEvaluation) -> np.ndarray:
+    return np.abs(evaluation["residual"])
+
+
+@register_metric("squared_error", intermediate=True)
+def _squared_error(evaluation: MetricEvaluation) -> np.ndarray:
+    residual = evaluation["residual"]
+    return residual * residual
+
+
+# The sums below use the same reductions (and dtypes) as compute_mse and
+# compute_r2, so the registry returns identical values for float32 too.
+@register_metric("sse", intermediate=True)
+def _sse(evaluation: MetricEvaluation) -> float | np.floating:
+    if evaluation.accurate:
+        return _blocked_sum(_squared_residual, evaluation.y_true, evaluation.y_pred)
+    return np.sum(evaluation["squared_error"])
+
+
+@register_metric("ss_tot", intermediate=True)
+def _ss_tot(evaluation: MetricEvaluation) -> float | np.floating:
+    if evaluation.accurate:
+        return _accurate_ss_tot(evaluation.y_true)
+    return np.sum((evaluation.y_true - np.mean(evaluation.y_true)) ** 2)
+
+
+@register_metric("abs_error_quantiles", intermediate=True)
+def _abs_error_quantiles(evaluation: MetricEvaluation) -> dict[float, float]:
+    # One partition pass serves every quantile metric in the report.
+    levels = (0.5, 0.95, 0.99)
+    values = _partition_quantiles(np.ravel(evaluation["abs_error"]).copy(), levels)
+    return dict(zip(levels, values.tolist(), strict=True))
+
+
+@register_metric("mse")
+def _mse(evaluation: MetricEvaluation) -> float:
+    if evaluation.accurate:
+        return evaluation["sse"] / evaluation["n"]
+    return float(np.mean(evaluation["squared_error"]))
+
+
+@register_metric("rmse")
+def _rmse(evaluation: MetricEvaluation) -> float:
+    return float(np.sqrt(evaluation["mse"]))
+
+
+@register_metric("mae")
+def _mae(evaluation: MetricEvaluation) -> float:
+    if evaluation.accurate:
+        return (
+            _blocked_sum(_absolute_residual, evaluation.y_true, evaluation.y_pred)
+            / evaluation["n"]
+        )
+    return float(np.mean(evaluation["abs_error"]))
+
+
+@register_metric("r2")
+def _r2(evaluation: MetricEvaluation) -> float:
+    ss_res = evaluation["sse"]
+    ss_tot = evaluation["ss_tot"]
     if ss_tot == 0:
         return 1.0 if ss_res == 0 else 0.0
-    return float(1 - (ss_res / ss_tot))
+    return float(1 - ss_res / ss_tot)
+
+
+@register_metric("median_absolute_error")
+def _median_absolute_error(evaluation: MetricEvaluation) -> float:
+    return evaluation["abs_error_quantiles"][0.5]
+
+
+@register_metric("p95_absolute_error")
+def _p95_absolute_error(evaluation: MetricEvaluation) -> float:
+    return evaluation["abs_error_quantiles"][0.95]
+
+
+@register_metric("p99_absolute_error")
+def _p99_absolute_error(evaluation: MetricEvaluation) -> float:
+    return evaluation["abs_error_quantiles"][0.99]
+
+
+BOOTSTRAP_METRICS = ("mse", "rmse", "mae", "r2")
+
+
+def _chunk_rows(n_samples: int, max_chunk_elements: int) -> int:
+    """Return how many resampling rows fit into one chunk."""
+    if max_chunk_elements < 1:
+        raise ValueError(
+            f"max_chunk_elements must be at least 1, got {max_chunk_elements}."
+        )
+    return max(1, max_chunk_elements // n_samples)
+
+
+def _multinomial_weights(
+    rng: np.random.Generator, n_rows: int, n_samples: int
+) -> np.ndarray:
+    """Draw bootstrap resampling weights for n_rows replicates at once.
+
+    Each row counts how often every sample is picked when drawing n_samples
+    indices with replacement, i.e. a Multinomial(n, 1/n) vector. The counts
+    for all rows come from a single offset ``np.bincount`` instead of a
+    Python loop over replicates.
+    """
+    # int32 indices halve the memory traffic of the draw and the bincount.
+    total = n_rows * n_samples
+    dtype = np.int32 if total <= np.iinfo(np.int32).max else np.int64
+    idx = rng.integers(0, n_samples, size=(n_rows, n_samples), dtype=dtype)
+    idx += (np.arange(n_rows, dtype=dtype) * n_samples)[:, None]
+    counts = np.bincount(idx.ravel(), minlength=total)
+    return counts.reshape(n_rows, n_samples).astype(np.float64)
+
+
+def _replicate_metrics(
+    weighted: np.ndarray, n_samples: int, metrics: tuple[str, ...]
+) -> dict[str, np.ndarray]:
+    """Turn weighted column sums into per-replicate metric values.
+
+    Args:
+        weighted: Array of shape (n_rows, 4) holding the weighted sums of
+            squared error, absolute error, centered y and centered y squared.
+        n_samples: Number of samples (the sum of every weight row).
+        metrics: Names of the metrics to compute.
+    """
+    ss_res = weighted[:, 0]
+    values: dict[str, np.ndarray] = {}
+    if "mse" in metrics or "rmse" in metrics:
+        mse = ss_res / n_samples
+        values["mse"] = mse
+        values["rmse"] = np.sqrt(mse)
+    if "mae" in metrics:
+        values["mae"] = weighted[:, 1] / n_samples
+    if "r2" in metrics:
+        ss_tot = weighted[:, 3] - weighted[:, 2] ** 2 / n_samples
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r2 = 1.0 - ss_res / ss_tot
+        degenerate = ss_tot <= 0
+        r2[degenerate] = np.where(ss_res[degenerate] == 0, 1.0, 0.0)
+        values["r2"] = r2
+    return {name: values[name] for name in metrics}
+
+
+def bootstrap_metric_replicates(  # noqa: PLR0913
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    *,
+    metrics: tuple[str, ...] = BOOTSTRAP_METRICS,
+    n_resamples: int = 1000,
+    seed: int | None = None,
+    max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS,
+) -> dict[str, np.ndarray]:
+    """Compute bootstrap replicates of several metrics in one pass.
+
+    Every replicate is expressed as a vector of multinomial resampling
+    weights, so a chunk of replicates is evaluated as a single matrix
+    product ``weights @ per_sample_terms`` rather than by materialising
+    resampled copies of the data. Chunks are sized so that the weight
+    matrix never holds more than ``max_chunk_elements`` values.
+
+    Args:
+        y_true: Ground truth target values (1D).
+        y_pred: Predicted values from the model (1D).
+        metrics: Names of the metrics to resample (subset of BOOTSTRAP_METRICS).
+        n_resamples: Number of bootstrap replicates.
+        seed: Random seed for reproducibility.
+        max_chunk_elements: Maximum size of one weight matrix chunk.
+
+    Returns:
+        Mapping from metric name to an array of shape (n_resamples,).
+
+    Raises:
+        ValueError: If shapes differ, inputs are empty, a metric is unknown,
+            or n_resamples is less than 1.
+    """
+    _check_same_shape(y_true, y_pred)
+    unknown = [name for name in metrics if name not in BOOTSTRAP_METRICS]
+    if unknown:
+        raise ValueError(
+            f"Unknown bootstrap metrics {unknown}; "
+            f"expected a subset of {BOOTSTRAP_METRICS}."
+        )
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be at least 1, got {n_resamples}.")
+    y_true = np.ravel(y_true).astype(np.float64, copy=False)
+    y_pred = np.ravel(y_pred).astype(np.float64, copy=False)
+    n_samples = y_true.size
+    if n_samples == 0:
+        raise ValueError("Input arrays must not be empty.")
+
+    residual = y_true - y_pred
+    centered = y_true - y_true.mean()
+    terms = np.column_stack([residual**2, np.abs(residual), centered, centered**2])
+
+    rng = np.random.default_rng(seed)
+    rows = _chunk_rows(n_samples, max_chunk_elements)
+    weighted = np.empty((n_resamples, terms.shape[1]))
+    for start in range(0, n_resamples, rows):
+        stop = min(start + rows, n_resamples)
+        weights = _multinomial_weights(rng, stop - start, n_samples)
+        weighted[start:stop] = weights @ terms
+
+    return _replicate_metrics(weighted, n_samples, tuple(metrics))
+
+
+def bootstrap_confidence_intervals(  # noqa: PLR0913
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    *,
+    metrics: tuple[str, ...] = BOOTSTRAP_METRICS,
+    n_resamples: int = 1000,
+    confidence_level: float = 0.95,
+    seed: int | None = None,
+    max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS,
+) -> dict[str, tuple[float, float]]:
+    """Compute percentile bootstrap confidence intervals for metrics.
+
+    Args:
+        y_true: Ground truth target values (1D).
+        y_pred: Predicted values from the model (1D).
+        metrics: Names of the metrics (subset of BOOTSTRAP_METRICS).
+        n_resamples: Number of bootstrap replicates.
+        confidence_level: Coverage of the interval, in (0, 1).
+        seed: Random seed for reproducibility.
+        max_chunk_elements: Maximum size of one weight matrix chunk.
+
+    Returns:
+        Mapping from metric name to a (lower, upper) tuple.
+
+    Raises:
+        ValueError: If confidence_level is not in (0, 1), or for any reason
+            listed in bootstrap_metric_replicates.
+
+    Example:
+        >>> rng = np.random.default_rng(0)
+        >>> y = rng.normal(size=1000)
+        >>> cis = bootstrap_confidence_intervals(y, y + 0.1, seed=0)
+        >>> sorted(cis)
+        ['mae', 'mse', 'r2', 'rmse']
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError(f"confidence_level must be in (0, 1), got {confidence_level}.")
+    replicates = bootstrap_metric_replicates(
+        y_true,
+        y_pred,
+        metrics=metrics,
+        n_resamples=n_resamples,
+        seed=seed,
+        max_chunk_elements=max_chunk_elements,
+    )
+    alpha = (1 - confidence_level) / 2
+    intervals: dict[str, tuple[float, float]] = {}
+    for name, values in replicates.items():
+        lower, upper = np.quantile(values, [alpha, 1 - alpha])
+        intervals[name] = (float(lower), float(upper))
+    return intervals
+
+
+def paired_permutation_test(  # noqa: PLR0913
+    y_true: np.ndarray,
+    y_pred_a: np.ndarray,
+    y_pred_b: np.ndarray,
+    *,
+    loss: str = "squared",
+    n_resamples: int = 10000,
+    seed: int | None = None,
+    max_chunk_elements: int = DEFAULT_MAX_CHUNK_ELEMENTS,
+) -> tuple[float, float]:
+    """Test whether two models have different mean loss on the same samples.
+
+    Under the null hypothesis the per-sample losses of both models are
+    exchangeable, so the sign of each paired difference can be flipped at
+    random. Sign matrices are generated chunk by chunk and applied to the
+    differences as one matrix product per chunk.
+
+    Args:
+        y_true: Ground truth target values (1D).
+        y_pred_a: Predictions of model A.
+        y_pred_b: Predictions of model B.
+        loss: Per-sample loss, either "squared" (MSE) or "absolute" (MAE).
+        n_resamples: Number of random sign flips.
+        seed: Random seed for reproducibility.
+        max_chunk_elements: Maximum size of one sign matrix chunk.
+
+    Returns:
+        A tuple of (observed difference in mean loss A - B, two-sided p-value).
+
+    Raises:
+        ValueError: If shapes differ, inputs are empty, the loss is unknown,
+            or n_resamples is less than 1.
+    """
+    _check_same_shape(y_true, y_pred_a)
+    _check_same_shape(y_true, y_pred_b)
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be at least 1, got {n_resamples}.")
+    residual_a = np.ravel(y_true - y_pred_a).astype(np.float64, copy=False)
+    residual_b = np.ravel(y_true - y_pred_b).astype(np.float64, copy=False)
+    if residual_a.size == 0:
+        raise ValueError("Input arrays must not be empty.")
+    if loss == "squared":
+        diff = residual_a**2 - residual_b**2
+    elif loss == "absolute":
+        diff = np.abs(residual_a) - np.abs(residual_b)
+    else:
+        raise ValueError(f"loss must be 'squared' or 'absolute', got {loss!r}.")
+
+    n_samples = diff.size
+    observed = float(diff.mean())
+    rng = np.random.default_rng(seed)
+    rows = _chunk_rows(n_samples, max_chunk_elements)
+    # Small tolerance so permutations that reproduce the observed statistic
+    # exactly are not lost to floating point round-off.
+    threshold = abs(observed) * (1 - 1e-12)
+    n_extreme = 0
+    for start in range(0, n_resamples, rows):
+        n_rows = min(rows, n_resamples - start)
+        signs = rng.integers(0, 2, size=(n_rows, n_samples), dtype=np.int8)
+        signs = 2.0 * signs - 1.0
+        permuted = (signs @ diff) / n_samples
+        n_extreme += int(np.count_nonzero(np.abs(permuted) >= threshold))
+
+    p_value = (n_extreme + 1) / (n_resamples + 1)
+    return observed, p_value
+
+
+def _t_quantile(p: float, df: int) -> float:
+    """Quantile of Student's t distribution.
+
+    Uses closed forms for df 1 and 2 and otherwise the Cornish-Fisher
+    expansion around the normal quantile (Abramowitz & Stegun 26.7.5),
+    whose error is below 1e-3 for df >= 4 and shrinks quickly as df grows,
+    so SciPy is not needed.
+    """
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:  # noqa: PLR2004
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+    z = NormalDist().inv_cdf(p)
+    g1 = (z**3 + z) / 4
+    g2 = (5 * z**5 + 16 * z**3 + 3 * z) / 96
+    g3 = (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / 384
+    g4 = (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df**2 + g3 / df**3 + g4 / df**4
+
+
+def summarize_replicates(
+    values: ArrayLike, confidence_level: float = 0.95
+) -> dict[str, float]:
+    """Summarize a metric over independent replicates (e.g. seeds).
+
+    The confidence interval is the Student t interval for the mean,
+    ``mean +- t * std / sqrt(n)``.
+
+    Args:
+        values: One metric value per replicate (1D array or sequence).
+        confidence_level: Coverage of the interval, in (0, 1).
+
+    Returns:
+        Mapping with "mean", "std" (sample standard deviation), "ci_low"
+        and "ci_high". With a single replicate, std and the interval
+        bounds are NaN.
+
+    Raises:
+        ValueError: If values is empty or confidence_level is not in (0, 1).
+
+    Example:
+        >>> stats = summarize_replicates(np.array([1.0, 2.0, 3.0]))
+        >>> stats["mean"], stats["std"]
+        (2.0, 1.0)
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError(f"confidence_level must be in (0, 1), got {confidence_level}.")
+    samples = np.ravel(np.asarray(values, dtype=np.float64))
+    if samples.size == 0:
+        raise ValueError("values must not be empty.")
+    mean = float(samples.mean())
+    if samples.size == 1:
+        return {"mean": mean, "std": math.nan, "ci_low": math.nan, "ci_high": math.nan}
+    std = float(samples.std(ddof=1))
+    half_width = (
+        _t_quantile((1 + confidence_level) / 2, samples.size - 1)
+        * std
+        / math.sqrt(samples.size)
+    )
+    return {
+        "mean": mean,
+        "std": std,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+    }
@@ -0,0 +1,239 @@
+"""Profiling of experiment runs.
+
+Two modes are available:
+
+- ``cprofile``: deterministic profiling with cProfile. Exact call counts
+  and times, but every function call pays a hook, so Python-heavy code
+  can run several times slower.
+- ``sample``: a background thread records the profiled thread's stack
+  every ``interval`` seconds. The overhead is small and independent of
+  the number of calls, at the price of statistical counts.
+
+Profiles are saved into the run's ``artifacts/`` directory:
+
+  artifacts/profile.pstats      # cprofile; open with pstats or snakeviz
+  artifacts/profile.collapsed   # sample; "a;b;c <count>" lines for
+                                # flamegraph.pl, speedscope or inferno
+
+and ``report_lines`` renders the hottest functions as a markdown table
+for report.md.
+"""
+
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import FrameType, TracebackType
+from typing import TYPE_CHECKING, Any
+
+# cProfile and pstats are imported when used, so scripts that only offer
+# a --profile option start quickly.
+if TYPE_CHECKING:
+    import cProfile
+
+PROFILE_MODES = ("cprofile", "sample")
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+def _label(filename: str, line: int, name: str) -> str:
+    # cProfile reports built-in functions with filename "~".
+    if filename == "~":
+        return name
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def _is_own_frame(key: tuple[str, int, str]) -> bool:
+    """Return True for this module's start/stop calls, seen by cProfile."""
+    filename, _, name = key
+    return filename == __file__ or "_lsprof.Profiler" in name
+
+
+def _collapse(frame: FrameType | None) -> str:
+    """Return a frame's stack, outermost first, as ``a;b;c``."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(_label(code.co_filename, code.co_firstlineno, code.co_name))
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class Profiler:
+    """Profile a block of code with cProfile or stack sampling.
+
+    Example:
+        >>> profiler = Profiler("sample")
+        >>> with profiler:
+        ...     run()
+        >>> profiler.save(output_dir)
+        >>> report_lines += profiler.report_lines()
+    """
+
+    def __init__(
+        self, mode: str = "cprofile", *, interval: float = DEFAULT_SAMPLE_INTERVAL
+    ) -> None:
+        """Create a profiler.
+
+        Args:
+            mode: "cprofile" or "sample".
+            interval: Seconds between stack samples in sample mode.
+
+        Raises:
+            ValueError: If mode is unknown.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(
+                f"Unknown profile mode {mode!r}; use one of {PROFILE_MODES}."
+            )
+        self.mode = mode
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._profile: cProfile.Profile | None = None
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start profiling the calling thread."""
+        if self.mode == "cprofile":
+            import cProfile  # noqa: PLC0415
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            return
+        self._stop.clear()
+        self._sampler = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self) -> None:
+        """Stop profiling; samples and stats are kept."""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def _sample(self, thread_id: int) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame)] += 1
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def save(self, output_dir: Path) -> Path:
+        """Write the profile into ``<output_dir>/artifacts/``.
+
+        Args:
+            output_dir: Run directory.
+
+        Returns:
+            Path of profile.pstats (cprofile) or profile.collapsed
+            (sample).
+        """
+        artifact_dir = output_dir / "artifacts"
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        if self.mode == "cprofile":
+            path = artifact_dir / "profile.pstats"
+            if self._profile is not None:
+                self._profile.dump_stats(path)
+            return path
+        path = artifact_dir / "profile.collapsed"
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.items()),
+            encoding="utf-8",
+        )
+        return path
+
+    def top_functions(self, n: int = 10) -> list[dict[str, Any]]:
+        """Return the functions with the most time spent in their own code.
+
+        Args:
+            n: Number of functions.
+
+        Returns:
+            Dicts with "function", "self" and "total" (fractions of the
+            profiled time, the latter including callees) and "calls"
+            (cprofile only; None in sample mode), hottest first.
+        """
+        if self.mode == "cprofile":
+            if self._profile is None:
+                return []
+            import pstats  # noqa: PLC0415
+
+            stats = pstats.Stats(self._profile).stats  # type: ignore[attr-defined]
+            total_time = sum(entry[2] for entry in stats.values()) or 1.0
+            rows = [
+                {
+                    "function": _label(*key),
+                    "self": tottime / total_time,
+                    "total": cumtime / total_time,
+                    "calls": ncalls,
+                }
+                for key, (_, ncalls, tottime, cumtime, _) in stats.items()
+                if not _is_own_frame(key)
+            ]
+        else:
+            n_samples = sum(self.stacks.values()) or 1
+            self_counts: Counter[str] = Counter()
+            total_counts: Counter[str] = Counter()
+            for stack, count in self.stacks.items():
+                frames = stack.split(";")
+                self_counts[frames[-1]] += count
+                for frame in set(frames):
+                    total_counts[frame] += count
+            rows = [
+                {
+                    "function": function,
+                    "self": self_counts[function] / n_samples,
+                    "total": total / n_samples,
+                    "calls": None,
+                }
+                for function, total in total_counts.items()
+            ]
+        rows.sort(key=lambda row: (row["self"], row["total"]), reverse=True)
+        return rows[:n]
+
+    def report_lines(self, n: int = 10) -> list[str]:
+        """Return a markdown section listing the hottest functions.
+
+        Args:
+            n: Number of functions.
+
+        Returns:
+            Report lines, ready to append to a report.
+        """
+        if self.mode == "cprofile":
+            source = "cProfile, artifacts/profile.pstats"
+        else:
+            source = (
+                f"{sum(self.stacks.values())} samples every "
+                f"{self.interval * 1000:g} ms, artifacts/profile.collapsed"
+            )
+        lines = [
+            "## Profile",
+            "",
+            f"Top {n} functions by self time ({source}).",
+            "",
+            "| Function | Self | Total | Calls |",
+            "|---|---|---|---|",
+        ]
+        for row in self.top_functions(n):
+            calls = "" if row["calls"] is None else str(row["calls"])
+            lines.append(
+                f"| `{row['function']}` | {row['self']:.1%} | {row['total']:.1%} "
+                f"| {calls} |"
+            )
+        return lines
@@ -0,0 +1,138 @@
+"""Result cache keyed by config and source code.
+
+A run's key combines the canonical config hash (config.config_hash) with
+a hash of the package source tree, so a run is reused only when both the
+parameters and the code that produced it are unchanged. Finished runs are
+recorded as one small file per key:
+
+  outputs/.run_cache/
+    9c/
+      9c41...d2.json        # {"path": "outputs/exp/2026-01-25_120000"}
+
+Lookups are a single file read, so checking every point of a large sweep
+is cheap, and concurrent runs never contend for a shared index.
+"""
+
+import functools
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from ai_research_template.config import config_hash
+from ai_research_template.utils import load_results, write_atomic
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+RUN_CACHE_DIR = Path("outputs/.run_cache")
+
+
+@functools.cache
+def _cached_source_hash(root: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        digest.update(path.read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def source_tree_hash(root: Path | str = PACKAGE_DIR) -> str:
+    """Return a hash of all Python sources under root.
+
+    The hash covers file paths and contents, and is computed once per
+    process.
+
+    Args:
+        root: Source directory (default: the ai_research_template package).
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    return _cached_source_hash(Path(root).resolve())
+
+
+def run_key(
+    config: dict[str, Any],
+    exclude: tuple[str, ...] = (),
+    source_hash: str | None = None,
+) -> dict[str, str]:
+    """Compute the cache key of a run.
+
+    Args:
+        config: Validated run config.
+        exclude: Config keys that do not affect results (see
+            config.BOOKKEEPING_KEYS).
+        source_hash: Source tree hash (default: source_tree_hash()).
+
+    Returns:
+        Mapping with "config_hash", "source_hash" and the combined
+        "run_key", suitable for storing in params.json.
+    """
+    hashes = {
+        "config_hash": config_hash(config, exclude),
+        "source_hash": source_hash or source_tree_hash(),
+    }
+    combined = f"{hashes['config_hash']}:{hashes['source_hash']}".encode()
+    hashes["run_key"] = hashlib.sha256(combined).hexdigest()
+    return hashes
+
+
+def _entry_path(key: str, cache_dir: Path | str) -> Path:
+    return Path(cache_dir) / key[:2] / f"{key}.json"
+
+
+def record_run(
+    key: str, output_dir: Path, cache_dir: Path | str = RUN_CACHE_DIR
+) -> None:
+    """Register a finished run under its key.
+
+    Call this after metrics.json has been written.
+
+    Args:
+        key: Run key from run_key.
+        output_dir: Directory of the finished run.
+        cache_dir: Cache location.
+    """
+    entry_path = _entry_path(key, cache_dir)
+    entry_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(entry_path, json.dumps({"path": str(output_dir)}).encode("utf-8"))
+
+
+def lookup_run(key: str, cache_dir: Path | str = RUN_CACHE_DIR) -> Path | None:
+    """Return the directory of a finished run with this key, if any.
+
+    Entries whose run directory or metrics.json has since been deleted are
+    treated as misses.
+
+    Args:
+        key: Run key from run_key.
+        cache_dir: Cache location.
+
+    Returns:
+        The run directory, or None.
+    """
+    try:
+        with open(_entry_path(key, cache_dir), encoding="utf-8") as f:
+            output_dir = Path(json.load(f)["path"])
+    except FileNotFoundError:
+        return None
+    if not (output_dir / "metrics.json").exists():
+        return None
+    return output_dir
+
+
+def load_cached_results(
+    key: str, cache_dir: Path | str = RUN_CACHE_DIR
+) -> dict[str, Any] | None:
+    """Return the saved results of a finished run with this key, if any.
+
+    Args:
+        key: Run key from run_key.
+        cache_dir: Cache location.
+
+    Returns:
+        The run's metrics.json content (see utils.load_results), or None.
+    """
+    output_dir = lookup_run(key, cache_dir)
+    if output_dir is None:
+        return None
+    return load_results(output_dir)
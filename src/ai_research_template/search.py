@@ -0,0 +1,283 @@
+"""Adaptive hyperparameter search with successive halving and Hyperband.
+
+A search file is a sweep file (see sweep) with a ``search`` section:
+
+  # configs/search_sample.yaml
+  base: sample.yaml
+  method: random
+  seed: 0
+  parameters:
+    noise_std: {distribution: log_uniform, low: 0.1, high: 2.0}
+    slope: {distribution: uniform, low: 1.0, high: 3.0}
+  search:
+    algorithm: hyperband    # hyperband | halving
+    budget: n_samples       # config key that sets the cost of a run
+    min_budget: 50
+    max_budget: 1350
+    eta: 3
+    metric: mse
+    mode: min
+
+Successive halving runs all points at a small budget, keeps the best
+``1/eta`` and reruns them with ``eta`` times the budget, until the
+maximum budget is reached. Hyperband runs several halving brackets that
+trade the number of points against their starting budget, drawing fresh
+points from ``parameters`` for each bracket (lists are uniform choices,
+as in random sweeps). With ``algorithm: halving`` the sweep's own grid or
+``n_trials`` random points form a single bracket.
+
+Every rung runs in parallel on one shared worker pool (see
+sweep.sweep_executor). Each run is a normal experiment run, so it is
+appended to the experiment summary with ``param_search_bracket`` and
+``param_search_rung`` columns.
+"""
+
+import math
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+from ai_research_template.config import load_config
+from ai_research_template.sweep import (
+    grid_points,
+    point_configs,
+    random_points,
+    run_sweep,
+    sweep_executor,
+)
+from ai_research_template.utils import load_results
+
+
+class SearchConfig(BaseModel):
+    """Schema of the ``search`` section of a search file."""
+
+    algorithm: Literal["halving", "hyperband"] = "hyperband"
+    budget: str = "n_samples"
+    min_budget: int | float = Field(gt=0)
+    max_budget: int | float = Field(gt=0)
+    eta: int = Field(default=3, ge=2)
+    metric: str = "mse"
+    mode: Literal["min", "max"] = "min"
+
+
+def halving_budgets(
+    min_budget: float, max_budget: float, eta: int
+) -> list[int | float]:
+    """Return the budgets of the rungs of one successive halving bracket.
+
+    Budgets grow by a factor of eta and end at max_budget; the first one
+    is the smallest such budget not below min_budget. They are rounded to
+    integers when both bounds are integers.
+
+    Args:
+        min_budget: Smallest budget a point may run with.
+        max_budget: Budget of the last rung.
+        eta: Growth factor between rungs.
+
+    Returns:
+        Budgets in increasing order.
+
+    Raises:
+        ValueError: If min_budget exceeds max_budget.
+    """
+    if min_budget > max_budget:
+        raise ValueError("min_budget must not exceed max_budget.")
+    # The epsilon keeps exact powers such as 1350 / 50 = 27 = 3**3 exact.
+    n_rungs = math.floor(math.log(max_budget / min_budget, eta) + 1e-9) + 1
+    budgets = [max_budget / eta**i for i in reversed(range(n_rungs))]
+    if isinstance(min_budget, int) and isinstance(max_budget, int):
+        return [round(budget) for budget in budgets]
+    return budgets
+
+
+def _score(value: float, mode: str) -> float:
+    """Return a sort key where lower is better and NaN is worst."""
+    if math.isnan(value):
+        return math.inf
+    return value if mode == "min" else -value
+
+
+def successive_halving(  # noqa: PLR0913
+    points: list[dict[str, Any]],
+    base_path: Path | str,
+    search: SearchConfig,
+    *,
+    budgets: list[int | float] | None = None,
+    bracket: int = 0,
+    executor: Executor | None = None,
+    force: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Run one successive halving bracket.
+
+    Args:
+        points: Dotted-key values per point; they must not set the budget
+            key.
+        base_path: Base config file.
+        search: Search settings.
+        budgets: Rung budgets (default: halving_budgets of the search
+            bounds).
+        bracket: Bracket index, recorded with each run.
+        executor: Pool to run on (default: a new pool per rung).
+        force: Rerun points that already have results.
+
+    Yields:
+        One record per rung with "bracket", "rung", "budget" and
+        "trials", a list of {"point", "path", "value"} sorted from best to
+        worst. The points promoted to the next rung are the first
+        ``len(trials) // eta`` trials.
+
+    Raises:
+        ValueError: If a point sets the budget key.
+    """
+    if any(search.budget in point for point in points):
+        raise ValueError(f"Points must not set the budget key {search.budget!r}.")
+    if budgets is None:
+        budgets = halving_budgets(search.min_budget, search.max_budget, search.eta)
+    for rung, budget in enumerate(budgets):
+        configs = point_configs(
+            base_path, [{**point, search.budget: budget} for point in points]
+        )
+        for config in configs:
+            config["search_bracket"] = bracket
+            config["search_rung"] = rung
+        trials = []
+        for point, (path, _) in zip(
+            points,
+            run_sweep(configs, base_path, force=force, executor=executor),
+            strict=True,
+        ):
+            value = float(load_results(path)["metrics"][search.metric])
+            trials.append({"point": point, "path": str(path), "value": value})
+        trials.sort(key=lambda trial: _score(trial["value"], search.mode))
+        yield {"bracket": bracket, "rung": rung, "budget": budget, "trials": trials}
+        points = [
+            trial["point"] for trial in trials[: max(1, len(trials) // search.eta)]
+        ]
+
+
+def hyperband_brackets(
+    search: SearchConfig,
+) -> list[tuple[int, list[int | float]]]:
+    """Return the Hyperband brackets as (number of points, rung budgets).
+
+    Bracket ``s`` starts ``ceil((s_max + 1) / (s + 1) * eta**s)`` points at
+    ``max_budget / eta**s``, from the most exploratory bracket down to the
+    one that runs few points at the full budget only.
+
+    Args:
+        search: Search settings.
+
+    Returns:
+        One entry per bracket.
+    """
+    budgets = halving_budgets(search.min_budget, search.max_budget, search.eta)
+    s_max = len(budgets) - 1
+    return [
+        (math.ceil((s_max + 1) / (s + 1) * search.eta**s), budgets[s_max - s :])
+        for s in reversed(range(s_max + 1))
+    ]
+
+
+def load_search(
+    search_path: Path | str,
+) -> tuple[Path, dict[str, Any], SearchConfig]:
+    """Read a search file.
+
+    Args:
+        search_path: Search YAML file (see the module docstring).
+
+    Returns:
+        Tuple of (base config path, sweep spec, search settings).
+
+    Raises:
+        ValueError: If the search metric is not one of the metrics the
+            base config computes.
+    """
+    search_path = Path(search_path)
+    spec = load_config(search_path)
+    search = SearchConfig.model_validate(spec.get("search", {}))
+    base_path = search_path.parent / spec["base"]
+    metrics = load_config(base_path).get("metrics", ["mse"])
+    if search.metric not in metrics:
+        raise ValueError(
+            f"Search metric {search.metric!r} is not computed by {base_path}; "
+            f"its metrics are {metrics}."
+        )
+    return base_path, spec, search
+
+
+def run_search(
+    search_path: Path | str,
+    *,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Run the search described by a search file.
+
+    With ``algorithm: halving`` the sweep's own points (grid or random)
+    form a single bracket. With ``hyperband`` each bracket draws its
+    points from ``parameters``, seeded by the sweep seed plus the bracket
+    index.
+
+    Args:
+        search_path: Search YAML file (see the module docstring).
+        max_workers: Number of worker processes (default: CPU count).
+        force: Rerun points that already have results.
+
+    Yields:
+        Rung records in run order (see successive_halving).
+    """
+    base_path, spec, search = load_search(search_path)
+    parameters = spec["parameters"]
+    seed = spec.get("seed")
+    with sweep_executor(max_workers) as executor:
+        if search.algorithm == "halving":
+            if spec.get("method", "grid") == "grid":
+                points = grid_points(parameters)
+            else:
+                points = random_points(parameters, spec["n_trials"], seed)
+            yield from successive_halving(
+                points, base_path, search, executor=executor, force=force
+            )
+            return
+        for bracket, (n_points, budgets) in enumerate(hyperband_brackets(search)):
+            points = random_points(
+                parameters, n_points, None if seed is None else seed + bracket
+            )
+            yield from successive_halving(
+                points,
+                base_path,
+                search,
+                budgets=budgets,
+                bracket=bracket,
+                executor=executor,
+                force=force,
+            )
+
+
+def best_trial(rungs: list[dict[str, Any]], search: SearchConfig) -> dict[str, Any]:
+    """Return the best trial run at the largest budget.
+
+    Args:
+        rungs: Rung records from run_search or successive_halving.
+        search: Search settings.
+
+    Returns:
+        The best {"point", "path", "value"} trial, with its "budget".
+
+    Raises:
+        ValueError: If rungs is empty.
+    """
+    if not rungs:
+        raise ValueError("No rungs were run.")
+    top_budget = max(rung["budget"] for rung in rungs)
+    candidates = [
+        {**trial, "budget": rung["budget"]}
+        for rung in rungs
+        if rung["budget"] == top_budget
+        for trial in rung["trials"]
+    ]
+    return min(candidates, key=lambda trial: _score(trial["value"], search.mode))
@@ -0,0 +1,197 @@
+"""Mergeable streaming quantile sketches.
+
+This module provides a KLL-style quantile sketch for summarising streams
+that are too large to hold in memory or to sort.
+"""
+
+import math
+
+import numpy as np
+
+# Geometric shrink factor for the capacity of lower compactor levels, as in
+# the KLL paper (Karnin, Lang & Liberty, 2016).
+_CAPACITY_DECAY = 2.0 / 3.0
+_MIN_LEVEL_CAPACITY = 2
+_MIN_K = 8
+
+
+class KLLSketch:
+    """KLL quantile sketch with bounded memory.
+
+    Items are kept in a stack of compactor levels. An item stored at level
+    ``h`` stands for ``2**h`` stream items. When a level overflows it is
+    sorted and every other item (starting at a random offset) is promoted
+    to the next level, halving its size while keeping ranks unbiased.
+
+    Error guarantee:
+        For any query, the normalized rank error ``|rank_est - rank| / n``
+        is below about ``2.3 / k**0.97`` with 99% probability (roughly 1.3%
+        for the default ``k=200``, 0.3% for ``k=1000``). This matches the
+        empirical bound published for the reference KLL implementation.
+        Memory is ``O(k + log2(n / k))`` stored values independent of ``n``.
+
+    Sketches built with the same ``k`` can be merged, so partial sketches
+    from several workers or data shards can be combined without loss of
+    the guarantee.
+
+    Attributes:
+        k: Accuracy parameter (capacity of the top compactor level).
+        n: Number of items summarised so far.
+
+    Example:
+        >>> sketch = KLLSketch(k=200, seed=0)
+        >>> sketch.update(np.arange(10_000, dtype=float))
+        >>> abs(sketch.quantile(0.5) - 5000) < 200
+        True
+    """
+
+    def __init__(self, k: int = 200, seed: int | None = None) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            k: Accuracy parameter; larger values use more memory and give
+                smaller rank error (default: 200).
+            seed: Random seed for the compaction offsets.
+
+        Raises:
+            ValueError: If k is less than 8.
+        """
+        if k < _MIN_K:
+            raise ValueError(f"k must be at least {_MIN_K}, got {k}.")
+        self.k = k
+        self.n = 0
+        self._levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def num_retained(self) -> int:
+        """Number of values currently stored in the sketch."""
+        return sum(level.size for level in self._levels)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - 1 - level
+        return max(_MIN_LEVEL_CAPACITY, math.ceil(self.k * _CAPACITY_DECAY**depth))
+
+    def _compact(self) -> None:
+        """Compact overflowing levels until every level fits its capacity."""
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size <= self._capacity(level):
+                level += 1
+                continue
+            items = np.sort(items)
+            # An odd item stays behind so the total weight is preserved.
+            keep = items[-1:] if items.size % 2 else items[:0]
+            paired = items[: items.size - keep.size]
+            offset = int(self._rng.integers(0, 2))
+            promoted = paired[offset::2]
+            self._levels[level] = keep
+            if level + 1 == len(self._levels):
+                self._levels.append(promoted)
+            else:
+                self._levels[level + 1] = np.concatenate(
+                    [self._levels[level + 1], promoted]
+                )
+            # Adding a level shrinks the capacities below it, so restart.
+            level = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of values to the sketch.
+
+        Args:
+            values: Array of values; it is flattened and NaNs are ignored.
+        """
+        values = np.ravel(np.asarray(values, dtype=np.float64))
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.n += values.size
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compact()
+
+    def merge(self, other: "KLLSketch") -> None:
+        """Merge another sketch into this one in place.
+
+        Args:
+            other: Sketch built with the same k.
+
+        Raises:
+            ValueError: If the sketches use different k.
+        """
+        if other.k != self.k:
+            raise ValueError(
+                f"Cannot merge sketches with different k ({self.k} and {other.k})."
+            )
+        for level, items in enumerate(other._levels):
+            if level == len(self._levels):
+                self._levels.append(items.copy())
+            else:
+                self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self._compact()
+
+    def _weighted_items(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return retained values sorted, with cumulative weights."""
+        values = np.concatenate(self._levels)
+        weights = np.concatenate(
+            [
+                np.full(items.size, 2.0**level)
+                for level, items in enumerate(self._levels)
+            ]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantiles(self, qs: np.ndarray | list[float]) -> np.ndarray:
+        """Estimate several quantiles at once.
+
+        Args:
+            qs: Quantile levels in [0, 1].
+
+        Returns:
+            Array of estimated quantile values, one per level.
+
+        Raises:
+            ValueError: If the sketch is empty or a level is outside [0, 1].
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            raise ValueError("Cannot query quantiles of an empty sketch.")
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantile levels must be in [0, 1].")
+        values, cumulative = self._weighted_items()
+        targets = qs * cumulative[-1]
+        idx = np.searchsorted(cumulative, targets, side="left")
+        return values[np.minimum(idx, values.size - 1)]
+
+    def quantile(self, q: float) -> float:
+        """Estimate a single quantile.
+
+        Args:
+            q: Quantile level in [0, 1].
+
+        Returns:
+            The estimated quantile value.
+        """
+        return float(self.quantiles([q])[0])
+
+    def rank(self, value: float) -> float:
+        """Estimate the fraction of stream items less than or equal to value.
+
+        Args:
+            value: Query value.
+
+        Returns:
+            Normalized rank in [0, 1].
+
+        Raises:
+            ValueError: If the sketch is empty.
+        """
+        if self.n == 0:
+            raise ValueError("Cannot query the rank in an empty sketch.")
+        values, cumulative = self._weighted_items()
+        idx = np.searchsorted(values, value, side="right")
+        if idx == 0:
+            return 0.0
+        return float(cumulative[idx - 1] / cumulative[-1])
@@ -0,0 +1,234 @@
+"""Parameter sweeps over run_experiment.
+
+A sweep file names a base config and the parameters to vary:
+
+  # configs/sweep_sample.yaml
+  base: sample.yaml         # relative to the sweep file
+  method: grid              # grid | random
+  parameters:
+    noise_std: [0.2, 0.8]   # dotted keys such as model.lr are allowed
+    seed: [0, 1, 2]
+
+For ``method: random``, ``n_trials`` points are drawn (reproducibly with
+``seed``). A list is a uniform choice and a mapping is a distribution:
+``{distribution: uniform | log_uniform | int_uniform, low: ..., high: ...}``.
+
+Points run on a ProcessPoolExecutor whose workers stay alive for the
+whole sweep, so interpreter, NumPy and YAML startup is paid once per
+worker instead of once per run.
+"""
+
+import copy
+import itertools
+import math
+import multiprocessing
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from pydantic import BaseModel
+
+from ai_research_template.config import ExperimentConfig, load_config, set_dotted
+from ai_research_template.experiment import run_experiment
+from ai_research_template.utils import new_run_id
+
+# Batches per worker handed out by executor.map; a few batches per worker
+# amortize IPC while keeping the load balanced.
+_BATCHES_PER_WORKER = 4
+
+
+def grid_points(parameters: dict[str, list[Any]]) -> list[dict[str, Any]]:
+    """Expand a grid into the list of all parameter combinations.
+
+    Args:
+        parameters: Values to try for each dotted key.
+
+    Returns:
+        One dict per point, in row-major order (the last key varies
+        fastest).
+
+    Raises:
+        ValueError: If a parameter's values are not a non-empty list.
+    """
+    for key, values in parameters.items():
+        if not isinstance(values, list) or not values:
+            raise ValueError(f"Grid values for {key!r} must be a non-empty list.")
+    keys = list(parameters)
+    return [
+        dict(zip(keys, combination, strict=True))
+        for combination in itertools.product(*parameters.values())
+    ]
+
+
+def _sampler(key: str, spec: Any) -> Callable[[np.random.Generator], Any]:
+    if isinstance(spec, list):
+        if not spec:
+            raise ValueError(f"Choices for {key!r} must not be empty.")
+        return lambda rng: spec[int(rng.integers(len(spec)))]
+    if not isinstance(spec, dict):
+        raise ValueError(f"Random parameter {key!r} must be a list or a mapping.")
+    distribution = spec.get("distribution", "uniform")
+    low, high = spec["low"], spec["high"]
+    if distribution == "uniform":
+        return lambda rng: float(rng.uniform(low, high))
+    if distribution == "log_uniform":
+        return lambda rng: float(math.exp(rng.uniform(math.log(low), math.log(high))))
+    if distribution == "int_uniform":
+        return lambda rng: int(rng.integers(low, high, endpoint=True))
+    raise ValueError(f"Unknown distribution {distribution!r} for {key!r}.")
+
+
+def random_points(
+    parameters: dict[str, Any], n_trials: int, seed: int | None = None
+) -> list[dict[str, Any]]:
+    """Draw random search points.
+
+    Args:
+        parameters: Choice list or distribution mapping for each dotted key.
+        n_trials: Number of points to draw.
+        seed: Random seed.
+
+    Returns:
+        One dict per point.
+
+    Raises:
+        ValueError: If a parameter spec is invalid.
+    """
+    samplers = {key: _sampler(key, spec) for key, spec in parameters.items()}
+    rng = np.random.default_rng(seed)
+    return [
+        {key: sample(rng) for key, sample in samplers.items()} for _ in range(n_trials)
+    ]
+
+
+def load_sweep(sweep_path: Path | str) -> tuple[Path, list[dict[str, Any]]]:
+    """Read a sweep file and expand its points.
+
+    Args:
+        sweep_path: Sweep YAML file (see the module docstring).
+
+    Returns:
+        Tuple of (base config path, points).
+
+    Raises:
+        ValueError: If the method is unknown or a parameter spec is invalid.
+    """
+    sweep_path = Path(sweep_path)
+    spec = load_config(sweep_path)
+    base_path = sweep_path.parent / spec["base"]
+    method = spec.get("method", "grid")
+    if method == "grid":
+        points = grid_points(spec["parameters"])
+    elif method == "random":
+        points = random_points(spec["parameters"], spec["n_trials"], spec.get("seed"))
+    else:
+        raise ValueError(f"Unknown sweep method {method!r}; use grid or random.")
+    return base_path, points
+
+
+def point_configs(
+    base_path: Path | str,
+    points: list[dict[str, Any]],
+    schema: type[BaseModel] = ExperimentConfig,
+) -> list[dict[str, Any]]:
+    """Build and validate the full config of every point.
+
+    The base file is parsed once; invalid points fail here, before any
+    worker is started.
+
+    Args:
+        base_path: Base config file.
+        points: Dotted-key values per point.
+        schema: Pydantic model to validate each config against.
+
+    Returns:
+        Validated configs, one per point.
+    """
+    base = load_config(base_path)
+    configs = []
+    for point in points:
+        config = copy.deepcopy(base)
+        for key, value in point.items():
+            set_dotted(config, key, value)
+        configs.append(schema.model_validate(config).model_dump())
+    return configs
+
+
+def _run_point(
+    config: dict[str, Any], config_path: str, timestamp: str, force: bool
+) -> tuple[Path, bool]:
+    return run_experiment(
+        config,
+        config_path=config_path,
+        timestamp=timestamp,
+        force=force,
+        console=False,
+    )
+
+
+def sweep_executor(max_workers: int | None = None) -> ProcessPoolExecutor:
+    """Return a process pool for run_sweep.
+
+    Reusing one pool across several run_sweep calls (e.g. the rungs of an
+    adaptive search) keeps its workers warm.
+
+    Args:
+        max_workers: Number of worker processes (default: CPU count).
+
+    Returns:
+        A ProcessPoolExecutor; use it as a context manager.
+    """
+    # Spawned workers do not inherit threads or locks from the parent.
+    return ProcessPoolExecutor(
+        max_workers or os.cpu_count() or 1,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def run_sweep(
+    configs: list[dict[str, Any]],
+    config_path: Path | str,
+    *,
+    max_workers: int | None = None,
+    force: bool = False,
+    executor: Executor | None = None,
+) -> Iterator[tuple[Path, bool]]:
+    """Run experiment configs in parallel.
+
+    Every point gets its own ``outputs/<experiment>/<run_id>`` run
+    directory, named by the sweep's run ID (see utils.new_run_id) plus
+    the point index. Points already computed with the same config and code are reused
+    (see run_cache) unless force is set.
+
+    Args:
+        configs: Validated configs, e.g. from point_configs.
+        config_path: Base config file, recorded in each run's report request.
+        max_workers: Number of worker processes (default: CPU count).
+        force: Rerun points that already have results.
+        executor: Pool to run on, e.g. from sweep_executor (default: a new
+            pool for this sweep).
+
+    Yields:
+        (run directory, reused) for each point, in input order.
+    """
+    if not configs:
+        return
+    max_workers = min(max_workers or os.cpu_count() or 1, len(configs))
+    sweep_id = new_run_id()
+    width = len(str(len(configs) - 1))
+    timestamps = [f"{sweep_id}_{i:0{width}d}" for i in range(len(configs))]
+    chunksize = max(1, len(configs) // (max_workers * _BATCHES_PER_WORKER))
+    args = (
+        configs,
+        itertools.repeat(str(config_path)),
+        timestamps,
+        itertools.repeat(force),
+    )
+    if executor is not None:
+        yield from executor.map(_run_point, *args, chunksize=chunksize)
+        return
+    with sweep_executor(max_workers) as pool:
+        yield from pool.map(_run_point, *args, chunksize=chunksize)
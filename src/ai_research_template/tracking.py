@@ -0,0 +1,255 @@
+"""Structured per-step metrics logging.
+
+During a run, MetricsLogger appends one JSON object per step to
+``<output_dir>/logs/metrics.jsonl``:
+
+  {"step": 0, "time": 1769300000.12, "loss": 0.93, "mse": 1.2}
+  {"step": 1, "time": 1769300000.15, "loss": 0.71}
+
+Lines are buffered in memory and written in batches, and the file is
+fsynced periodically, so logging every step stays cheap while a crash
+loses at most the last few seconds. ``load_metric_series`` reads one
+metric across many runs without touching the free-text logs.
+"""
+
+import json
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import TYPE_CHECKING, Any
+
+# NumPy, pandas and pyarrow are only needed to read logs back, so they are
+# imported there; training scripts that only log start faster.
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+METRICS_LOG_NAME = "metrics.jsonl"
+DEFAULT_BUFFER_SIZE = 256
+DEFAULT_FSYNC_INTERVAL = 30.0
+
+_RESERVED_KEYS = {"step", "time"}
+
+
+def metrics_log_path(output_dir: Path | str) -> Path:
+    """Return the metrics log location for a run directory."""
+    return Path(output_dir) / "logs" / METRICS_LOG_NAME
+
+
+class MetricsLogger:
+    """Buffered JSONL writer for per-step metrics.
+
+    Attributes:
+        path: Location of the JSONL file.
+
+    Example:
+        >>> with MetricsLogger(output_dir) as metrics_log:
+        ...     for step in range(n_steps):
+        ...         metrics_log.log(step, loss=loss)
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        *,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        fsync_interval: float = DEFAULT_FSYNC_INTERVAL,
+    ) -> None:
+        """Open the metrics log of a run for appending.
+
+        Args:
+            output_dir: Run directory (see utils.prepare_output_dir).
+            buffer_size: Number of records kept in memory before they are
+                written to the file (default: 256).
+            fsync_interval: Seconds between fsync calls (default: 30). Once
+                the interval has elapsed, the next log call flushes and
+                fsyncs even if the buffer is not full, so slow runs are
+                persisted too. Use 0 to fsync on every log call.
+        """
+        self.path = metrics_log_path(output_dir)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._buffer: list[str] = []
+        self._buffer_size = buffer_size
+        self._fsync_interval = fsync_interval
+        self._last_fsync = time.monotonic()
+
+    def log(self, step: int, **metrics: float) -> None:
+        """Record metric values for one step.
+
+        Args:
+            step: Training step or iteration number.
+            **metrics: Metric values by name; NumPy scalars are accepted.
+
+        Raises:
+            ValueError: If a metric is named "step" or "time".
+        """
+        reserved = _RESERVED_KEYS.intersection(metrics)
+        if reserved:
+            raise ValueError(f"Metric names {sorted(reserved)} are reserved.")
+        record = {"step": int(step), "time": time.time()}
+        record.update((name, float(value)) for name, value in metrics.items())
+        self._buffer.append(json.dumps(record) + "\n")
+        if (
+            len(self._buffer) >= self._buffer_size
+            or time.monotonic() - self._last_fsync >= self._fsync_interval
+        ):
+            self.flush()
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write buffered records to the file.
+
+        Args:
+            fsync: Force an fsync even if the interval has not elapsed.
+        """
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        now = time.monotonic()
+        if fsync or now - self._last_fsync >= self._fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+
+    def close(self) -> None:
+        """Flush, fsync and close the file."""
+        if self._file.closed:
+            return
+        self.flush(fsync=True)
+        self._file.close()
+
+    def __enter__(self) -> "MetricsLogger":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def read_metrics_log(path: Path | str) -> list[dict[str, Any]]:
+    """Read every record of one metrics log.
+
+    A partially written last line (e.g. after a crash) is skipped.
+
+    Args:
+        path: JSONL file written by MetricsLogger.
+
+    Returns:
+        Records in file order.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def _read_series_python(path: Path, metric: str) -> "tuple[np.ndarray, np.ndarray]":
+    """Line-by-line fallback for logs Arrow cannot parse (NaN, torn lines)."""
+    import numpy as np  # noqa: PLC0415
+
+    # Cheap substring test first, so lines without the metric are not parsed.
+    needle = f'"{metric}":'
+    steps: list[int] = []
+    values: list[float] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if needle not in line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if metric in record:
+                steps.append(record["step"])
+                values.append(record[metric])
+    return np.asarray(steps, dtype=np.int64), np.asarray(values, dtype=np.float64)
+
+
+def _read_series(path: Path, metric: str) -> "tuple[np.ndarray, np.ndarray]":
+    """Extract (steps, values) of one metric from a metrics log.
+
+    Arrow's multi-threaded JSON reader is about 3x faster than json.loads
+    per line. It rejects non-standard tokens such as NaN and partially
+    written lines, in which case the pure-Python reader is used instead.
+    """
+    import numpy as np  # noqa: PLC0415
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.json as pa_json  # noqa: PLC0415
+
+    try:
+        table = pa_json.read_json(path)
+    except pa.ArrowInvalid:
+        return _read_series_python(path, metric)
+    if metric not in table.column_names:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    table = table.filter(table[metric].is_valid())
+    return (
+        table["step"].to_numpy().astype(np.int64, copy=False),
+        table[metric].cast(pa.float64()).to_numpy(),
+    )
+
+
+def load_metric_series(
+    metric: str,
+    runs: Iterable[Path | str] | None = None,
+    output_root: Path | str = Path("outputs"),
+) -> "pd.DataFrame":
+    """Load one metric's per-step series across many runs.
+
+    Args:
+        metric: Metric name as passed to MetricsLogger.log.
+        runs: Run directories to read. If None, every run under output_root
+            that has a metrics log is used (``latest`` symlinks are skipped).
+        output_root: Root searched when runs is None.
+
+    Returns:
+        Long-format DataFrame with columns ``run``, ``step`` and ``value``,
+        sorted by run and step. Runs that never logged the metric are
+        omitted.
+
+    Example:
+        >>> loss = load_metric_series("loss")
+        >>> loss.pivot(index="step", columns="run", values="value")
+    """
+    import pandas as pd  # noqa: PLC0415
+
+    if runs is None:
+        paths = sorted(
+            path
+            for path in Path(output_root).glob(f"*/*/logs/{METRICS_LOG_NAME}")
+            if not path.parent.parent.is_symlink()
+        )
+    else:
+        paths = [metrics_log_path(run) for run in runs]
+
+    frames = []
+    for path in paths:
+        if not path.exists():
+            continue
+        steps, values = _read_series(path, metric)
+        if steps.size:
+            frames.append(
+                pd.DataFrame(
+                    {"run": str(path.parent.parent), "step": steps, "value": values}
+                )
+            )
+    if not frames:
+        return pd.DataFrame(
+            {
+                "run": pd.Series(dtype="object"),
+                "step": pd.Series(dtype="int64"),
+                "value": pd.Series(dtype="float64"),
+            }
+        )
+    series = pd.concat(frames, ignore_index=True)
+    return series.sort_values(["run", "step"], kind="stable", ignore_index=True)
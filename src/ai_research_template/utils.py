@@ -1,20 +1,70 @@
 """Utility functions for experiment management.
 
 This module provides helper functions for:
-- Configuration loading (YAML files)
+- Configuration loading (YAML files, see the config module)
 - Logging setup (file and console output)
-- Result saving (JSON format)
-- Experiment summary tracking (CSV format)
+- Per-stage timing and memory instrumentation (StageTimer)
+- Result saving (atomic JSON writes, NumPy arrays as sidecar .npy files)
+- Experiment summary tracking (append-only CSV with a side schema file,
+  mirrored into a SQLite index)
 """
 
+import atexit
 import csv
+import fcntl
+import functools
+import io
 import json
 import logging
-from datetime import datetime
+import os
+import queue
+import re
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, TypeVar, cast
 
-import yaml
+if TYPE_CHECKING:
+    import logging.handlers
+
+# NumPy, the config module (yaml, pydantic) and orjson are imported on
+# first use, so light scripts such as daily_report.py start quickly.
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def __getattr__(name: str) -> Any:
+    # load_config lived here before the config module; keep the import path.
+    if name == "load_config":
+        from ai_research_template.config import load_config  # noqa: PLC0415
+
+        return load_config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@functools.cache
+def _orjson() -> Any | None:
+    """Return the orjson module, or None if it is not installed."""
+    try:
+        import orjson  # noqa: PLC0415
+    except ImportError:
+        return None
+    return orjson
+
+
+def _loaded_numpy() -> Any | None:
+    """Return NumPy if it is already imported, else None.
+
+    Objects can only hold NumPy values once NumPy is imported, so the JSON
+    helpers use this instead of importing it themselves.
+    """
+    return sys.modules.get("numpy")
 
 
 def current_timestamp() -> str:
@@ -22,21 +72,74 @@ def current_timestamp() -> str:
     return datetime.now().strftime("%Y-%m-%d_%H%M%S")
 
 
+_RUN_ID_LOCK = threading.Lock()
+_last_run_time: datetime | None = None
+
+
+def new_run_id() -> str:
+    """Return a unique, time-sortable run ID.
+
+    The ID is the second-resolution timestamp followed by microseconds and
+    a random suffix, e.g. ``2026-01-25_120000_123456-3fa2``. Within one
+    process the time part is monotonic: an ID requested in the same
+    microsecond as (or, after a clock step, earlier than) the previous one
+    gets the previous time plus one microsecond, so IDs from a process
+    are distinct and sort in creation order. The random suffix separates
+    runs that different processes start in the same microsecond.
+    """
+    global _last_run_time  # noqa: PLW0603
+    with _RUN_ID_LOCK:
+        now = datetime.now()
+        if _last_run_time is not None and now <= _last_run_time:
+            now = _last_run_time + timedelta(microseconds=1)
+        _last_run_time = now
+    return f"{now:%Y-%m-%d_%H%M%S_%f}-{os.urandom(2).hex()}"
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock for a shared file.
+
+    The lock lives on a sidecar ``<name>.lock`` file so the protected file
+    itself can be replaced atomically. Keep the locked section short: only
+    the final read-modify-append should run under it.
+
+    Args:
+        path: The shared file to protect.
+
+    Example:
+        >>> with file_lock(Path("outputs/experiments.csv")):
+        ...     pass
+    """
+    lock_path = path.with_name(f"{path.name}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
 def update_latest_symlink(latest_link: Path, target_dir: Path) -> None:
     """Update a symlink to point at the latest experiment output.
 
+    The new link is created under a temporary name and renamed over the
+    old one, so readers always see a valid link.
+
     Errors are ignored to keep the experiment flow robust on systems
     that don't support symlinks.
     """
+    tmp_link = latest_link.with_name(
+        f".{latest_link.name}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
+    )
     try:
-        if latest_link.exists() or latest_link.is_symlink():
-            latest_link.unlink()
-        latest_link.symlink_to(
-            target_dir.relative_to(latest_link.parent), target_is_directory=True
-        )
+        target = target_dir.relative_to(latest_link.parent)
+        tmp_link.symlink_to(target, target_is_directory=True)
+        os.replace(tmp_link, latest_link)
     except Exception:
         # Fallback if symlink fails or filesystem doesn't support it.
-        pass
+        tmp_link.unlink(missing_ok=True)
 
 
 def prepare_output_dir(
@@ -48,18 +151,40 @@ def prepare_output_dir(
     """Create a standardized output directory for an experiment.
 
     Layout:
-      outputs/<experiment_name>/<timestamp>/
+      outputs/<experiment_name>/<run_id>/
         logs/
         artifacts/
         metrics.json
         params.json
         report.md
+
+    Without an explicit timestamp the directory is named by new_run_id and
+    created exclusively, so concurrent launches never share a directory.
+
+    Args:
+        experiment_name: Experiment directory under output_root.
+        output_root: Root of all outputs (default: outputs).
+        timestamp: Explicit run directory name. An existing directory with
+            this name is reused.
+        update_latest: Point the ``latest`` links at the new run.
+
+    Returns:
+        The run directory.
     """
     output_root_path = Path(output_root)
     exp_root = output_root_path / experiment_name
-    ts = timestamp or current_timestamp()
-    output_dir = exp_root / ts
-    output_dir.mkdir(parents=True, exist_ok=True)
+    exp_root.mkdir(parents=True, exist_ok=True)
+    if timestamp is not None:
+        output_dir = exp_root / timestamp
+        output_dir.mkdir(exist_ok=True)
+    else:
+        while True:
+            output_dir = exp_root / new_run_id()
+            try:
+                output_dir.mkdir()
+                break
+            except FileExistsError:
+                continue
     (output_dir / "logs").mkdir(exist_ok=True)
     (output_dir / "artifacts").mkdir(exist_ok=True)
 
@@ -70,16 +195,89 @@ def prepare_output_dir(
     return output_dir
 
 
-def setup_logger(output_dir: Path, name: str = "experiment") -> logging.Logger:
+@functools.cache
+def _deferred_queue_handler() -> "type[logging.handlers.QueueHandler]":
+    """Return a QueueHandler that leaves formatting to the listener thread.
+
+    The stock QueueHandler formats each record in the calling thread. Here
+    the record is enqueued as is, so the caller only pays for creating the
+    record and a queue put. Log arguments must therefore not be mutated
+    after the call (the repo's f-string messages are already final).
+
+    The class is built on first use because logging.handlers (and the
+    socket module it imports) is only needed for async logging.
+    """
+    from logging.handlers import QueueHandler  # noqa: PLC0415
+
+    class _DeferredQueueHandler(QueueHandler):
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            return record
+
+    return _DeferredQueueHandler
+
+
+# Background listeners of async loggers, keyed by logger name.
+_LOG_LISTENERS: "dict[str, logging.handlers.QueueListener]" = {}
+
+# Records buffered in memory before the file handler writes them out.
+LOG_BUFFER_CAPACITY = 1024
+
+
+def close_logger(name: str = "experiment") -> None:
+    """Flush and detach all handlers of a logger set up by setup_logger.
+
+    For async loggers this drains the queue and stops the background
+    thread. It is registered with atexit, so pending records are always
+    written when the process exits normally.
+
+    Args:
+        name: Name of the logger (default: "experiment").
+    """
+    logger = logging.getLogger(name)
+    listener = _LOG_LISTENERS.pop(name, None)
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            target = getattr(handler, "target", None)
+            handler.close()  # A MemoryHandler flushes into its target here
+            if target is not None:
+                target.close()
+    for handler in logger.handlers:
+        handler.close()
+    logger.handlers = []
+
+
+def _close_all_loggers() -> None:
+    for name in list(_LOG_LISTENERS):
+        close_logger(name)
+
+
+atexit.register(_close_all_loggers)
+
+
+def setup_logger(
+    output_dir: Path,
+    name: str = "experiment",
+    async_logging: bool = False,
+    console: bool = True,
+) -> logging.Logger:
     """Set up a logger that writes to both file and console.
 
     Creates a logger with two handlers:
     - File handler: writes detailed logs to {output_dir}/logs/experiment.log
     - Console handler: writes simplified messages to stdout
 
+    With ``async_logging=True`` the logger only enqueues records. A
+    QueueListener thread formats them and performs the I/O, and file writes
+    are batched through a MemoryHandler (flushed every LOG_BUFFER_CAPACITY
+    records, on ERROR, and at close). Use this in hot training loops; call
+    close_logger (or just exit) to flush.
+
     Args:
         output_dir: Directory where the log file will be created.
         name: Name of the logger (default: "experiment").
+        async_logging: Move formatting and I/O to a background thread.
+        console: Also write messages to the console (default: True).
 
     Returns:
         Configured logger instance.
@@ -88,9 +286,9 @@ def setup_logger(output_dir: Path, name: str = "experiment") -> logging.Logger:
         >>> logger = setup_logger(Path("outputs/exp1"))
         >>> logger.info("Starting experiment")
     """
+    close_logger(name)  # Flush and clear handlers from a previous setup
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    logger.handlers = []  # Clear existing handlers
 
     log_dir = output_dir / "logs"
     log_dir.mkdir(exist_ok=True)
@@ -100,131 +298,545 @@ def setup_logger(output_dir: Path, name: str = "experiment") -> logging.Logger:
     fh.setFormatter(
         logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
-    logger.addHandler(fh)
+
+    handlers: list[logging.Handler] = [fh]
 
     # Console handler with simple format
-    ch = logging.StreamHandler()
-    ch.setFormatter(logging.Formatter("%(message)s"))
-    logger.addHandler(ch)
+    if console:
+        ch = logging.StreamHandler()
+        ch.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(ch)
 
+    if not async_logging:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    from logging.handlers import MemoryHandler, QueueListener  # noqa: PLC0415
+
+    handlers[0] = MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.ERROR, target=fh
+    )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _LOG_LISTENERS[name] = listener
+    logger.addHandler(_deferred_queue_handler()(log_queue))
     return logger
 
 
-def update_experiment_summary(results: dict[str, Any], output_dir: Path) -> None:
-    """Update the global experiment summary CSV file.
+def _peak_rss_mb() -> float:
+    """Return the process's peak resident set size in MiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB on Linux.
+    return max_rss / (1024**2 if sys.platform == "darwin" else 1024)
+
+
+class StageTimer:
+    """Record wall time, CPU time and memory per pipeline stage.
+
+    Each stage records ``wall_s`` (perf_counter), ``cpu_s`` (process CPU
+    time, all threads) and ``peak_rss_mb``, the process's peak resident
+    set size so far (getrusage; it never decreases, so a jump shows the
+    stage that raised it). With ``trace_memory=True``, ``py_peak_mb`` is
+    also recorded: the peak of Python-allocated memory (tracemalloc,
+    including NumPy buffers) during the stage itself. Tracing slows
+    allocation-heavy code down noticeably, so it is off by default.
+
+    Entering a stage name again adds to its times. Stages may be nested;
+    an enclosing stage's ``py_peak_mb`` includes the peaks of the stages
+    inside it.
+
+    Example:
+        >>> timer = StageTimer()
+        >>> with timer.stage("fit"):
+        ...     model.fit(x, y)
+        >>> @timer.timed("evaluate")
+        ... def evaluate(): ...
+        >>> results["timings"] = timer.as_dict()
+    """
+
+    def __init__(self, *, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._stages: dict[str, dict[str, float]] = {}
+        # Peak bytes of each open traced stage that tracemalloc no longer
+        # holds because a nested stage reset it.
+        self._open_peaks: list[int] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name``."""
+        tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            if self._open_peaks:
+                self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+            tracemalloc.reset_peak()
+        if self.trace_memory:
+            self._open_peaks.append(0)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = self._stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+            record["wall_s"] += time.perf_counter() - wall_start
+            record["cpu_s"] += time.process_time() - cpu_start
+            record["peak_rss_mb"] = _peak_rss_mb()
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                peak = max(peak, self._open_peaks.pop())
+                record["py_peak_mb"] = max(
+                    record.get("py_peak_mb", 0.0), peak / 1024**2
+                )
+                if self._open_peaks:
+                    self._open_peaks[-1] = max(self._open_peaks[-1], peak)
+                if tracing:
+                    tracemalloc.stop()
+
+    def timed(self, name: str | None = None) -> Callable[[_F], _F]:
+        """Decorate a function so every call is timed as a stage.
+
+        Args:
+            name: Stage name (default: the function's name).
+        """
+
+        def decorator(func: _F) -> _F:
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+
+            return cast(_F, wrapper)
+
+        return decorator
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return the recorded stages, in the order they first ran."""
+        return {name: dict(record) for name, record in self._stages.items()}
+
+    def total(self, field: str = "wall_s") -> float:
+        """Return the sum of one field over all stages."""
+        return sum(record[field] for record in self._stages.values())
+
+
+SUMMARY_PATH = Path("outputs/experiments.csv")
+
+
+def summary_schema_path(summary_path: Path) -> Path:
+    """Return the side schema file that records the summary's columns."""
+    return summary_path.with_suffix(".schema.json")
+
+
+def flatten_results(results: dict[str, Any], output_dir: Path) -> dict[str, Any]:
+    """Flatten experiment results into one summary row.
 
-    Appends a new row to experiments.csv with flattened results.
     Keys are prefixed to indicate their source:
     - param_*: Configuration parameters
     - metric_*: Evaluation metrics
     - model_*: Model parameters
+    - time_<stage>_*: Stage timings (see StageTimer)
+
+    Only scalar values (int, float, str, bool) are kept.
 
     Args:
-        results: Dictionary containing 'config', 'metrics', and 'model_params' keys.
-        output_dir: Directory of the current experiment (used to derive CSV path).
+        results: Dictionary containing 'config', 'metrics', 'model_params' and
+            optionally 'timings' keys.
+        output_dir: Directory of the current experiment.
 
-    Note:
-        The CSV file is located at outputs/experiments.csv.
-        If the CSV already exists with different columns, new columns will be
-        added but existing rows may have empty values for new columns.
+    Returns:
+        Flat mapping from column name to value.
     """
-    summary_path = Path("outputs/experiments.csv")
-
-    # Flatten the results for CSV
     flat_results: dict[str, Any] = {}
 
     # Add timestamp and path
     flat_results["timestamp"] = output_dir.name
     flat_results["path"] = str(output_dir)
 
-    # Add config params (prefix with param_)
-    for key, value in results.get("config", {}).items():
-        if isinstance(value, (int, float, str, bool)):
-            flat_results[f"param_{key}"] = value
+    for section, prefix in (
+        ("config", "param"),
+        ("metrics", "metric"),
+        ("model_params", "model"),
+    ):
+        for key, value in results.get(section, {}).items():
+            if isinstance(value, (int, float, str, bool)):
+                flat_results[f"{prefix}_{key}"] = value
+    for stage, record in results.get("timings", {}).items():
+        for key, value in record.items():
+            flat_results[f"time_{stage}_{key}"] = value
+
+    return flat_results
 
-    # Add metrics (prefix with metric_)
-    for key, value in results.get("metrics", {}).items():
-        if isinstance(value, (int, float, str, bool)):
-            flat_results[f"metric_{key}"] = value
 
-    # Add model params (prefix with model_)
-    for key, value in results.get("model_params", {}).items():
-        if isinstance(value, (int, float, str, bool)):
-            flat_results[f"model_{key}"] = value
+def load_summary_columns(summary_path: Path) -> list[str]:
+    """Return the ordered column list of an experiment summary.
 
-    # Read existing headers if file exists
-    existing_headers: list[str] = []
+    The side schema file is authoritative. Summaries written before it
+    existed fall back to the CSV header line.
+    """
+    schema_path = summary_schema_path(summary_path)
+    if schema_path.exists():
+        with schema_path.open(encoding="utf-8") as f:
+            return list(json.load(f)["columns"])
     if summary_path.exists():
         with open(summary_path, newline="") as f:
-            reader = csv.reader(f)
-            existing_headers = next(reader, [])
+            return next(csv.reader(f), [])
+    return []
 
-    # Merge headers: existing + new columns
-    all_keys = set(existing_headers) | set(flat_results.keys())
-    fieldnames = sorted(all_keys)
 
-    # If file exists, read all rows and rewrite with updated headers
-    rows: list[dict[str, Any]] = []
-    if summary_path.exists() and existing_headers:
-        with open(summary_path, newline="") as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
+def _write_summary_schema(summary_path: Path, columns: list[str]) -> None:
+    """Atomically replace the schema file with the given columns."""
+    write_atomic(
+        summary_schema_path(summary_path),
+        json.dumps({"columns": columns}, indent=2).encode("utf-8"),
+    )
+
+
+def _rewrite_summary(summary_path: Path, columns: list[str]) -> None:
+    """Atomically rewrite the summary CSV with ``columns`` as its header.
+
+    Existing rows are padded with empty trailing fields; column positions
+    never move, so no other change is needed.
+    """
+    with open(summary_path, newline="") as src, atomic_open(summary_path) as f:
+        out = io.TextIOWrapper(f, encoding="utf-8", newline="")
+        reader = csv.reader(src)
+        next(reader, None)
+        writer = csv.writer(out)
+        writer.writerow(columns)
+        for row in reader:
+            writer.writerow(row + [""] * (len(columns) - len(row)))
+        out.flush()
+        out.detach()
+
+
+def update_experiment_summary(
+    results: dict[str, Any],
+    output_dir: Path,
+    summary_path: Path | str = SUMMARY_PATH,
+    index: bool = True,
+    history: bool = False,
+) -> None:
+    """Append one experiment to the global summary CSV and SQLite index.
+
+    The summary is append-only: each call writes exactly one row, so the
+    cost per run does not grow with the number of past experiments. Column
+    order is recorded in a side schema file (``experiments.schema.json``).
+    When a run introduces new columns they are appended to the end of the
+    schema and the CSV is rewritten once with the new header, so it stays
+    a single rectangular file that pandas can read directly. Column growth
+    is rare, so this O(N) rewrite is amortized over many O(1) appends.
+
+    The same row is also recorded in the SQLite experiment index next to the
+    CSV (``experiments.db``), which backs experiment_index.query_runs.
+
+    Concurrent calls from many processes are safe: the append (and any
+    schema change) runs under a short file_lock, and SQLite serialises the
+    index writes itself.
+
+    Args:
+        results: Dictionary containing 'config', 'metrics', and 'model_params' keys.
+        output_dir: Directory of the current experiment.
+        summary_path: Summary CSV location (default: outputs/experiments.csv).
+        index: Whether to record the run in the SQLite index (default: True).
+        history: Whether to also write a Parquet history fragment under
+            ``history/`` next to the CSV (default: False). See history.py.
+    """
+    append_summary_rows(
+        [flatten_results(results, output_dir)],
+        summary_path,
+        index=index,
+        history=history,
+    )
 
-    # Append new result
-    rows.append(flat_results)
 
-    # Write all rows with complete fieldnames
-    with open(summary_path, "w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-        writer.writeheader()
+def append_summary_rows(
+    rows: list[dict[str, Any]],
+    summary_path: Path | str = SUMMARY_PATH,
+    index: bool = True,
+    history: bool = False,
+) -> None:
+    """Append flat rows to the summary CSV and SQLite index in one batch.
+
+    This is the batched form of update_experiment_summary: the rows are
+    written under a single lock and indexed in a single transaction.
+
+    Args:
+        rows: Flat summary rows (see flatten_results); each needs a
+            unique "path".
+        summary_path: Summary CSV location (default: outputs/experiments.csv).
+        index: Whether to record the rows in the SQLite index.
+        history: Whether to also write Parquet history fragments.
+    """
+    summary_path = Path(summary_path)
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    keys = {key: None for row in rows for key in row}
+
+    with file_lock(summary_path):
+        columns = load_summary_columns(summary_path)
+        new_columns = sorted(key for key in keys if key not in columns)
+        if new_columns or not summary_schema_path(summary_path).exists():
+            columns += new_columns
+            _write_summary_schema(summary_path, columns)
+            if new_columns and summary_path.exists() and summary_path.stat().st_size:
+                _rewrite_summary(summary_path, columns)
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=columns, restval="")
+        if not summary_path.exists() or summary_path.stat().st_size == 0:
+            writer.writeheader()
         writer.writerows(rows)
+        with open(summary_path, "a", newline="") as f:
+            f.write(buffer.getvalue())
 
+    if index:
+        from ai_research_template.experiment_index import index_rows  # noqa: PLC0415
 
-def load_config(config_path: str | Path) -> dict[str, Any]:
-    """Load configuration from a YAML file.
+        index_rows(rows, summary_path.with_suffix(".db"), coerce=False)
+
+    if history:
+        # Imported lazily so runs without Parquet history skip pyarrow.
+        from ai_research_template.history import write_history_fragment  # noqa: PLC0415
+
+        for row in rows:
+            write_history_fragment(row, summary_path.parent / "history")
+
+
+def read_experiment_summary(
+    summary_path: Path | str = SUMMARY_PATH,
+) -> list[dict[str, str]]:
+    """Read all summary rows using the column list from the schema file.
 
     Args:
-        config_path: Path to the YAML configuration file.
+        summary_path: Summary CSV location (default: outputs/experiments.csv).
 
     Returns:
-        Dictionary containing the configuration parameters.
+        One dict per experiment; columns a row predates are empty strings.
+    """
+    summary_path = Path(summary_path)
+    if not summary_path.exists():
+        return []
+    columns = load_summary_columns(summary_path)
+    rows: list[dict[str, str]] = []
+    with open(summary_path, newline="") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        for row in reader:
+            padded = row + [""] * (len(columns) - len(row))
+            rows.append(dict(zip(columns, padded, strict=False)))
+    return rows
+
+
+def refresh_summary_header(summary_path: Path | str = SUMMARY_PATH) -> None:
+    """Rewrite the summary CSV so its header and rows match the schema.
+
+    append_summary_rows keeps the file rectangular on its own; this repairs
+    summaries whose header lags behind the schema, e.g. ones written by
+    earlier versions that only appended.
 
-    Raises:
-        FileNotFoundError: If the config file does not exist.
-        yaml.YAMLError: If the file contains invalid YAML.
+    Args:
+        summary_path: Summary CSV location (default: outputs/experiments.csv).
+    """
+    summary_path = Path(summary_path)
+    with file_lock(summary_path):
+        if summary_path.exists():
+            _rewrite_summary(summary_path, load_summary_columns(summary_path))
 
-    Example:
-        >>> config = load_config("configs/sample.yaml")
-        >>> config["n_samples"]
-        200
+
+@contextmanager
+def atomic_open(path: Path) -> Iterator[BinaryIO]:
+    """Open a file for binary writing that appears only once complete.
+
+    Data goes to a hidden temporary file in the same directory, which is
+    fsynced and renamed over ``path`` when the block exits normally. On an
+    exception (or if the process dies) the previous file is left intact.
+    The temporary name includes the process and thread ids, so concurrent
+    writers of the same path never share it; the last rename wins.
+
+    Args:
+        path: Final location of the file.
+
+    Yields:
+        Binary file object to write to.
     """
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Atomically replace ``path`` with ``data`` (see atomic_open)."""
+    with atomic_open(path) as f:
+        f.write(data)
+
+
+# Key marking a NumPy array stored in a sidecar .npy file.
+NDARRAY_KEY = "__ndarray__"
+
+# Memory-map modes accepted by np.load.
+MmapMode = Literal["r", "r+", "w+", "c"]
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.-]")
+
+
+def _externalize_arrays(
+    value: Any, array_dir: Path, key: str, np: Any, used: set[str]
+) -> Any:
+    """Replace NumPy arrays in a nested structure by sidecar file references.
+
+    ``used`` collects the sidecar names written so far, so keys that map
+    to the same file name (``a/b`` and ``a_b``) get distinct files.
+    """
+    if isinstance(value, dict):
+        return {
+            k: _externalize_arrays(
+                v, array_dir, f"{key}.{k}" if key else str(k), np, used
+            )
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        # Long lists of plain numbers are common (per-sample values), so
+        # only rebuild lists that contain something to convert.
+        if not any(isinstance(v, (dict, list, tuple, np.ndarray)) for v in value):
+            return value
+        return [
+            _externalize_arrays(v, array_dir, f"{key}.{i}", np, used)
+            for i, v in enumerate(value)
+        ]
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        stem = _UNSAFE_FILENAME_CHARS.sub("_", key)
+        name, suffix = stem, 1
+        while name in used:
+            name = f"{stem}-{suffix}"
+            suffix += 1
+        used.add(name)
+        array_dir.mkdir(parents=True, exist_ok=True)
+        array_path = array_dir / f"{name}.npy"
+        with atomic_open(array_path) as f:
+            np.save(f, value, allow_pickle=False)
+        return {
+            NDARRAY_KEY: str(array_path.relative_to(array_dir.parent.parent)),
+            "dtype": str(value.dtype),
+            "shape": list(value.shape),
+        }
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars and object arrays for the JSON encoders."""
+    np = _loaded_numpy()
+    if np is not None and isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_json(obj: Any, fast: bool) -> bytes:
+    """Serialize obj; the fast path is compact and uses orjson if installed."""
+    if not fast:
+        # indent makes json use its pure-Python encoder, so this is slower.
+        return json.dumps(obj, indent=4, default=_json_default).encode("utf-8")
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(obj, separators=(",", ":"), default=_json_default).encode("utf-8")
 
 
-def save_results(results: dict[str, Any], output_dir: Path) -> None:
+def _save_json(obj: dict[str, Any], output_dir: Path, name: str, fast: bool) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / name
+    # Sidecar arrays are written first, so the JSON never references
+    # a missing file.
+    np = _loaded_numpy()
+    if np is not None:
+        array_dir = output_dir / "artifacts" / path.stem
+        obj = _externalize_arrays(obj, array_dir, "", np, set())
+    write_atomic(path, _encode_json(obj, fast))
+
+
+def save_results(
+    results: dict[str, Any], output_dir: Path, *, fast: bool = False
+) -> None:
     """Save experiment results as a JSON file.
 
     Creates the output directory if it doesn't exist and saves
-    the results to metrics.json with pretty formatting.
+    the results to metrics.json with pretty formatting. The file is
+    written atomically, so readers never see a partially written file.
+
+    NumPy arrays anywhere in the results (e.g. per-sample predictions) are
+    saved as ``artifacts/metrics/<dotted.key>.npy`` (plus ``-N`` if two keys
+    map to the same file name) and replaced in the JSON
+    by ``{"__ndarray__": <path relative to output_dir>, "dtype", "shape"}``;
+    use load_results to restore them. NumPy scalars become plain numbers.
 
     Args:
         results: Dictionary containing experiment results.
         output_dir: Directory where metrics.json will be saved.
+        fast: Write compact JSON, using orjson when it is installed
+            (``uv add orjson``). Note that orjson writes NaN and infinity
+            as null.
 
     Example:
         >>> results = {"metrics": {"mse": 0.05}, "config": {"lr": 0.01}}
         >>> save_results(results, Path("outputs/exp1"))
     """
-    output_dir.mkdir(parents=True, exist_ok=True)
-    with open(output_dir / "metrics.json", "w") as f:
-        json.dump(results, f, indent=4)
+    _save_json(results, output_dir, "metrics.json", fast)
+
+
+def save_params(
+    params: dict[str, Any], output_dir: Path, *, fast: bool = False
+) -> None:
+    """Save experiment parameters as a JSON file (see save_results)."""
+    _save_json(params, output_dir, "params.json", fast)
 
 
-def save_params(params: dict[str, Any], output_dir: Path) -> None:
-    """Save experiment parameters as a JSON file."""
-    with open(output_dir / "params.json", "w") as f:
-        json.dump(params, f, indent=4)
+def _restore_arrays(value: Any, output_dir: Path, mmap_mode: MmapMode | None) -> Any:
+    if isinstance(value, dict):
+        if NDARRAY_KEY in value:
+            import numpy as np  # noqa: PLC0415
+
+            return np.load(
+                output_dir / value[NDARRAY_KEY],
+                mmap_mode=mmap_mode,
+                allow_pickle=False,
+            )
+        return {k: _restore_arrays(v, output_dir, mmap_mode) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore_arrays(v, output_dir, mmap_mode) for v in value]
+    return value
+
+
+def load_results(
+    output_dir: Path,
+    filename: str = "metrics.json",
+    mmap_mode: MmapMode | None = None,
+) -> dict[str, Any]:
+    """Load results saved by save_results (or save_params), with arrays.
+
+    Args:
+        output_dir: Run directory.
+        filename: "metrics.json" or "params.json".
+        mmap_mode: Passed to np.load; e.g. "r" memory-maps the sidecar
+            arrays instead of reading them.
+
+    Returns:
+        The saved dictionary with array references replaced by arrays.
+    """
+    with open(output_dir / filename, "rb") as f:
+        data = json.load(f)
+    return _restore_arrays(data, output_dir, mmap_mode)
 
 
 def write_report(lines: list[str], output_dir: Path) -> None:
@@ -287,16 +899,21 @@ def append_daily_log(entry_lines: list[str], log_date: str | None = None) -> Pat
 
     Returns:
         The path to the log file that was written.
+
+    Note:
+        Safe to call from concurrent processes; entries never interleave.
     """
     date_str = log_date or datetime.now().strftime("%Y-%m-%d")
     logs_dir = Path("docs/experiments")
     logs_dir.mkdir(parents=True, exist_ok=True)
     log_path = logs_dir / f"{date_str}.md"
 
-    if not log_path.exists():
-        log_path.write_text(f"# {date_str}\n\n", encoding="utf-8")
-
-    with log_path.open("a", encoding="utf-8") as f:
-        f.write("\n".join(entry_lines).rstrip() + "\n\n")
+    entry = "\n".join(entry_lines).rstrip() + "\n\n"
+    # The lock keeps the title check and the append of concurrent writers
+    # from interleaving within one daily log file.
+    with file_lock(log_path), log_path.open("a", encoding="utf-8") as f:
+        if f.tell() == 0:
+            f.write(f"# {date_str}\n\n")
+        f.write(entry)
 
     return log_path
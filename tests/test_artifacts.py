@@ -0,0 +1,109 @@
+"""Tests for the content-addressed artifact store."""
+
+import json
+
+import pytest
+
+from ai_research_template.artifacts import (
+    ArtifactStore,
+    list_artifacts,
+    load_artifact,
+    read_artifact_ref,
+    save_artifact,
+    store_size,
+)
+
+
+@pytest.fixture
+def artifact_file(temp_dir):
+    path = temp_dir / "model.bin"
+    path.write_bytes(b"weights " * 10_000)
+    return path
+
+
+class TestArtifactStore:
+    @pytest.mark.parametrize("compression", ["zstd", "gzip", "none"])
+    def test_round_trip(self, temp_dir, artifact_file, compression):
+        store = ArtifactStore(temp_dir / "store", compression=compression)
+
+        digest = store.put(artifact_file)
+
+        assert store.has(digest)
+        assert store.get_bytes(digest) == artifact_file.read_bytes()
+        restored = store.restore(digest, temp_dir / "restored.bin")
+        assert restored.read_bytes() == artifact_file.read_bytes()
+
+    def test_compresses_blobs(self, temp_dir, artifact_file):
+        store = ArtifactStore(temp_dir / "store")
+
+        store.put(artifact_file)
+
+        assert store_size(store) < artifact_file.stat().st_size / 10
+
+    def test_large_file_spanning_chunks(self, temp_dir):
+        data = bytes(range(256)) * 20_000  # ~5 MB, several read chunks
+        path = temp_dir / "large.bin"
+        path.write_bytes(data)
+        store = ArtifactStore(temp_dir / "store")
+
+        assert store.get_bytes(store.put(path)) == data
+
+    def test_identical_content_stored_once(self, temp_dir, artifact_file):
+        store = ArtifactStore(temp_dir / "store")
+        copy = temp_dir / "copy.bin"
+        copy.write_bytes(artifact_file.read_bytes())
+
+        first = store.put(artifact_file)
+        blobs = list((store.root / "objects").rglob("*.zst"))
+        mtime = blobs[0].stat().st_mtime_ns
+        second = store.put(copy)
+
+        assert first == second
+        assert list((store.root / "objects").rglob("*.zst")) == blobs
+        assert blobs[0].stat().st_mtime_ns == mtime
+
+    def test_put_bytes(self, temp_dir):
+        store = ArtifactStore(temp_dir / "store")
+
+        assert store.get_bytes(store.put_bytes(b"abc")) == b"abc"
+
+    def test_reads_blobs_written_with_other_codec(self, temp_dir, artifact_file):
+        digest = ArtifactStore(temp_dir / "store", compression="gzip").put(
+            artifact_file
+        )
+
+        store = ArtifactStore(temp_dir / "store")
+        assert store.get_bytes(digest) == artifact_file.read_bytes()
+
+    def test_missing_digest(self, temp_dir):
+        with pytest.raises(FileNotFoundError):
+            ArtifactStore(temp_dir / "store").get_bytes("0" * 64)
+
+    def test_unknown_compression(self, temp_dir):
+        with pytest.raises(ValueError, match="compression"):
+            ArtifactStore(temp_dir, compression="lz4")
+
+
+class TestRunArtifacts:
+    def test_runs_hold_only_references(self, temp_dir, artifact_file):
+        store = ArtifactStore(temp_dir / "store")
+        runs = [temp_dir / "exp" / f"run{i}" for i in range(5)]
+
+        for run in runs:
+            save_artifact(artifact_file, run, name="models/model.bin", store=store)
+
+        assert len(list((store.root / "objects").rglob("*.zst"))) == 1
+        for run in runs:
+            assert list_artifacts(run) == ["models/model.bin"]
+            ref_path = run / "artifacts" / "models" / "model.bin.ref.json"
+            assert json.loads(ref_path.read_text())["size"] == 80_000
+            assert load_artifact(run, "models/model.bin", store=store) == (
+                artifact_file.read_bytes()
+            )
+
+    def test_default_name_is_file_name(self, temp_dir, artifact_file):
+        store = ArtifactStore(temp_dir / "store")
+
+        digest = save_artifact(artifact_file, temp_dir / "run", store=store)
+
+        assert read_artifact_ref(temp_dir / "run", "model.bin")["sha256"] == digest
@@ -0,0 +1,160 @@
+"""Tests for the benchmark suite."""
+
+import inspect
+import subprocess
+import sys
+
+import pytest
+
+from ai_research_template import metrics
+from ai_research_template.benchmarks import (
+    BENCHMARKS,
+    compare_results,
+    history_files,
+    load_benchmark_run,
+    measure_import_time,
+    parse_importtime,
+    run_benchmarks,
+    save_history,
+    time_callable,
+)
+
+
+def test_time_callable_autoranges():
+    calls = []
+
+    timing = time_callable(lambda: calls.append(1), min_time=0.01, repeat=3)
+
+    assert timing["number"] > 1
+    assert timing["repeat"] == 3
+    assert 0 < timing["min_s"] <= timing["median_s"]
+    assert len(calls) >= 3 * timing["number"]
+
+
+def test_suite_covers_public_metric_functions():
+    public = {
+        f"metrics.{name}"
+        for name, func in inspect.getmembers(metrics, inspect.isfunction)
+        if name.startswith("compute_") and func.__module__ == metrics.__name__
+    }
+
+    assert public <= set(BENCHMARKS)
+
+
+def test_every_benchmark_runs():
+    results = run_benchmarks(quick=True, min_time=0.001, repeat=1)
+
+    assert len(results) == len(BENCHMARKS)
+    assert "utils.update_experiment_summary[10]" in results
+    assert all(timing["min_s"] > 0 for timing in results.values())
+
+
+def test_pattern_filters_benchmarks():
+    seen = []
+
+    results = run_benchmarks(
+        "^core\\.", quick=True, min_time=0.001, repeat=1, progress=seen.append
+    )
+
+    assert seen == list(results)
+    assert set(results) == {
+        "core.LinearModel.fit[1000]",
+        "core.LinearModel.predict[1000]",
+    }
+
+
+def test_history_round_trip(temp_dir):
+    results = {"a[1]": {"min_s": 1.0, "median_s": 1.0, "number": 1, "repeat": 1}}
+
+    path = save_history(results, temp_dir)
+
+    assert history_files(temp_dir) == [path]
+    record = load_benchmark_run(path)
+    assert record["results"] == results
+    assert {"timestamp", "commit", "python", "numpy"} <= set(record)
+
+
+class TestCompareResults:
+    def test_flags_regressions_beyond_threshold(self):
+        baseline = {
+            "a[1]": {"min_s": 1.0, "median_s": 1.0},
+            "b[1]": {"min_s": 1.0, "median_s": 1.0},
+            "old[1]": {"min_s": 1.0, "median_s": 1.0},
+        }
+        current = {
+            "a[1]": {"min_s": 1.5, "median_s": 1.1},
+            "b[1]": {"min_s": 1.1, "median_s": 3.0},
+            "new[1]": {"min_s": 1.0, "median_s": 1.0},
+        }
+
+        rows = compare_results(baseline, current, threshold=0.2)
+
+        assert [row["name"] for row in rows] == ["a[1]", "b[1]"]
+        assert rows[0]["ratio"] == pytest.approx(1.5)
+        assert [row["regressed"] for row in rows] == [True, False]
+
+    def test_median_stat(self):
+        rows = compare_results(
+            {"b[1]": {"min_s": 1.0, "median_s": 1.0}},
+            {"b[1]": {"min_s": 1.1, "median_s": 3.0}},
+            stat="median_s",
+        )
+
+        assert rows[0]["regressed"]
+
+
+IMPORTTIME_REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | site
+import time:       300 |        300 |     _json
+import time:       200 |        500 |   json.decoder
+import time:       100 |        600 | json
+"""
+
+
+def test_parse_importtime():
+    rows = parse_importtime(IMPORTTIME_REPORT)
+
+    assert [row["module"] for row in rows] == ["site", "_json", "json.decoder", "json"]
+    assert [row["depth"] for row in rows] == [0, 2, 1, 0]
+    assert rows[-1]["cumulative_s"] == pytest.approx(600e-6)
+    assert rows[1]["self_s"] == pytest.approx(300e-6)
+
+
+def test_measure_import_time_reports_module_imports_only():
+    timing = measure_import_time("json", repeat=2)
+
+    assert 0 < timing["min_s"] <= timing["median_s"]
+    heaviest = [module for module, _ in timing["heaviest"]]
+    assert 0 < len(heaviest) <= 5
+    assert "site" not in heaviest  # Imported at startup, not by json
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "ai_research_template",
+        "ai_research_template.utils",
+        "ai_research_template.tracking",
+    ],
+)
+def test_light_modules_skip_heavy_dependencies(module):
+    code = (
+        f"import sys, {module}; "
+        "print(sorted({'numpy', 'pandas', 'pyarrow', 'yaml'} & set(sys.modules)))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert completed.stdout.strip() == "[]"
+
+
+def test_package_attributes_load_on_access():
+    import ai_research_template as package
+    from ai_research_template.core import LinearModel
+
+    assert package.LinearModel is LinearModel
+    assert set(package.__all__) <= set(dir(package))
+    with pytest.raises(AttributeError):
+        package.missing_name  # noqa: B018
@@ -0,0 +1,164 @@
+"""Tests for configuration loading."""
+
+import os
+
+import pydantic
+import pytest
+import yaml
+
+from ai_research_template import config as config_module
+from ai_research_template.config import (
+    ExperimentConfig,
+    apply_overrides,
+    clear_config_cache,
+    config_hash,
+    load_config,
+    merge_configs,
+)
+
+
+@pytest.fixture(autouse=True)
+def _empty_cache():
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+def write_yaml(path, data):
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+@pytest.fixture
+def base_config(temp_dir):
+    return write_yaml(
+        temp_dir / "base.yaml",
+        {"n_samples": 100, "slope": 1.0, "intercept": 0.0, "noise_std": 0.5},
+    )
+
+
+class TestIncludes:
+    def test_including_file_wins(self, temp_dir, base_config):
+        child = write_yaml(
+            temp_dir / "child.yaml", {"include": "base.yaml", "noise_std": 2.0}
+        )
+
+        config = load_config(child)
+
+        assert config == {
+            "n_samples": 100,
+            "slope": 1.0,
+            "intercept": 0.0,
+            "noise_std": 2.0,
+        }
+
+    def test_nested_mappings_are_merged(self, temp_dir):
+        write_yaml(temp_dir / "a.yaml", {"model": {"lr": 0.1, "layers": [8]}})
+        write_yaml(temp_dir / "b.yaml", {"model": {"lr": 0.2}, "seed": 1})
+        child = write_yaml(
+            temp_dir / "c.yaml", {"include": ["a.yaml", "b.yaml"], "seed": 2}
+        )
+
+        assert load_config(child) == {"model": {"lr": 0.2, "layers": [8]}, "seed": 2}
+
+    def test_include_cycle(self, temp_dir):
+        write_yaml(temp_dir / "a.yaml", {"include": "b.yaml"})
+        write_yaml(temp_dir / "b.yaml", {"include": "a.yaml"})
+
+        with pytest.raises(ValueError, match="cycle"):
+            load_config(temp_dir / "a.yaml")
+
+
+class TestOverrides:
+    def test_values_parsed_as_yaml(self, base_config):
+        config = load_config(
+            base_config, ["noise_std=0.1", "model.layers=[64, 64]", "tag=baseline"]
+        )
+
+        assert config["noise_std"] == 0.1
+        assert config["model"] == {"layers": [64, 64]}
+        assert config["tag"] == "baseline"
+
+    @pytest.mark.parametrize("override", ["noise_std", "=1"])
+    def test_invalid_override(self, override):
+        with pytest.raises(ValueError, match="key=value"):
+            apply_overrides({}, [override])
+
+    def test_cannot_descend_into_scalar(self):
+        with pytest.raises(ValueError, match="not a mapping"):
+            apply_overrides({"model": 1}, ["model.lr=0.1"])
+
+
+class TestValidation:
+    def test_schema_coerces_and_fills_defaults(self, base_config):
+        config = load_config(base_config, ["n_samples='300'"], ExperimentConfig)
+
+        assert config["n_samples"] == 300
+        assert config["metrics"] == ["mse"]
+
+    def test_extra_keys_are_kept(self, base_config):
+        config = load_config(base_config, ["custom=1"], ExperimentConfig)
+
+        assert config["custom"] == 1
+
+    def test_invalid_value(self, base_config):
+        with pytest.raises(pydantic.ValidationError, match="noise_std"):
+            load_config(base_config, ["noise_std=-1"], ExperimentConfig)
+
+    def test_sample_config_is_valid(self):
+        config = load_config("configs/sample.yaml", schema=ExperimentConfig)
+
+        assert config["n_samples"] == 200
+
+
+class TestCache:
+    def test_parses_each_file_once(self, base_config, monkeypatch):
+        calls = []
+        real_load = yaml.load
+
+        def counting_load(*args, **kwargs):
+            calls.append(args)
+            return real_load(*args, **kwargs)
+
+        monkeypatch.setattr(config_module.yaml, "load", counting_load)
+        for value in range(5):
+            load_config(base_config, [f"seed={value}"])
+
+        # One parse of the file, plus one per override value.
+        assert len(calls) == 6
+
+    def test_edit_is_picked_up(self, base_config):
+        load_config(base_config)
+        write_yaml(base_config, {"n_samples": 5})
+        stat = base_config.stat()
+        os.utime(base_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+        assert load_config(base_config) == {"n_samples": 5}
+
+    def test_returned_config_is_a_copy(self, temp_dir):
+        path = write_yaml(temp_dir / "a.yaml", {"model": {"layers": [8]}})
+
+        load_config(path)["model"]["layers"].append(16)
+
+        assert load_config(path) == {"model": {"layers": [8]}}
+
+
+def test_merge_configs_does_not_modify_inputs():
+    base = {"a": {"b": 1}}
+
+    merged = merge_configs(base, {"a": {"c": 2}})
+
+    assert merged == {"a": {"b": 1, "c": 2}}
+    assert base == {"a": {"b": 1}}
+
+
+class TestConfigHash:
+    def test_canonical(self):
+        assert config_hash({"a": 1, "b": [1, 2]}) == config_hash({"b": [1, 2], "a": 1})
+        assert config_hash({"a": 1}) != config_hash({"a": 2})
+
+    def test_schema_normalizes_numbers(self, base_config):
+        as_int = load_config(base_config, ["slope=1"], ExperimentConfig)
+        as_float = load_config(base_config, ["slope=1.0"], ExperimentConfig)
+
+        assert config_hash(as_int) == config_hash(as_float)
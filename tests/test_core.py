@@ -1,6 +1,6 @@
 import numpy as np
 import pytest
-from ai_research_template.core import LinearModel
+from ai_research_template.core import LinearModel, fit_linear_replicates
 
 
 def test_linear_model_fit():
@@ -24,3 +24,22 @@ def test_linear_model_predict():
 
     expected = np.array([21.0, 41.0])
     np.testing.assert_allclose(y_pred, expected)
+
+
+def test_fit_linear_replicates_matches_single_fits():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 30)
+    y = np.array([2.0, -1.0, 0.5])[:, None] * x + rng.normal(size=(3, 30))
+
+    slopes, intercepts = fit_linear_replicates(x, y)
+
+    for row in range(3):
+        model = LinearModel()
+        model.fit(x, y[row])
+        assert pytest.approx(model.slope) == slopes[row]
+        assert pytest.approx(model.intercept) == intercepts[row]
+
+
+def test_fit_linear_replicates_shape_mismatch():
+    with pytest.raises(ValueError, match="shape"):
+        fit_linear_replicates(np.arange(5.0), np.zeros((2, 4)))
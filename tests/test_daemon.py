@@ -0,0 +1,120 @@
+"""Tests for the experiment daemon."""
+
+import multiprocessing
+import stat
+import time
+from pathlib import Path
+
+import pytest
+
+from ai_research_template import daemon
+from ai_research_template.daemon import (
+    execute_request,
+    serve,
+    source_stamp,
+    submit,
+)
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+@pytest.fixture
+def project(temp_dir, monkeypatch):
+    monkeypatch.chdir(temp_dir)
+    (temp_dir / "config.yaml").write_text(
+        "n_samples: 20\n"
+        "slope: 1.0\n"
+        "intercept: 0.0\n"
+        "noise_std: 0.1\n"
+        "seed: 0\n"
+        "metrics: [mse]\n"
+        "experiment_name: daemon_test\n"
+    )
+    return temp_dir
+
+
+def _request(project: Path, *overrides: str) -> dict:
+    return {
+        "command": "run",
+        "cwd": str(project),
+        "config": "config.yaml",
+        "overrides": list(overrides),
+        "force": False,
+        "seeds": None,
+        "profile": None,
+    }
+
+
+def _wait_for_daemon(socket_path: Path, process) -> None:
+    deadline = time.monotonic() + 60
+    while submit({"command": "ping"}, socket_path, timeout=5) is None:
+        assert process.is_alive(), "daemon exited during startup"
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+
+
+def test_submit_without_daemon_returns_none(temp_dir):
+    assert submit({"command": "ping"}, temp_dir / "missing.sock") is None
+
+
+def test_socket_is_owner_only(temp_dir):
+    socket_path = temp_dir / "d.sock"
+    listener = daemon._bind(socket_path)
+    try:
+        assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+    finally:
+        listener.close()
+
+
+def test_execute_request_runs_in_process(project):
+    result = execute_request(_request(project))
+
+    assert not result["cached"]
+    assert (Path(result["output_dir"]) / "metrics.json").exists()
+    assert execute_request(_request(project))["cached"]
+
+
+def test_source_stamp_changes_with_sources(temp_dir):
+    source = temp_dir / "module.py"
+    source.write_text("x = 1\n")
+    before = source_stamp(temp_dir)
+
+    source.write_text("x = 22\n")
+
+    assert source_stamp(temp_dir) != before
+
+
+def test_daemon_runs_requests_and_stops(project):
+    socket_path = project / "d.sock"
+    process = SPAWN.Process(
+        target=serve, args=(socket_path,), kwargs={"workers": 2, "max_requests": 2}
+    )
+    process.start()
+    try:
+        _wait_for_daemon(socket_path, process)
+        with pytest.raises(RuntimeError, match="already listening"):
+            serve(socket_path, workers=1)
+
+        # More requests than workers * max_requests, so workers get replaced.
+        responses = [
+            submit(_request(project, f"noise_std={0.1 * i:.1f}"), socket_path)
+            for i in range(1, 6)
+        ]
+        for response in responses:
+            assert response is not None and response["ok"], response
+            assert "Experiment complete" in response["stderr"]
+            assert (Path(response["result"]["output_dir"]) / "metrics.json").exists()
+
+        failed = submit(_request(project, "slope=abc"), socket_path)
+        assert failed is not None and not failed["ok"]
+        assert "ValidationError" in failed["error"]
+
+        assert submit({"command": "stop"}, socket_path)["ok"]
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        assert not socket_path.exists()
+        assert submit(_request(project), socket_path) is None
+    finally:
+        if process.is_alive():
+            process.terminate()
+            process.join()
@@ -1,5 +1,8 @@
 import numpy as np
-from ai_research_template.data import generate_linear_data
+from ai_research_template.data import (
+    generate_linear_data,
+    generate_linear_data_replicates,
+)
 
 
 def test_generate_linear_data_shape():
@@ -23,3 +26,13 @@ def test_generate_linear_data_values():
     # 最小二乗法で簡易的に確認（ノイズが小さいのでほぼ一致するはず）
     est_slope = (y[-1] - y[0]) / (x[-1] - x[0])
     assert abs(est_slope - slope) < 0.1
+
+
+def test_generate_linear_data_replicates_match_single_runs():
+    x, y = generate_linear_data_replicates(50, 2.0, 1.0, 0.5, seeds=[3, 7])
+
+    assert y.shape == (2, 50)
+    for row, seed in enumerate([3, 7]):
+        x_single, y_single = generate_linear_data(50, 2.0, 1.0, 0.5, seed=seed)
+        np.testing.assert_array_equal(x, x_single)
+        np.testing.assert_array_equal(y[row], y_single)
@@ -0,0 +1,128 @@
+"""Tests for the in-process experiment runner."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ai_research_template.config import ExperimentConfig
+from ai_research_template.experiment import (
+    resolve_output_location,
+    run_experiment,
+    run_experiment_replicates,
+)
+from ai_research_template.profiling import Profiler
+from ai_research_template.utils import load_results, read_experiment_summary
+
+
+@pytest.fixture
+def experiment_config(temp_dir, monkeypatch):
+    monkeypatch.chdir(temp_dir)
+    return ExperimentConfig(
+        n_samples=50,
+        slope=2.0,
+        intercept=1.0,
+        noise_std=0.1,
+        seed=0,
+        experiment_name="exp",
+        output_root=str(temp_dir / "outputs"),
+    ).model_dump()
+
+
+def test_resolve_output_location_prefers_output_dir():
+    assert resolve_output_location({"output_dir": "out/name"}) == (
+        "name",
+        Path("out"),
+    )
+
+
+class TestRunExperiment:
+    def test_writes_run_directory(self, experiment_config):
+        output_dir, cached = run_experiment(experiment_config, console=False)
+
+        assert not cached
+        params = json.loads((output_dir / "params.json").read_text())
+        assert set(params["_run"]) == {"config_hash", "source_hash", "run_key"}
+        assert (output_dir / "metrics.json").exists()
+        assert (output_dir / "report.md").exists()
+
+    def test_identical_seeded_run_is_reused(self, experiment_config):
+        first, _ = run_experiment(experiment_config, timestamp="a", console=False)
+        second, cached = run_experiment(experiment_config, timestamp="b", console=False)
+
+        assert cached
+        assert second == first
+
+    def test_force_and_unseeded_runs_recompute(self, experiment_config):
+        run_experiment(experiment_config, timestamp="a", console=False)
+
+        _, forced = run_experiment(
+            experiment_config, timestamp="b", force=True, console=False
+        )
+        unseeded = {**experiment_config, "seed": None}
+        run_experiment(unseeded, timestamp="c", console=False)
+        _, cached = run_experiment(unseeded, timestamp="d", console=False)
+
+        assert not forced
+        assert not cached
+
+
+class TestRunExperimentReplicates:
+    def test_per_seed_results_match_single_runs(self, experiment_config):
+        output_dir = run_experiment_replicates(
+            experiment_config, [0, 1, 2], console=False
+        )
+        single_dir, _ = run_experiment({**experiment_config, "seed": 1}, console=False)
+
+        results = load_results(output_dir)
+        single = load_results(single_dir)
+        assert [r["seed"] for r in results["per_seed"]] == [0, 1, 2]
+        assert results["per_seed"][1]["metrics"]["mse"] == pytest.approx(
+            single["metrics"]["mse"]
+        )
+        mses = [r["metrics"]["mse"] for r in results["per_seed"]]
+        assert results["metrics"]["mse"] == pytest.approx(sum(mses) / 3)
+        assert results["metrics"]["mse_ci_low"] < results["metrics"]["mse"]
+
+    def test_summary_rows(self, experiment_config):
+        output_dir = run_experiment_replicates(
+            experiment_config, [0, 1, 2], console=False
+        )
+
+        rows = read_experiment_summary()
+        assert [row["path"] for row in rows] == [
+            f"{output_dir}#seed=0",
+            f"{output_dir}#seed=1",
+            f"{output_dir}#seed=2",
+            str(output_dir),
+        ]
+        assert [row["param_seed"] for row in rows[:3]] == ["0", "1", "2"]
+        assert rows[3]["param_n_seeds"] == "3"
+        assert rows[3]["metric_mse_std"] != ""
+
+    def test_requires_seeds(self, experiment_config):
+        with pytest.raises(ValueError, match="seeds"):
+            run_experiment_replicates(experiment_config, [], console=False)
+
+
+def test_run_experiment_records_stage_timings(experiment_config):
+    output_dir, _ = run_experiment(experiment_config, console=False)
+
+    timings = load_results(output_dir)["timings"]
+    assert list(timings) == ["generate_data", "fit", "evaluate", "save", "summary"]
+    assert all(record["wall_s"] >= 0 for record in timings.values())
+    (row,) = read_experiment_summary()
+    assert float(row["time_fit_wall_s"]) == pytest.approx(timings["fit"]["wall_s"])
+    assert "time_summary_wall_s" not in row
+
+
+@pytest.mark.parametrize("mode", ["cprofile", "sample"])
+def test_run_experiment_profile(experiment_config, mode):
+    output_dir, _ = run_experiment(
+        experiment_config, console=False, profiler=Profiler(mode, interval=0.001)
+    )
+
+    assert any((output_dir / "artifacts").glob("profile.*"))
+    report = (output_dir / "report.md").read_text()
+    assert "- MSE:" in report
+    assert "## Profile" in report
@@ -0,0 +1,116 @@
+"""Tests for experiment_index module."""
+
+import pytest
+
+from ai_research_template import experiment_index
+from ai_research_template.experiment_index import (
+    index_rows,
+    index_run,
+    parse_condition,
+    query_runs,
+)
+
+
+@pytest.fixture
+def db_path(temp_dir):
+    path = temp_dir / "experiments.db"
+    for i, noise in enumerate([0.5, 0.8, 1.5, 2.0]):
+        index_run(
+            {
+                "timestamp": f"run{i}",
+                "path": f"outputs/exp/run{i}",
+                "param_noise_std": noise,
+                "param_output_dir": "outputs/exp",
+                "metric_mse": noise**2 + 0.01 * i,
+            },
+            path,
+        )
+    return path
+
+
+@pytest.mark.parametrize("broad_threshold", [1, 10000])
+def test_query_best_runs_with_filter(db_path, monkeypatch, broad_threshold):
+    """Both query plans should respect filters, order and limit."""
+    monkeypatch.setattr(experiment_index, "_BROAD_FILTER_ROWS", broad_threshold)
+    runs = query_runs(
+        db_path,
+        order_by="metric_mse",
+        where=[parse_condition("param_noise_std < 1")],
+        limit=10,
+    )
+    assert [run["timestamp"] for run in runs] == ["run0", "run1"]
+    assert runs[0]["param_noise_std"] == 0.5
+    assert runs[0]["param_output_dir"] == "outputs/exp"
+
+
+def test_query_descending_limit(db_path):
+    """Descending order should return the largest values first."""
+    runs = query_runs(db_path, order_by="metric_mse", descending=True, limit=1)
+    assert [run["timestamp"] for run in runs] == ["run3"]
+
+
+@pytest.mark.parametrize("broad_threshold", [1, 10000])
+@pytest.mark.parametrize("descending", [False, True])
+def test_order_by_skips_non_numeric_values(
+    temp_dir, monkeypatch, broad_threshold, descending
+):
+    """NaN and text values of the ordering key should not rank as best."""
+    monkeypatch.setattr(experiment_index, "_BROAD_FILTER_ROWS", broad_threshold)
+    db = temp_dir / "experiments.db"
+    for name, mse in [("ok", 1.0), ("nan", float("nan")), ("text", "oops")]:
+        index_run(
+            {"timestamp": name, "path": f"p/{name}", "tag": "a", "metric_mse": mse},
+            db,
+        )
+
+    runs = query_runs(
+        db,
+        order_by="metric_mse",
+        where=[parse_condition("tag = a")],
+        descending=descending,
+        limit=10,
+    )
+    assert [run["timestamp"] for run in runs] == ["ok"]
+
+
+def test_query_text_filter(db_path):
+    """String conditions should match text values."""
+    runs = query_runs(
+        db_path, where=[parse_condition("param_output_dir = outputs/exp")]
+    )
+    assert len(runs) == 4
+
+
+def test_reindex_replaces_run(db_path):
+    """Indexing the same path again should replace its values."""
+    index_run(
+        {"timestamp": "run0", "path": "outputs/exp/run0", "metric_mse": 9.0}, db_path
+    )
+    runs = query_runs(db_path, order_by="metric_mse", descending=True, limit=1)
+    assert runs[0] == {
+        "timestamp": "run0",
+        "path": "outputs/exp/run0",
+        "metric_mse": 9.0,
+    }
+
+
+def test_index_rows_coerces_numbers(temp_dir):
+    """CSV rows should be stored with numeric values where possible."""
+    db = temp_dir / "experiments.db"
+    count = index_rows(
+        [
+            {"timestamp": "a", "path": "p/a", "metric_mse": "0.5", "param_x": ""},
+            {"timestamp": "b", "path": "p/b", "metric_mse": "0.25", "param_x": "1"},
+        ],
+        db,
+    )
+    assert count == 2
+    runs = query_runs(db, order_by="metric_mse")
+    assert [run["timestamp"] for run in runs] == ["b", "a"]
+    assert "param_x" not in runs[1]
+
+
+def test_parse_condition_invalid():
+    """Malformed conditions should raise an error."""
+    with pytest.raises(ValueError, match="Invalid condition"):
+        parse_condition("metric_mse ~ 1")
@@ -0,0 +1,69 @@
+"""Tests for history module."""
+
+from ai_research_template.history import (
+    compact_history,
+    load_history,
+    write_history_fragment,
+)
+from ai_research_template.utils import update_experiment_summary
+
+
+def test_fragments_and_column_selection(temp_dir):
+    """Fragments should load with glob-selected columns."""
+    for i in range(3):
+        write_history_fragment(
+            {"timestamp": f"run{i}", "param_n": 100, "metric_mse": 0.1 * i},
+            temp_dir,
+            date="2026-01-01",
+        )
+
+    df = load_history(temp_dir, columns=["timestamp", "metric_*"])
+    assert list(df.columns) == ["timestamp", "metric_mse"]
+    assert sorted(df["timestamp"]) == ["run0", "run1", "run2"]
+
+
+def test_compact_merges_fragments(temp_dir):
+    """Compaction should merge a partition into one file, keeping all rows."""
+    for i in range(5):
+        write_history_fragment(
+            {"timestamp": f"run{i}", "metric_mse": float(i)}, temp_dir, "2026-01-01"
+        )
+    write_history_fragment(
+        {"timestamp": "new", "metric_mse": 1, "metric_r2": 0.5}, temp_dir, "2026-01-01"
+    )
+    write_history_fragment({"timestamp": "other"}, temp_dir, "2026-01-02")
+
+    assert compact_history(temp_dir) == 6
+    assert len(list((temp_dir / "date=2026-01-01").glob("*.parquet"))) == 1
+    assert compact_history(temp_dir) == 0
+
+    df = load_history(temp_dir)
+    assert len(df) == 7
+    assert df.set_index("timestamp").loc["new", "metric_r2"] == 0.5
+
+
+def test_load_unifies_fragment_schemas(temp_dir):
+    """Uncompacted fragments with differing columns should load together."""
+    write_history_fragment({"timestamp": "a", "metric_mse": 1}, temp_dir, "2026-01-01")
+    write_history_fragment(
+        {"timestamp": "b", "metric_mse": 0.5, "metric_r2": 0.9}, temp_dir, "2026-01-02"
+    )
+
+    df = load_history(temp_dir, columns=["metric_*"]).sort_values("metric_mse")
+    assert df["metric_mse"].tolist() == [0.5, 1.0]
+    assert df["metric_r2"].isna().tolist() == [False, True]
+
+
+def test_load_empty_history(temp_dir):
+    """Loading a missing history should return an empty frame."""
+    assert load_history(temp_dir / "missing").empty
+
+
+def test_update_experiment_summary_writes_history(temp_dir, sample_results):
+    """The summary update should write a fragment when history is enabled."""
+    summary_path = temp_dir / "experiments.csv"
+    update_experiment_summary(
+        sample_results, temp_dir / "run1", summary_path, index=False, history=True
+    )
+    df = load_history(temp_dir / "history", columns=["metric_*"])
+    assert df["metric_mse"].tolist() == [0.05]
@@ -0,0 +1,155 @@
+"""Tests for the experiment job queue."""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from ai_research_template.job_queue import (
+    claim,
+    complete,
+    connect_queue,
+    enqueue,
+    fail,
+    heartbeat,
+    queue_status,
+    requeue_expired,
+    run_worker,
+)
+from ai_research_template.utils import read_experiment_summary
+
+SPAWN = multiprocessing.get_context("spawn")
+
+
+@pytest.fixture
+def db_path(temp_dir):
+    return temp_dir / "queue.db"
+
+
+def _config(temp_dir: Path, seed: int, **overrides) -> dict:
+    return {
+        "n_samples": 20,
+        "slope": 1.0,
+        "intercept": 0.0,
+        "noise_std": 0.1,
+        "seed": seed,
+        "metrics": ["mse"],
+        "experiment_name": "queue_test",
+        "output_root": str(temp_dir / "outputs"),
+        **overrides,
+    }
+
+
+class TestEnqueue:
+    def test_skips_duplicates(self, db_path, temp_dir):
+        configs = [_config(temp_dir, seed) for seed in range(3)]
+
+        assert enqueue(configs, db_path=db_path) == 3
+        # Bookkeeping keys do not make a config new.
+        assert enqueue([_config(temp_dir, 0, async_logging=True)], db_path=db_path) == 0
+        assert queue_status(db_path)["pending"] == 3
+
+
+class TestClaim:
+    def test_oldest_first_and_exclusive(self, db_path, temp_dir):
+        enqueue([_config(temp_dir, seed) for seed in range(2)], db_path=db_path)
+
+        first = claim("a", db_path)
+        second = claim("b", db_path)
+
+        assert first.config["seed"] == 0
+        assert second.config["seed"] == 1
+        assert first.attempts == 1
+        assert claim("c", db_path) is None
+        assert queue_status(db_path)["running"] == 2
+
+    def test_expired_lease_is_requeued(self, db_path, temp_dir):
+        enqueue([_config(temp_dir, 0)], db_path=db_path)
+        lost = claim("dead", db_path, lease_seconds=-1)
+
+        job = claim("alive", db_path)
+
+        assert job.id == lost.id
+        assert job.attempts == 2
+        assert not heartbeat(lost.id, "dead", db_path)
+        assert not complete(lost.id, "dead", Path("x"), db_path)
+        assert heartbeat(job.id, "alive", db_path)
+
+    def test_fails_after_max_attempts(self, db_path, temp_dir):
+        enqueue([_config(temp_dir, 0)], db_path=db_path, max_attempts=2)
+        claim("w", db_path, lease_seconds=-1)
+        claim("w", db_path, lease_seconds=-1)
+
+        assert requeue_expired(db_path) == 1
+        assert queue_status(db_path)["failed"] == 1
+        assert claim("w", db_path) is None
+
+
+class TestCompleteAndFail:
+    def test_complete_records_output_dir(self, db_path, temp_dir):
+        enqueue([_config(temp_dir, 0)], db_path=db_path)
+        job = claim("w", db_path)
+
+        assert complete(job.id, "w", temp_dir / "run", db_path)
+
+        conn = connect_queue(db_path)
+        status, output_dir = conn.execute(
+            "SELECT status, output_dir FROM jobs"
+        ).fetchone()
+        conn.close()
+        assert (status, output_dir) == ("done", str(temp_dir / "run"))
+
+    def test_fail_retries_then_gives_up(self, db_path, temp_dir):
+        enqueue([_config(temp_dir, 0)], db_path=db_path, max_attempts=2)
+
+        assert fail(claim("w", db_path).id, "w", "boom", db_path)
+        assert queue_status(db_path)["pending"] == 1
+        assert fail(claim("w", db_path).id, "w", "boom", db_path)
+        assert queue_status(db_path)["failed"] == 1
+
+
+class TestRunWorker:
+    def test_runs_all_jobs(self, db_path, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+        enqueue([_config(temp_dir, seed) for seed in range(3)], db_path=db_path)
+
+        assert run_worker(db_path, worker="w") == 3
+
+        assert queue_status(db_path) == {
+            "pending": 0,
+            "running": 0,
+            "done": 3,
+            "failed": 0,
+        }
+        assert len(read_experiment_summary()) == 3
+
+    def test_failing_job_does_not_stop_worker(self, db_path, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+        enqueue(
+            [_config(temp_dir, 0, metrics=["unknown"]), _config(temp_dir, 1)],
+            db_path=db_path,
+            max_attempts=1,
+        )
+
+        assert run_worker(db_path, worker="w") == 2
+
+        counts = queue_status(db_path)
+        assert (counts["done"], counts["failed"]) == (1, 1)
+
+
+def _claim_all(db_path: Path, worker: str) -> list[int]:
+    claimed = []
+    while (job := claim(worker, db_path)) is not None:
+        claimed.append(job.id)
+    return claimed
+
+
+def test_concurrent_claims_are_exclusive(db_path, temp_dir):
+    enqueue([_config(temp_dir, seed) for seed in range(100)], db_path=db_path)
+
+    with ProcessPoolExecutor(max_workers=4, mp_context=SPAWN) as pool:
+        claimed = list(pool.map(_claim_all, [db_path] * 4, [f"w{i}" for i in range(4)]))
+
+    ids = [job_id for worker_ids in claimed for job_id in worker_ids]
+    assert sorted(ids) == list(range(1, 101))
@@ -4,10 +4,27 @@ import numpy as np
 import pytest
 
 from ai_research_template.metrics import (
+    MetricEvaluation,
+    StreamingErrorSummary,
+    available_metrics,
+    bootstrap_confidence_intervals,
+    bootstrap_metric_replicates,
+    compute_absolute_error_quantiles,
+    compute_error_histogram,
+    compute_grouped_absolute_error_quantiles,
+    compute_grouped_mae,
+    compute_grouped_median_absolute_error,
+    compute_grouped_mse,
+    compute_grouped_r2,
+    compute_grouped_rmse,
     compute_mae,
+    compute_median_absolute_error,
     compute_mse,
     compute_r2,
     compute_rmse,
+    evaluate_metrics,
+    paired_permutation_test,
+    summarize_replicates,
 )
 
 
@@ -112,3 +129,369 @@ class TestComputeR2:
         y_pred = np.array([1.0, 2.0])
         with pytest.raises(ValueError, match="same shape"):
             compute_r2(y_true, y_pred)
+
+
+class TestAccurateMode:
+    """Tests for float64-accumulated metrics on float32 inputs."""
+
+    @pytest.fixture
+    def float32_predictions(self):
+        rng = np.random.default_rng(0)
+        y_true = (rng.normal(size=300_000) * 10 + 1000).astype(np.float32)
+        noise = rng.normal(scale=0.01, size=300_000).astype(np.float32)
+        return y_true, y_true + noise
+
+    @pytest.mark.parametrize(
+        "metric", [compute_mse, compute_rmse, compute_mae, compute_r2]
+    )
+    def test_matches_float64_reference(self, float32_predictions, metric):
+        """Accurate float32 results should match the float64 computation."""
+        y_true, y_pred = float32_predictions
+        reference = metric(y_true.astype(np.float64), y_pred.astype(np.float64))
+        assert metric(y_true, y_pred, accurate=True) == pytest.approx(
+            reference, rel=1e-12
+        )
+
+    @pytest.mark.parametrize(
+        "metric", [compute_mse, compute_rmse, compute_mae, compute_r2]
+    )
+    def test_empty_input(self, metric):
+        """Empty inputs should raise ValueError, not ZeroDivisionError."""
+        with pytest.raises(ValueError, match="must not be empty"):
+            metric(np.array([]), np.array([]), accurate=True)
+
+    def test_registry_accurate_mode(self, float32_predictions):
+        """evaluate_metrics should honour the accurate flag."""
+        y_true, y_pred = float32_predictions
+        results = evaluate_metrics(y_true, y_pred, ["mse", "r2"], accurate=True)
+        assert results["mse"] == pytest.approx(
+            compute_mse(y_true, y_pred, accurate=True), rel=1e-15
+        )
+        assert results["r2"] == pytest.approx(
+            compute_r2(y_true, y_pred, accurate=True), rel=1e-15
+        )
+
+
+class TestAbsoluteErrorQuantiles:
+    """Tests for exact absolute error quantile metrics."""
+
+    def test_matches_numpy_quantile(self):
+        """Partition-based quantiles should match np.quantile."""
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=1001)
+        y_pred = rng.normal(size=1001)
+        levels = (0.0, 0.5, 0.95, 0.99, 1.0)
+        expected = np.quantile(np.abs(y_true - y_pred), levels)
+        np.testing.assert_allclose(
+            compute_absolute_error_quantiles(y_true, y_pred, levels), expected
+        )
+
+    def test_median_absolute_error(self):
+        """Median absolute error should ignore outliers."""
+        y_true = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        y_pred = np.array([1.5, 2.5, 3.5, 4.5, 100.0])
+        assert compute_median_absolute_error(y_true, y_pred) == pytest.approx(0.5)
+
+    def test_invalid_level(self):
+        """Levels outside [0, 1] should raise an error."""
+        y = np.array([1.0, 2.0])
+        with pytest.raises(ValueError, match="Quantile levels"):
+            compute_absolute_error_quantiles(y, y, (1.5,))
+
+    def test_error_histogram(self):
+        """Histogram counts should cover every residual."""
+        y_true = np.array([1.0, 2.0, 3.0, 4.0])
+        y_pred = np.array([0.0, 2.0, 3.0, 5.0])
+        counts, edges = compute_error_histogram(y_true, y_pred, bins=2)
+        assert counts.sum() == 4
+        assert edges[0] == -1.0
+        assert edges[-1] == 1.0
+
+
+class TestStreamingErrorSummary:
+    """Tests for StreamingErrorSummary class."""
+
+    def test_streaming_matches_exact(self):
+        """Streaming quantiles should be close to the exact values."""
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=100_000)
+        y_pred = y_true + rng.normal(size=100_000)
+        summary = StreamingErrorSummary(seed=0)
+        for true_batch, pred_batch in zip(
+            np.array_split(y_true, 50), np.array_split(y_pred, 50), strict=True
+        ):
+            summary.update(true_batch, pred_batch)
+
+        exact = compute_absolute_error_quantiles(y_true, y_pred, (0.5, 0.95))
+        approx = summary.absolute_error_quantiles((0.5, 0.95))
+        np.testing.assert_allclose(approx, exact, rtol=0.05)
+
+        counts, _ = summary.histogram()
+        assert counts.sum() + summary.underflow + summary.overflow == 100_000
+
+    def test_merge(self):
+        """Merging should add up sample counts and histograms."""
+        left = StreamingErrorSummary(seed=0)
+        right = StreamingErrorSummary(seed=1)
+        left.update(np.zeros(10), np.full(10, 0.5))
+        right.update(np.zeros(30), np.full(30, -0.5))
+        left.merge(right)
+        assert left.n == 40
+        assert left.counts.sum() == 40
+        assert left.median_absolute_error() == pytest.approx(0.5)
+
+
+class TestGroupedMetrics:
+    """Tests for grouped (per-segment) metrics."""
+
+    @pytest.fixture
+    def grouped_predictions(self):
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=300)
+        y_pred = y_true + rng.normal(scale=0.5, size=300)
+        groups = rng.integers(0, 4, size=300)
+        return y_true, y_pred, groups
+
+    @pytest.mark.parametrize(
+        ("grouped", "scalar"),
+        [
+            (compute_grouped_mse, compute_mse),
+            (compute_grouped_rmse, compute_rmse),
+            (compute_grouped_mae, compute_mae),
+            (compute_grouped_r2, compute_r2),
+            (compute_grouped_median_absolute_error, compute_median_absolute_error),
+        ],
+    )
+    def test_matches_masked_metrics(self, grouped_predictions, grouped, scalar):
+        """Each group value should equal the metric on the masked slice."""
+        y_true, y_pred, groups = grouped_predictions
+        values = grouped(y_true, y_pred, groups)
+        assert values.shape == (4,)
+        for label in range(4):
+            mask = groups == label
+            assert values[label] == pytest.approx(scalar(y_true[mask], y_pred[mask]))
+
+    def test_grouped_quantiles(self, grouped_predictions):
+        """Grouped quantiles should match np.quantile per group."""
+        y_true, y_pred, groups = grouped_predictions
+        levels = (0.0, 0.5, 0.9, 1.0)
+        values = compute_grouped_absolute_error_quantiles(
+            y_true, y_pred, groups, levels
+        )
+        for label in range(4):
+            mask = groups == label
+            expected = np.quantile(np.abs(y_true[mask] - y_pred[mask]), levels)
+            np.testing.assert_allclose(values[label], expected)
+
+    def test_empty_group_is_nan(self):
+        """Groups without samples should be NaN."""
+        y = np.array([1.0, 2.0])
+        values = compute_grouped_mse(y, y, np.array([0, 2]), n_groups=4)
+        assert values[0] == 0.0
+        assert np.isnan(values[1])
+        assert np.isnan(values[3])
+        assert np.isnan(compute_grouped_r2(y, y, np.array([0, 2]))[1])
+
+    def test_invalid_groups(self):
+        """Non-integer or negative labels should raise an error."""
+        y = np.array([1.0, 2.0])
+        with pytest.raises(ValueError, match="integer"):
+            compute_grouped_mse(y, y, np.array([0.0, 1.0]))
+        with pytest.raises(ValueError, match="negative"):
+            compute_grouped_mae(y, y, np.array([0, -1]))
+
+
+class TestMetricRegistry:
+    """Tests for the metric registry and lazy evaluation."""
+
+    @pytest.fixture
+    def predictions(self):
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=200)
+        return y_true, y_true + rng.normal(scale=0.5, size=200)
+
+    def test_matches_compute_functions(self, predictions):
+        """Registry metrics should agree with the compute_* functions."""
+        y_true, y_pred = predictions
+        results = evaluate_metrics(y_true, y_pred, ["mse", "rmse", "mae", "r2"])
+        assert list(results) == ["mse", "rmse", "mae", "r2"]
+        assert results["mse"] == pytest.approx(compute_mse(y_true, y_pred))
+        assert results["rmse"] == pytest.approx(compute_rmse(y_true, y_pred))
+        assert results["mae"] == pytest.approx(compute_mae(y_true, y_pred))
+        assert results["r2"] == pytest.approx(compute_r2(y_true, y_pred))
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_equals_compute_functions_exactly(self, predictions, dtype):
+        """Registry and compute_* functions should use the same reductions."""
+        y_true, y_pred = (array.astype(dtype) for array in predictions)
+        results = evaluate_metrics(y_true, y_pred, ["mse", "rmse", "mae", "r2"])
+        assert results == {
+            "mse": compute_mse(y_true, y_pred),
+            "rmse": compute_rmse(y_true, y_pred),
+            "mae": compute_mae(y_true, y_pred),
+            "r2": compute_r2(y_true, y_pred),
+        }
+
+    def test_quantile_metrics(self, predictions):
+        """Quantile metrics should match the exact quantile function."""
+        y_true, y_pred = predictions
+        results = evaluate_metrics(
+            y_true, y_pred, ["median_absolute_error", "p95_absolute_error"]
+        )
+        expected = compute_absolute_error_quantiles(y_true, y_pred, (0.5, 0.95))
+        assert results["median_absolute_error"] == pytest.approx(expected[0])
+        assert results["p95_absolute_error"] == pytest.approx(expected[1])
+
+    def test_intermediates_are_shared(self, predictions):
+        """Dependent metrics should reuse cached intermediates."""
+        y_true, y_pred = predictions
+        evaluation = MetricEvaluation(y_true, y_pred)
+        evaluation.compute(["rmse"])
+        sse = evaluation["sse"]
+        evaluation.compute(["mse", "r2"])
+        assert evaluation["sse"] is sse
+
+    def test_unknown_metric(self, predictions):
+        """Unknown names and intermediates should raise an error."""
+        y_true, y_pred = predictions
+        with pytest.raises(ValueError, match="Unknown metric"):
+            evaluate_metrics(y_true, y_pred, ["accuracy"])
+        with pytest.raises(ValueError, match="Unknown metric"):
+            evaluate_metrics(y_true, y_pred, ["sse"])
+
+    @pytest.mark.parametrize("accurate", [False, True])
+    def test_empty_input(self, accurate):
+        """Empty inputs should raise a clear error, not divide by zero."""
+        with pytest.raises(ValueError, match="must not be empty"):
+            evaluate_metrics(np.array([]), np.array([]), ["mse"], accurate=accurate)
+
+    def test_available_metrics(self):
+        """Only reportable metrics should be listed."""
+        names = available_metrics()
+        assert {"mse", "rmse", "mae", "r2"} <= set(names)
+        assert "sse" not in names
+
+
+class TestBootstrapConfidenceIntervals:
+    """Tests for bootstrap confidence intervals."""
+
+    @pytest.fixture
+    def noisy_predictions(self):
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=500)
+        y_pred = y_true + rng.normal(scale=0.3, size=500)
+        return y_true, y_pred
+
+    def test_interval_contains_point_estimate(self, noisy_predictions):
+        """Each interval should bracket the full-sample metric."""
+        y_true, y_pred = noisy_predictions
+        cis = bootstrap_confidence_intervals(y_true, y_pred, seed=1)
+        point = {
+            "mse": compute_mse(y_true, y_pred),
+            "rmse": compute_rmse(y_true, y_pred),
+            "mae": compute_mae(y_true, y_pred),
+            "r2": compute_r2(y_true, y_pred),
+        }
+        for name, (lower, upper) in cis.items():
+            assert lower < point[name] < upper
+
+    def test_chunking_does_not_change_replicates(self, noisy_predictions):
+        """Replicates must not depend on the chunk size."""
+        y_true, y_pred = noisy_predictions
+        full = bootstrap_metric_replicates(y_true, y_pred, n_resamples=20, seed=3)
+        chunked = bootstrap_metric_replicates(
+            y_true, y_pred, n_resamples=20, seed=3, max_chunk_elements=1200
+        )
+        for name in full:
+            np.testing.assert_allclose(full[name], chunked[name])
+
+    def test_replicate_matches_resampled_mse(self):
+        """With one sample the only replicate equals the plain metric."""
+        y_true = np.array([2.0])
+        y_pred = np.array([0.5])
+        replicates = bootstrap_metric_replicates(
+            y_true, y_pred, metrics=("mse",), n_resamples=3, seed=0
+        )
+        np.testing.assert_allclose(replicates["mse"], [2.25, 2.25, 2.25])
+
+    def test_unknown_metric(self, noisy_predictions):
+        """Unknown metric names should raise an error."""
+        y_true, y_pred = noisy_predictions
+        with pytest.raises(ValueError, match="Unknown bootstrap metrics"):
+            bootstrap_confidence_intervals(y_true, y_pred, metrics=("foo",))
+
+
+class TestPairedPermutationTest:
+    """Tests for paired_permutation_test function."""
+
+    def test_identical_models(self):
+        """Identical predictions should give a p-value of 1."""
+        y_true = np.linspace(0, 1, 50)
+        y_pred = y_true + 0.1
+        observed, p_value = paired_permutation_test(
+            y_true, y_pred, y_pred, n_resamples=200, seed=0
+        )
+        assert observed == 0.0
+        assert p_value == 1.0
+
+    def test_clearly_better_model(self):
+        """A much better model should be detected as significant."""
+        rng = np.random.default_rng(0)
+        y_true = rng.normal(size=300)
+        good = y_true + rng.normal(scale=0.1, size=300)
+        bad = y_true + rng.normal(scale=1.0, size=300)
+        observed, p_value = paired_permutation_test(
+            y_true, bad, good, n_resamples=500, seed=0
+        )
+        assert observed > 0
+        assert p_value < 0.01
+
+    def test_unknown_loss(self):
+        """Unknown loss names should raise an error."""
+        y = np.array([1.0, 2.0])
+        with pytest.raises(ValueError, match="loss"):
+            paired_permutation_test(y, y, y, loss="hinge")
+
+
+class TestSummarizeReplicates:
+    def test_mean_std_and_t_interval(self):
+        values = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+
+        stats = summarize_replicates(values)
+
+        assert stats["mean"] == 3.0
+        assert stats["std"] == pytest.approx(np.std(values, ddof=1))
+        # t(0.975, df=4) = 2.776445
+        half_width = 2.776445 * stats["std"] / np.sqrt(5)
+        assert stats["ci_low"] == pytest.approx(3.0 - half_width, rel=1e-3)
+        assert stats["ci_high"] == pytest.approx(3.0 + half_width, rel=1e-3)
+
+    @pytest.mark.parametrize(
+        ("n", "t_value"), [(2, 12.7062), (3, 4.302653), (20, 2.093024)]
+    )
+    def test_t_quantiles(self, n, t_value):
+        values = np.arange(n, dtype=float)
+
+        stats = summarize_replicates(values)
+
+        half_width = (stats["ci_high"] - stats["ci_low"]) / 2
+        expected = t_value * np.std(values, ddof=1) / np.sqrt(n)
+        assert half_width == pytest.approx(expected, rel=1e-4)
+
+    def test_accepts_sequences(self):
+        values = [0.5, 1.5, 4.0]
+
+        assert summarize_replicates(values) == summarize_replicates(np.array(values))
+
+    def test_single_replicate(self):
+        stats = summarize_replicates(np.array([2.0]))
+
+        assert stats["mean"] == 2.0
+        assert np.isnan(stats["std"])
+        assert np.isnan(stats["ci_low"])
+
+    def test_invalid_input(self):
+        with pytest.raises(ValueError, match="empty"):
+            summarize_replicates(np.array([]))
+        with pytest.raises(ValueError, match="confidence_level"):
+            summarize_replicates(np.array([1.0, 2.0]), confidence_level=1.5)
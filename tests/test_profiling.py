@@ -0,0 +1,66 @@
+"""Tests for run profiling."""
+
+import pstats
+import time
+
+import pytest
+
+from ai_research_template.profiling import Profiler
+
+
+def _busy(seconds: float) -> int:
+    total = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class TestCProfile:
+    def test_top_functions_and_pstats(self, temp_dir):
+        with Profiler("cprofile") as profiler:
+            _busy(0.05)
+
+        top = profiler.top_functions(3)
+        assert any(row["function"].startswith("_busy (") for row in top)
+        assert all(0 <= row["self"] <= 1 for row in top)
+        assert not any("(profiling.py" in row["function"] for row in top)
+
+        path = profiler.save(temp_dir)
+        assert path == temp_dir / "artifacts" / "profile.pstats"
+        stats = pstats.Stats(str(path))
+        assert any(name == "_busy" for _, _, name in stats.stats)  # type: ignore[attr-defined]
+
+
+class TestSampling:
+    def test_collects_stacks(self, temp_dir):
+        with Profiler("sample", interval=0.001) as profiler:
+            _busy(0.2)
+
+        assert sum(profiler.stacks.values()) > 10
+        top = profiler.top_functions(1)[0]
+        assert top["function"].startswith("_busy (")
+        assert top["self"] > 0.5
+        assert top["calls"] is None
+
+        path = profiler.save(temp_dir)
+        lines = path.read_text().splitlines()
+        assert path.name == "profile.collapsed"
+        stack, count = lines[0].rsplit(" ", 1)
+        assert ";" in stack
+        assert int(count) > 0
+
+    def test_report_lines(self):
+        with Profiler("sample", interval=0.001) as profiler:
+            _busy(0.05)
+
+        lines = profiler.report_lines(n=2)
+
+        assert lines[0] == "## Profile"
+        assert "profile.collapsed" in lines[2]
+        assert len(lines) == 6 + 2
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError, match="profile mode"):
+        Profiler("perf")
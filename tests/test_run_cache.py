@@ -0,0 +1,64 @@
+"""Tests for the config/source keyed result cache."""
+
+from ai_research_template.run_cache import (
+    load_cached_results,
+    lookup_run,
+    record_run,
+    run_key,
+    source_tree_hash,
+)
+from ai_research_template.utils import save_results
+
+
+class TestRunKey:
+    def test_stable_under_key_order(self):
+        first = run_key({"a": 1, "b": {"c": 2, "d": 3}}, source_hash="s")
+        second = run_key({"b": {"d": 3, "c": 2}, "a": 1}, source_hash="s")
+
+        assert first == second
+
+    def test_changes_with_config_and_source(self):
+        base = run_key({"a": 1}, source_hash="s")["run_key"]
+
+        assert run_key({"a": 2}, source_hash="s")["run_key"] != base
+        assert run_key({"a": 1}, source_hash="t")["run_key"] != base
+
+    def test_excluded_keys_do_not_matter(self):
+        first = run_key({"a": 1, "output_dir": "x"}, ("output_dir",), "s")
+        second = run_key({"a": 1, "output_dir": "y"}, ("output_dir",), "s")
+
+        assert first == second
+
+
+def test_source_tree_hash_tracks_file_contents(temp_dir):
+    (temp_dir / "a").mkdir()
+    (temp_dir / "b").mkdir()
+    (temp_dir / "a" / "m.py").write_text("x = 1\n")
+    (temp_dir / "b" / "m.py").write_text("x = 2\n")
+
+    assert source_tree_hash(temp_dir / "a") != source_tree_hash(temp_dir / "b")
+    assert len(source_tree_hash()) == 64
+
+
+class TestLookup:
+    def test_records_and_finds_finished_run(self, temp_dir):
+        run_dir = temp_dir / "exp" / "run1"
+        save_results({"metrics": {"mse": 0.5}}, run_dir)
+        cache_dir = temp_dir / ".run_cache"
+
+        assert lookup_run("ab" * 32, cache_dir) is None
+        record_run("ab" * 32, run_dir, cache_dir)
+
+        assert lookup_run("ab" * 32, cache_dir) == run_dir
+        assert load_cached_results("ab" * 32, cache_dir) == {"metrics": {"mse": 0.5}}
+
+    def test_deleted_run_is_a_miss(self, temp_dir):
+        run_dir = temp_dir / "exp" / "run1"
+        save_results({"metrics": {"mse": 0.5}}, run_dir)
+        cache_dir = temp_dir / ".run_cache"
+        record_run("cd" * 32, run_dir, cache_dir)
+
+        (run_dir / "metrics.json").unlink()
+
+        assert lookup_run("cd" * 32, cache_dir) is None
+        assert load_cached_results("cd" * 32, cache_dir) is None
@@ -0,0 +1,146 @@
+"""Tests for adaptive hyperparameter search."""
+
+import math
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ai_research_template.search import (
+    SearchConfig,
+    best_trial,
+    halving_budgets,
+    hyperband_brackets,
+    load_search,
+    run_search,
+    successive_halving,
+)
+from ai_research_template.utils import load_results, read_experiment_summary
+
+
+@pytest.fixture
+def search_file(temp_dir):
+    base = {
+        "n_samples": 20,
+        "slope": 1.0,
+        "intercept": 0.0,
+        "noise_std": 0.1,
+        "seed": 0,
+        "experiment_name": "search_test",
+        "output_root": str(temp_dir / "outputs"),
+    }
+    (temp_dir / "base.yaml").write_text(yaml.safe_dump(base))
+    spec = {
+        "base": "base.yaml",
+        "method": "grid",
+        "parameters": {"noise_std": [0.1, 0.4, 1.6, 3.2]},
+        "search": {
+            "algorithm": "halving",
+            "min_budget": 20,
+            "max_budget": 80,
+            "eta": 2,
+        },
+    }
+    search_path = temp_dir / "search.yaml"
+    search_path.write_text(yaml.safe_dump(spec))
+    return search_path
+
+
+class TestHalvingBudgets:
+    def test_geometric_up_to_max(self):
+        assert halving_budgets(50, 1350, 3) == [50, 150, 450, 1350]
+
+    def test_min_budget_not_a_power(self):
+        assert halving_budgets(60, 1350, 3) == [150, 450, 1350]
+
+    def test_float_budgets(self):
+        assert halving_budgets(0.5, 2.0, 2) == [0.5, 1.0, 2.0]
+
+    def test_invalid_bounds(self):
+        with pytest.raises(ValueError, match="min_budget"):
+            halving_budgets(100, 10, 3)
+
+
+def test_hyperband_brackets():
+    search = SearchConfig(min_budget=50, max_budget=1350, eta=3)
+
+    brackets = hyperband_brackets(search)
+
+    assert [n for n, _ in brackets] == [27, 12, 6, 4]
+    assert brackets[0][1] == [50, 150, 450, 1350]
+    assert brackets[-1][1] == [1350]
+
+
+class TestSuccessiveHalving:
+    def test_promotes_best_points(self, search_file, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+        base_path, spec, search = load_search(search_file)
+        points = [{"noise_std": v} for v in spec["parameters"]["noise_std"]]
+
+        rungs = list(successive_halving(points, base_path, search))
+
+        assert [(r["budget"], len(r["trials"])) for r in rungs] == [
+            (20, 4),
+            (40, 2),
+            (80, 1),
+        ]
+        # Lower noise gives lower MSE, so the two smallest noise levels survive.
+        assert [t["point"] for t in rungs[1]["trials"]] == [
+            {"noise_std": 0.1},
+            {"noise_std": 0.4},
+        ]
+        for rung in rungs:
+            values = [trial["value"] for trial in rung["trials"]]
+            assert values == sorted(values)
+        top = rungs[-1]["trials"][0]
+        assert load_results(Path(top["path"]))["config"]["n_samples"] == 80
+
+    def test_rungs_recorded_in_summary(self, search_file, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+
+        rungs = list(run_search(search_file, max_workers=1))
+
+        rows = read_experiment_summary()
+        assert len(rows) == sum(len(rung["trials"]) for rung in rungs)
+        assert sorted({row["param_search_rung"] for row in rows}) == ["0", "1", "2"]
+        assert {row["param_search_bracket"] for row in rows} == {"0"}
+
+    def test_budget_key_in_points(self, search_file):
+        base_path, _, search = load_search(search_file)
+
+        with pytest.raises(ValueError, match="budget key"):
+            list(successive_halving([{"n_samples": 10}], base_path, search))
+
+    def test_metric_not_computed(self, search_file, temp_dir, monkeypatch):
+        monkeypatch.chdir(temp_dir)
+        spec = yaml.safe_load(search_file.read_text())
+        spec["search"]["metric"] = "r2"
+        search_file.write_text(yaml.safe_dump(spec))
+
+        with pytest.raises(ValueError, match=r"'r2'.*\['mse'\]"):
+            list(run_search(search_file))
+        assert not (search_file.parent / "outputs").exists()
+
+
+class TestBestTrial:
+    def test_prefers_largest_budget(self):
+        search = SearchConfig(min_budget=1, max_budget=2, eta=2)
+        rungs = [
+            {"budget": 1, "trials": [{"point": {"a": 0}, "path": "p0", "value": 0.0}]},
+            {"budget": 2, "trials": [{"point": {"a": 1}, "path": "p1", "value": 0.5}]},
+        ]
+
+        assert best_trial(rungs, search)["point"] == {"a": 1}
+
+    def test_max_mode_and_nan(self):
+        search = SearchConfig(min_budget=1, max_budget=1, mode="max")
+        trials = [
+            {"point": {"a": 0}, "path": "p0", "value": math.nan},
+            {"point": {"a": 1}, "path": "p1", "value": 0.9},
+            {"point": {"a": 2}, "path": "p2", "value": 0.7},
+        ]
+
+        best = best_trial([{"budget": 1, "trials": trials}], search)
+
+        assert best["point"] == {"a": 1}
+        assert best["budget"] == 1
@@ -0,0 +1,63 @@
+"""Tests for sketch module."""
+
+import numpy as np
+import pytest
+
+from ai_research_template.sketch import KLLSketch
+
+
+@pytest.fixture
+def stream():
+    rng = np.random.default_rng(0)
+    return rng.exponential(size=200_000)
+
+
+class TestKLLSketch:
+    """Tests for KLLSketch class."""
+
+    def test_rank_error_within_guarantee(self, stream):
+        """Quantile estimates should be within the documented rank error."""
+        sketch = KLLSketch(k=200, seed=0)
+        for batch in np.array_split(stream, 100):
+            sketch.update(batch)
+
+        levels = np.array([0.01, 0.5, 0.95, 0.99])
+        estimates = sketch.quantiles(levels)
+        ranks = np.searchsorted(np.sort(stream), estimates) / stream.size
+        assert np.max(np.abs(ranks - levels)) < 0.02
+
+    def test_memory_is_bounded(self, stream):
+        """The sketch should retain far fewer values than it has seen."""
+        sketch = KLLSketch(k=200, seed=0)
+        sketch.update(stream)
+        assert sketch.n == stream.size
+        assert sketch.num_retained < 1000
+
+    def test_merge(self, stream):
+        """Merged sketches should summarise the union of both streams."""
+        left = KLLSketch(k=200, seed=1)
+        right = KLLSketch(k=200, seed=2)
+        left.update(stream[:50_000])
+        right.update(stream[50_000:])
+        left.merge(right)
+
+        assert left.n == stream.size
+        true_median = np.median(stream)
+        assert left.rank(true_median) == pytest.approx(0.5, abs=0.02)
+
+    def test_merge_different_k(self):
+        """Merging sketches with different k should raise an error."""
+        with pytest.raises(ValueError, match="different k"):
+            KLLSketch(k=100).merge(KLLSketch(k=200))
+
+    def test_small_stream_is_exact(self):
+        """Streams smaller than k should give exact quantiles."""
+        sketch = KLLSketch(k=200)
+        sketch.update(np.array([3.0, 1.0, 2.0]))
+        assert sketch.quantile(0.0) == 1.0
+        assert sketch.quantile(1.0) == 3.0
+
+    def test_empty_sketch(self):
+        """Querying an empty sketch should raise an error."""
+        with pytest.raises(ValueError, match="empty"):
+            KLLSketch().quantile(0.5)
@@ -0,0 +1,110 @@
+"""Tests for parameter sweeps."""
+
+import pydantic
+import pytest
+import yaml
+
+from ai_research_template.sweep import (
+    grid_points,
+    load_sweep,
+    point_configs,
+    random_points,
+    run_sweep,
+)
+
+
+@pytest.fixture
+def sweep_files(temp_dir):
+    base = {
+        "n_samples": 20,
+        "slope": 1.0,
+        "intercept": 0.0,
+        "noise_std": 0.1,
+        "experiment_name": "sweep_test",
+        "output_root": str(temp_dir / "outputs"),
+    }
+    (temp_dir / "base.yaml").write_text(yaml.safe_dump(base))
+    sweep = {
+        "base": "base.yaml",
+        "method": "grid",
+        "parameters": {"noise_std": [0.1, 0.2], "seed": [0, 1, 2]},
+    }
+    sweep_path = temp_dir / "sweep.yaml"
+    sweep_path.write_text(yaml.safe_dump(sweep))
+    return sweep_path
+
+
+class TestGridPoints:
+    def test_all_combinations(self):
+        points = grid_points({"a": [1, 2], "b.c": ["x", "y", "z"]})
+
+        assert len(points) == 6
+        assert points[0] == {"a": 1, "b.c": "x"}
+        assert points[-1] == {"a": 2, "b.c": "z"}
+
+    def test_values_must_be_list(self):
+        with pytest.raises(ValueError, match="non-empty list"):
+            grid_points({"a": 1})
+
+
+class TestRandomPoints:
+    def test_distributions(self):
+        points = random_points(
+            {
+                "lr": {"distribution": "log_uniform", "low": 1e-4, "high": 1e-1},
+                "width": {"distribution": "int_uniform", "low": 8, "high": 16},
+                "noise": {"low": 0.0, "high": 1.0},
+                "metric": ["mse", "mae"],
+            },
+            n_trials=200,
+            seed=0,
+        )
+
+        assert len(points) == 200
+        assert all(1e-4 <= p["lr"] <= 1e-1 for p in points)
+        assert {p["width"] for p in points} == set(range(8, 17))
+        assert all(type(p["width"]) is int for p in points)
+        assert {p["metric"] for p in points} == {"mse", "mae"}
+
+    def test_reproducible(self):
+        spec = {"x": {"low": 0.0, "high": 1.0}}
+
+        assert random_points(spec, 5, seed=1) == random_points(spec, 5, seed=1)
+
+    def test_unknown_distribution(self):
+        with pytest.raises(ValueError, match="distribution"):
+            random_points({"x": {"distribution": "beta", "low": 0, "high": 1}}, 1)
+
+
+def test_load_sweep_resolves_base_relative_to_sweep_file(sweep_files):
+    base_path, points = load_sweep(sweep_files)
+
+    assert base_path == sweep_files.parent / "base.yaml"
+    assert len(points) == 6
+
+
+def test_point_configs_validate(sweep_files):
+    base_path, _ = load_sweep(sweep_files)
+
+    configs = point_configs(base_path, [{"noise_std": 0.5}])
+    assert configs[0]["noise_std"] == 0.5
+
+    with pytest.raises(pydantic.ValidationError):
+        point_configs(base_path, [{"noise_std": -1.0}])
+
+
+def test_run_sweep_creates_one_run_per_point_and_reuses(
+    sweep_files, temp_dir, monkeypatch
+):
+    monkeypatch.chdir(temp_dir)
+    base_path, points = load_sweep(sweep_files)
+    configs = point_configs(base_path, points)
+
+    first = list(run_sweep(configs, base_path, max_workers=2))
+    second = list(run_sweep(configs, base_path, max_workers=2))
+
+    run_dirs = [path for path, _ in first]
+    assert len(set(run_dirs)) == 6
+    assert all((path / "metrics.json").exists() for path in run_dirs)
+    assert not any(cached for _, cached in first)
+    assert second == [(path, True) for path in run_dirs]
@@ -0,0 +1,127 @@
+"""Tests for structured per-step metrics logging."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ai_research_template import tracking
+from ai_research_template.tracking import (
+    MetricsLogger,
+    load_metric_series,
+    metrics_log_path,
+    read_metrics_log,
+)
+
+
+class TestMetricsLogger:
+    def test_writes_one_record_per_step(self, temp_dir):
+        with MetricsLogger(temp_dir) as metrics_log:
+            metrics_log.log(0, loss=1.0, mse=2.0)
+            metrics_log.log(1, loss=np.float32(0.5))
+
+        records = read_metrics_log(metrics_log_path(temp_dir))
+        assert [record["step"] for record in records] == [0, 1]
+        assert records[0]["mse"] == 2.0
+        assert records[1]["loss"] == 0.5
+        assert "mse" not in records[1]
+        assert all("time" in record for record in records)
+
+    def test_buffers_until_full(self, temp_dir):
+        metrics_log = MetricsLogger(temp_dir, buffer_size=3)
+        path = metrics_log_path(temp_dir)
+        metrics_log.log(0, loss=1.0)
+        metrics_log.log(1, loss=1.0)
+        assert path.read_text() == ""
+
+        metrics_log.log(2, loss=1.0)
+        assert len(path.read_text().splitlines()) == 3
+        metrics_log.close()
+
+    def test_fsyncs_slow_runs_once_interval_elapsed(self, temp_dir, monkeypatch):
+        clock = [0.0]
+        fsyncs = []
+        monkeypatch.setattr(tracking.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(tracking.os, "fsync", fsyncs.append)
+        metrics_log = MetricsLogger(temp_dir, fsync_interval=30.0)
+        path = metrics_log_path(temp_dir)
+
+        metrics_log.log(0, loss=1.0)
+        assert (path.read_text(), fsyncs) == ("", [])
+
+        clock[0] = 31.0
+        metrics_log.log(1, loss=1.0)
+        assert len(path.read_text().splitlines()) == 2
+        assert len(fsyncs) == 1
+
+        clock[0] = 40.0
+        metrics_log.log(2, loss=1.0)
+        assert len(fsyncs) == 1
+        metrics_log.close()
+
+    def test_appends_across_sessions(self, temp_dir):
+        for step in range(2):
+            with MetricsLogger(temp_dir) as metrics_log:
+                metrics_log.log(step, loss=float(step))
+
+        assert len(read_metrics_log(metrics_log_path(temp_dir))) == 2
+
+    def test_reserved_names(self, temp_dir):
+        with MetricsLogger(temp_dir) as metrics_log, pytest.raises(ValueError):
+            metrics_log.log(0, time=1.0)
+
+
+def test_read_metrics_log_skips_truncated_line(temp_dir):
+    path = metrics_log_path(temp_dir)
+    path.parent.mkdir()
+    path.write_text(json.dumps({"step": 0, "loss": 1.0}) + '\n{"step": 1, "lo')
+
+    assert read_metrics_log(path) == [{"step": 0, "loss": 1.0}]
+
+
+class TestLoadMetricSeries:
+    def test_collects_runs_under_output_root(self, temp_dir):
+        for run, scale in [("exp/run1", 1.0), ("exp/run2", 2.0)]:
+            with MetricsLogger(temp_dir / run) as metrics_log:
+                for step in range(3):
+                    metrics_log.log(step, loss=scale * step)
+                metrics_log.log(3, accuracy=0.9)
+        (temp_dir / "exp" / "latest").symlink_to(temp_dir / "exp" / "run2")
+
+        series = load_metric_series("loss", output_root=temp_dir)
+
+        assert list(series.columns) == ["run", "step", "value"]
+        assert series["run"].nunique() == 2
+        assert len(series) == 6
+        run2 = series[series["run"] == str(temp_dir / "exp" / "run2")]
+        np.testing.assert_array_equal(run2["value"], [0.0, 2.0, 4.0])
+
+    def test_explicit_runs(self, temp_dir):
+        with MetricsLogger(temp_dir / "a") as metrics_log:
+            metrics_log.log(0, loss=1.0)
+
+        series = load_metric_series("loss", runs=[temp_dir / "a", temp_dir / "b"])
+
+        assert series["value"].tolist() == [1.0]
+
+    def test_missing_metric_returns_empty_frame(self, temp_dir):
+        with MetricsLogger(temp_dir / "exp" / "run") as metrics_log:
+            metrics_log.log(0, loss=1.0)
+
+        series = load_metric_series("accuracy", output_root=temp_dir)
+
+        assert series.empty
+        assert list(series.columns) == ["run", "step", "value"]
+
+
+def test_load_metric_series_handles_nan_and_truncated_lines(temp_dir):
+    with MetricsLogger(temp_dir / "run") as metrics_log:
+        metrics_log.log(0, loss=float("nan"))
+        metrics_log.log(1, loss=1.0)
+    with metrics_log_path(temp_dir / "run").open("a") as f:
+        f.write('{"step": 2, "loss": 0.')
+
+    series = load_metric_series("loss", runs=[temp_dir / "run"])
+
+    assert series["step"].tolist() == [0, 1]
+    assert np.isnan(series["value"].iloc[0])
@@ -1,13 +1,39 @@
 """Tests for utility functions."""
 
 import json
+import multiprocessing
+import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
+from types import SimpleNamespace
 
+import numpy as np
+import pandas as pd
 import pytest
 import yaml
 
-from ai_research_template.utils import load_config, save_results, setup_logger
+from ai_research_template import utils
+from ai_research_template.experiment_index import query_runs
+from ai_research_template.utils import (
+    StageTimer,
+    append_daily_log,
+    atomic_open,
+    close_logger,
+    flatten_results,
+    load_config,
+    load_results,
+    new_run_id,
+    prepare_output_dir,
+    read_experiment_summary,
+    refresh_summary_header,
+    save_params,
+    save_results,
+    setup_logger,
+    summary_schema_path,
+    update_experiment_summary,
+    update_latest_symlink,
+)
 
 
 def test_load_config():
@@ -42,6 +68,104 @@ def test_save_results():
         assert loaded["metrics"]["mse"] == 0.05
 
 
+class TestResultPersistence:
+    def test_arrays_saved_as_sidecar_files(self, temp_dir):
+        predictions = np.linspace(0.0, 1.0, 1000)
+        results = {
+            "metrics": {"mse": np.float32(0.5), "n": np.int64(3)},
+            "predictions": predictions,
+            "folds": [np.arange(3), {"weights": np.eye(2)}],
+        }
+
+        save_results(results, temp_dir)
+
+        with open(temp_dir / "metrics.json") as f:
+            raw = json.load(f)
+        assert raw["metrics"] == {"mse": 0.5, "n": 3}
+        assert raw["predictions"] == {
+            "__ndarray__": "artifacts/metrics/predictions.npy",
+            "dtype": "float64",
+            "shape": [1000],
+        }
+        assert (temp_dir / "artifacts" / "metrics" / "folds.1.weights.npy").exists()
+
+        loaded = load_results(temp_dir)
+        np.testing.assert_array_equal(loaded["predictions"], predictions)
+        np.testing.assert_array_equal(loaded["folds"][0], np.arange(3))
+        np.testing.assert_array_equal(loaded["folds"][1]["weights"], np.eye(2))
+
+    def test_sidecar_names_do_not_collide(self, temp_dir):
+        results = {"a/b": np.zeros(2), "a_b": np.ones(2)}
+
+        save_results(results, temp_dir)
+
+        loaded = load_results(temp_dir)
+        np.testing.assert_array_equal(loaded["a/b"], np.zeros(2))
+        np.testing.assert_array_equal(loaded["a_b"], np.ones(2))
+        assert (temp_dir / "artifacts" / "metrics" / "a_b-1.npy").exists()
+
+    def test_load_results_mmap(self, temp_dir):
+        save_results({"predictions": np.arange(10.0)}, temp_dir)
+
+        loaded = load_results(temp_dir, mmap_mode="r")
+
+        assert isinstance(loaded["predictions"], np.memmap)
+
+    def test_save_params_uses_own_array_dir(self, temp_dir):
+        save_params({"init": np.zeros(3)}, temp_dir)
+
+        loaded = load_results(temp_dir, "params.json")
+        np.testing.assert_array_equal(loaded["init"], np.zeros(3))
+        assert (temp_dir / "artifacts" / "params" / "init.npy").exists()
+
+    @pytest.mark.parametrize("has_orjson", [True, False])
+    def test_fast_path_round_trips(self, temp_dir, monkeypatch, has_orjson):
+        if has_orjson:
+            pytest.importorskip("orjson")
+        else:
+            monkeypatch.setattr(utils, "_orjson", lambda: None)
+        results = {"metrics": {"mse": np.float64(0.25)}, "config": {1: "a"}}
+
+        save_results(results, temp_dir, fast=True)
+
+        text = (temp_dir / "metrics.json").read_text()
+        assert "\n" not in text
+        assert json.loads(text) == {"metrics": {"mse": 0.25}, "config": {"1": "a"}}
+
+    def test_failed_write_keeps_previous_file(self, temp_dir):
+        save_results({"metrics": {"mse": 1.0}}, temp_dir)
+
+        with pytest.raises(TypeError):
+            save_results({"metrics": {"mse": object()}}, temp_dir)
+
+        assert load_results(temp_dir) == {"metrics": {"mse": 1.0}}
+        assert [p.name for p in temp_dir.iterdir() if p.name.startswith(".")] == []
+
+    def test_atomic_open_discards_on_error(self, temp_dir):
+        path = temp_dir / "data.bin"
+        path.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError), atomic_open(path) as f:
+            f.write(b"partial")
+            raise RuntimeError
+
+        assert path.read_bytes() == b"old"
+
+    def test_atomic_open_concurrent_threads(self, temp_dir):
+        path = temp_dir / "data.bin"
+        payloads = [bytes([i]) * 100_000 for i in range(8)]
+
+        def write(data: bytes) -> None:
+            with atomic_open(path) as f:
+                f.write(data)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(write, payloads))
+
+        assert path.read_bytes() in payloads
+        assert [p.name for p in temp_dir.iterdir()] == ["data.bin"]
+
+
 def test_setup_logger():
     """Test logger setup creates log file."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -53,3 +177,325 @@ def test_setup_logger():
         assert (output_dir / "logs" / "experiment.log").exists()
 
         logger.info("Test message")
+
+
+class TestAsyncLogging:
+    def test_close_flushes_all_records(self, temp_dir):
+        logger = setup_logger(temp_dir, name="async-test", async_logging=True)
+        for step in range(2000):
+            logger.info(f"step={step}")
+        close_logger("async-test")
+
+        lines = (temp_dir / "logs" / "experiment.log").read_text().splitlines()
+        assert len(lines) == 2000
+        assert lines[0].endswith("step=0")
+        assert lines[-1].endswith("step=1999")
+        assert logger.handlers == []
+
+    def test_console_output(self, temp_dir, capsys):
+        logger = setup_logger(temp_dir, name="async-console", async_logging=True)
+        logger.info("hello")
+        close_logger("async-console")
+
+        assert "hello" in capsys.readouterr().err
+
+    def test_console_disabled(self, temp_dir, capsys):
+        logger = setup_logger(
+            temp_dir, name="async-quiet", async_logging=True, console=False
+        )
+        logger.info("quiet")
+        close_logger("async-quiet")
+
+        assert capsys.readouterr().err == ""
+        assert "quiet" in (temp_dir / "logs" / "experiment.log").read_text()
+
+    def test_setup_again_replaces_listener(self, temp_dir):
+        setup_logger(temp_dir, name="async-twice", async_logging=True)
+        logger = setup_logger(temp_dir, name="async-twice", async_logging=True)
+        logger.info("once")
+        close_logger("async-twice")
+
+        log_text = (temp_dir / "logs" / "experiment.log").read_text()
+        assert log_text.count("once") == 1
+
+
+class TestStageTimer:
+    def test_records_stages_in_order(self):
+        timer = StageTimer()
+
+        with timer.stage("b"):
+            sum(range(10000))
+        with timer.stage("a"):
+            pass
+
+        timings = timer.as_dict()
+        assert list(timings) == ["b", "a"]
+        assert set(timings["b"]) == {"wall_s", "cpu_s", "peak_rss_mb"}
+        assert timings["b"]["wall_s"] > 0
+        assert timings["b"]["peak_rss_mb"] > 0
+        assert timer.total() == pytest.approx(
+            timings["a"]["wall_s"] + timings["b"]["wall_s"]
+        )
+
+    def test_repeated_stage_accumulates(self):
+        timer = StageTimer()
+
+        @timer.timed()
+        def work():
+            return 1
+
+        assert work() + work() == 2
+        first = timer.as_dict()["work"]["wall_s"]
+        with timer.stage("work"):
+            pass
+        assert list(timer.as_dict()) == ["work"]
+        assert timer.as_dict()["work"]["wall_s"] >= first
+
+    def test_records_on_error(self):
+        timer = StageTimer()
+
+        with pytest.raises(RuntimeError), timer.stage("broken"):
+            raise RuntimeError
+
+        assert "broken" in timer.as_dict()
+
+    def test_trace_memory(self):
+        timer = StageTimer(trace_memory=True)
+
+        with timer.stage("alloc"):
+            data = np.ones(4 * 1024**2 // 8)
+        with timer.stage("small"):
+            pass
+
+        timings = timer.as_dict()
+        assert timings["alloc"]["py_peak_mb"] >= 4
+        assert timings["small"]["py_peak_mb"] < 1
+        assert data.sum() > 0
+
+    def test_nested_stage_keeps_outer_peak(self):
+        timer = StageTimer(trace_memory=True)
+
+        with timer.stage("outer"):
+            data = np.ones(4 * 1024**2 // 8)
+            del data
+            with timer.stage("inner"):
+                pass
+
+        timings = timer.as_dict()
+        assert timings["outer"]["py_peak_mb"] >= 4
+        assert timings["inner"]["py_peak_mb"] < 1
+
+    def test_nested_stage_peak_counts_for_outer(self):
+        timer = StageTimer(trace_memory=True)
+
+        with timer.stage("outer"), timer.stage("inner"):
+            data = np.ones(4 * 1024**2 // 8)
+            del data
+
+        timings = timer.as_dict()
+        assert timings["outer"]["py_peak_mb"] >= 4
+        assert timings["inner"]["py_peak_mb"] >= 4
+
+    @pytest.mark.parametrize(
+        ("platform", "max_rss"), [("linux", 2048), ("darwin", 2 * 1024**2)]
+    )
+    def test_peak_rss_units(self, monkeypatch, platform, max_rss):
+        monkeypatch.setattr(utils.sys, "platform", platform)
+        monkeypatch.setattr(
+            utils.resource, "getrusage", lambda _: SimpleNamespace(ru_maxrss=max_rss)
+        )
+        timer = StageTimer()
+
+        with timer.stage("work"):
+            pass
+
+        assert timer.as_dict()["work"]["peak_rss_mb"] == 2.0
+
+    def test_flattened_into_summary_columns(self, temp_dir, sample_results):
+        timer = StageTimer()
+        with timer.stage("fit"):
+            pass
+
+        row = flatten_results({**sample_results, "timings": timer.as_dict()}, temp_dir)
+
+        assert row["time_fit_wall_s"] == timer.as_dict()["fit"]["wall_s"]
+        assert "time_fit_cpu_s" in row
+
+
+def test_update_experiment_summary_appends(temp_dir, sample_results):
+    """Each run should append one row without rewriting earlier ones."""
+    summary_path = temp_dir / "experiments.csv"
+
+    update_experiment_summary(sample_results, temp_dir / "run1", summary_path)
+    first_content = summary_path.read_bytes()
+    update_experiment_summary(sample_results, temp_dir / "run2", summary_path)
+
+    assert summary_path.read_bytes().startswith(first_content)
+    assert summary_schema_path(summary_path).exists()
+    rows = read_experiment_summary(summary_path)
+    assert [row["timestamp"] for row in rows] == ["run1", "run2"]
+    assert rows[0]["metric_mse"] == "0.05"
+
+    indexed = query_runs(summary_path.with_suffix(".db"), order_by="metric_mse")
+    assert [run["timestamp"] for run in indexed] == ["run1", "run2"]
+
+
+def test_update_experiment_summary_new_columns(temp_dir, sample_results):
+    """New columns should extend the schema and leave old rows readable."""
+    summary_path = temp_dir / "experiments.csv"
+    update_experiment_summary(sample_results, temp_dir / "run1", summary_path)
+
+    sample_results["metrics"]["mae"] = 0.1
+    update_experiment_summary(sample_results, temp_dir / "run2", summary_path)
+
+    rows = read_experiment_summary(summary_path)
+    assert rows[0]["metric_mae"] == ""
+    assert rows[1]["metric_mae"] == "0.1"
+
+    # The history stays in one rectangular CSV that pandas can read.
+    frame = pd.read_csv(summary_path)
+    assert list(frame["timestamp"]) == ["run1", "run2"]
+    assert frame["metric_mae"].isna().tolist() == [True, False]
+    assert sorted(p.name for p in temp_dir.glob("experiments*.csv")) == [
+        "experiments.csv"
+    ]
+
+
+def test_refresh_summary_header_repairs_lagging_header(temp_dir):
+    """A summary whose header lags the schema should be rewritten."""
+    summary_path = temp_dir / "experiments.csv"
+    summary_path.write_text("timestamp\nrun1\nrun2,0.1\n")
+    summary_schema_path(summary_path).write_text('{"columns": ["timestamp", "m"]}')
+
+    refresh_summary_header(summary_path)
+
+    assert summary_path.read_text() == "timestamp,m\nrun1,\nrun2,0.1\n"
+
+
+def test_update_experiment_summary_legacy_csv(temp_dir, sample_results):
+    """A summary written without a schema file should keep its header."""
+    summary_path = temp_dir / "experiments.csv"
+    summary_path.write_text("metric_mse,timestamp\n0.5,old\n")
+
+    update_experiment_summary(sample_results, temp_dir / "new", summary_path)
+
+    rows = read_experiment_summary(summary_path)
+    assert rows[0] == {
+        **dict.fromkeys(rows[1], ""),
+        "metric_mse": "0.5",
+        "timestamp": "old",
+    }
+    assert rows[1]["timestamp"] == "new"
+
+
+# Spawned workers avoid forking a process that already runs library threads.
+SPAWN = multiprocessing.get_context("spawn")
+
+
+def _record_runs(summary_path: Path, worker: int, n_runs: int) -> None:
+    for run in range(n_runs):
+        results = {"config": {"worker": worker}, "metrics": {f"m{worker % 3}": run}}
+        update_experiment_summary(
+            results, Path(f"out/w{worker}_r{run}"), summary_path, index=False
+        )
+
+
+def test_update_experiment_summary_concurrent(temp_dir):
+    """Concurrent writers must not lose rows or schema columns."""
+    summary_path = temp_dir / "experiments.csv"
+    with ProcessPoolExecutor(max_workers=4, mp_context=SPAWN) as pool:
+        futures = [pool.submit(_record_runs, summary_path, w, 20) for w in range(4)]
+        for future in futures:
+            future.result()
+
+    rows = read_experiment_summary(summary_path)
+    assert len(rows) == 80
+    assert len({row["path"] for row in rows}) == 80
+    assert {"metric_m0", "metric_m1", "metric_m2"} <= set(rows[0])
+    assert len(pd.read_csv(summary_path)) == 80
+
+
+def _write_daily_entries(log_dir: Path, worker: int) -> None:
+    os.chdir(log_dir)
+    for entry in range(10):
+        append_daily_log([f"## worker {worker} entry {entry}", "line"], "2026-01-01")
+
+
+def test_append_daily_log_concurrent(temp_dir):
+    """Concurrent daily log entries should be written whole and once."""
+    with ProcessPoolExecutor(max_workers=4, mp_context=SPAWN) as pool:
+        futures = [pool.submit(_write_daily_entries, temp_dir, w) for w in range(4)]
+        for future in futures:
+            future.result()
+
+    content = (temp_dir / "docs/experiments/2026-01-01.md").read_text()
+    assert content.startswith("# 2026-01-01\n\n")
+    assert content.count("# 2026-01-01") == 1
+    assert content.count("\nline\n\n") == 40
+
+
+def _prepare_run_dirs(output_root: Path, n_runs: int) -> list[str]:
+    return [prepare_output_dir("exp", output_root).name for _ in range(n_runs)]
+
+
+class TestRunDirectories:
+    def test_run_ids_are_unique_and_sortable(self):
+        ids = [new_run_id() for _ in range(1000)]
+
+        assert len(set(ids)) == 1000
+        assert ids == sorted(ids)
+
+    def test_run_ids_stay_monotonic_when_clock_repeats(self, monkeypatch):
+        fixed = utils.datetime(2026, 1, 25, 12, 0, 0)
+
+        class FrozenClock(utils.datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return fixed
+
+        monkeypatch.setattr(utils, "datetime", FrozenClock)
+        monkeypatch.setattr(utils, "_last_run_time", None)
+        ids = [new_run_id() for _ in range(3)]
+
+        assert [run_id[:24] for run_id in ids] == [
+            "2026-01-25_120000_000000",
+            "2026-01-25_120000_000001",
+            "2026-01-25_120000_000002",
+        ]
+
+    def test_concurrent_launches_get_distinct_directories(self, temp_dir):
+        with ProcessPoolExecutor(max_workers=4, mp_context=SPAWN) as pool:
+            futures = [pool.submit(_prepare_run_dirs, temp_dir, 50) for _ in range(4)]
+            names = [name for future in futures for name in future.result()]
+
+        assert len(set(names)) == 200
+        latest = temp_dir / "exp" / "latest"
+        assert latest.is_symlink()
+        assert os.readlink(latest) in names
+        assert [
+            p.name for p in (temp_dir / "exp").iterdir() if p.name.startswith(".")
+        ] == []
+
+    def test_explicit_timestamp_is_reused(self, temp_dir):
+        first = prepare_output_dir("exp", temp_dir, timestamp="fixed")
+        second = prepare_output_dir("exp", temp_dir, timestamp="fixed")
+
+        assert first == second == temp_dir / "exp" / "fixed"
+
+    def test_latest_points_at_last_updated_run(self, temp_dir):
+        first = temp_dir / "2026-01-02_000000"
+        second = temp_dir / "2026-01-01_000000"
+        latest = temp_dir / "latest"
+
+        update_latest_symlink(latest, first)
+        update_latest_symlink(latest, second)
+
+        assert os.readlink(latest) == second.name
+
+    def test_latest_ignores_target_outside_parent(self, temp_dir):
+        latest = temp_dir / "exp" / "latest"
+        latest.parent.mkdir()
+
+        update_latest_symlink(latest, temp_dir / "elsewhere")
+
+        assert not latest.is_symlink()